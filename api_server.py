@@ -0,0 +1,586 @@
+"""
+本地 API 服务器 - Todo App v0.3.1
+在本机回环地址或 Unix 套接字上提供任务的 REST/JSON 接口，
+供自动化工具和编辑器插件使用，不必直接读写任务文件。
+
+接口:
+    GET    /                 服务信息
+    GET    /tasks            任务列表（筛选、排序、分页）
+    POST   /tasks            添加任务
+    GET    /tasks/<id>       单个任务
+    PATCH  /tasks/<id>       修改任务
+    DELETE /tasks/<id>       删除任务
+    GET    /stats            统计信息
+    POST   /batch            批量添加/修改/删除（只写入一次文件）
+
+所有响应带 ETag（数据库版本号）；读请求支持 If-None-Match，
+写请求支持 If-Match，版本不一致时返回 412。
+
+接口没有认证，为防止浏览器中的网页跨站访问：
+写请求必须使用 Content-Type: application/json（浏览器的"简单请求"不能发送，必须先经过预检），
+Host 必须是本机回环地址和监听端口（防止 DNS 重绑定），带 Origin 时必须是同一地址。
+本模块只使用标准库，不导入 tkinter
+"""
+import asyncio
+import json
+import os
+import re
+import socket
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from http import HTTPStatus
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+from models import Task
+from database import TaskDatabase
+from config import app_config
+from async_bridge import AsyncBridge, async_bridge
+from local_socket import remove_stale_socket
+
+DEFAULT_ADDRESS = "127.0.0.1:8765"
+PRIORITIES = ("高", "中", "低")
+SORT_FIELDS = ("created_at", "priority", "due_date", "title", "completed")
+# 可通过接口修改的字段（id 和时间戳由程序维护）
+EDITABLE_FIELDS = ("title", "description", "priority", "completed", "due_date", "tags")
+
+def parse_address(address: str) -> Tuple[str, Any]:
+    """解析监听地址
+    
+    "127.0.0.1:8765" -> ("tcp", ("127.0.0.1", 8765))
+    "unix:/tmp/todo.sock" -> ("unix", "/tmp/todo.sock")
+    
+    Raises:
+        ValueError: 地址格式无效，或 TCP 地址不是本机回环地址
+    """
+    if address.startswith("unix:"):
+        path = address[len("unix:"):]
+        if not path:
+            raise ValueError("Unix 套接字路径不能为空")
+        return "unix", path
+    
+    host, sep, port = address.rpartition(":")
+    if not sep or not port.isdigit() or not 0 <= int(port) < 65536:
+        raise ValueError(f"无效的监听地址: {address}（格式为 主机:端口 或 unix:路径）")
+    host = host.strip("[]")
+    # 接口没有认证，只允许监听本机
+    if host not in ("127.0.0.1", "localhost", "::1"):
+        raise ValueError(f"只能监听本机回环地址: {host}")
+    return "tcp", (host, int(port))
+
+class ApiError(Exception):
+    """以指定状态码结束请求"""
+    
+    def __init__(self, status: int, message: str = "", headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.status = status
+        self.message = message or HTTPStatus(status).phrase
+        self.headers = headers or {}
+
+@dataclass
+class ApiRequest:
+    """解析后的请求"""
+    method: str
+    path: str
+    query: Dict[str, str]
+    headers: Dict[str, str]
+    body: bytes = b""
+    
+    @property
+    def keep_alive(self) -> bool:
+        """HTTP/1.1 默认保持连接"""
+        return self.headers.get("connection", "").lower() != "close"
+    
+    def json(self) -> Any:
+        """请求体 JSON"""
+        try:
+            return json.loads(self.body.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            raise ApiError(400, "请求体不是有效的 JSON")
+
+@dataclass
+class ApiResponse:
+    """待发送的响应"""
+    status: int = 200
+    body: Any = None
+    headers: Dict[str, str] = field(default_factory=dict)
+    
+    def encode(self, keep_alive: bool) -> bytes:
+        """编码为 HTTP/1.1 响应"""
+        payload = b""
+        headers = dict(self.headers)
+        # 204 和 304 不能带响应体
+        if self.body is not None and self.status not in (204, 304):
+            payload = json.dumps(self.body, ensure_ascii=False).encode("utf-8")
+            headers["Content-Type"] = "application/json; charset=utf-8"
+        headers["Content-Length"] = str(len(payload))
+        headers["Connection"] = "keep-alive" if keep_alive else "close"
+        
+        lines = [f"HTTP/1.1 {self.status} {HTTPStatus(self.status).phrase}"]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("utf-8") + payload
+
+def validate_fields(data: Any, partial: bool) -> Dict[str, Any]:
+    """校验任务字段，返回可写入的字段
+    
+    Args:
+        data: 请求中的任务对象
+        partial: 为 True 时（修改）所有字段可选，否则 title 必填
+    
+    Raises:
+        ApiError: 字段无效（400）
+    """
+    if not isinstance(data, dict):
+        raise ApiError(400, "任务必须是 JSON 对象")
+    unknown = set(data) - set(EDITABLE_FIELDS)
+    if unknown:
+        raise ApiError(400, f"不支持的字段: {', '.join(sorted(unknown))}")
+    
+    if "title" in data:
+        if not isinstance(data["title"], str) or not data["title"].strip():
+            raise ApiError(400, "title 必须是非空字符串")
+        data["title"] = data["title"].strip()
+    elif not partial:
+        raise ApiError(400, "缺少 title")
+    
+    if "description" in data and not isinstance(data["description"], str):
+        raise ApiError(400, "description 必须是字符串")
+    if "priority" in data and data["priority"] not in PRIORITIES:
+        raise ApiError(400, f"priority 必须是 {'/'.join(PRIORITIES)} 之一")
+    if "completed" in data and not isinstance(data["completed"], bool):
+        raise ApiError(400, "completed 必须是布尔值")
+    if data.get("due_date") is not None:
+        try:
+            datetime.fromisoformat(data["due_date"])
+        except (TypeError, ValueError):
+            raise ApiError(400, "due_date 必须是 ISO 格式日期")
+    if "tags" in data and not (
+        isinstance(data["tags"], list) and all(isinstance(tag, str) for tag in data["tags"])
+    ):
+        raise ApiError(400, "tags 必须是字符串列表")
+    return data
+
+class ApiServer:
+    """任务 REST/JSON 接口服务器
+    
+    运行在异步桥接（async_bridge）的事件循环中，每个连接一个协程，支持 keep-alive；
+    数据库操作交给单个工作线程执行，不阻塞事件循环，也不阻塞界面主线程。
+    """
+    
+    MAX_BODY_SIZE = 4 * 1024 * 1024
+    MAX_HEADERS = 100
+    KEEP_ALIVE_TIMEOUT = 15.0
+    DEFAULT_PAGE_SIZE = 100
+    MAX_PAGE_SIZE = 1000
+    MAX_BATCH_SIZE = 10000
+    # 带请求体的写方法，要求 JSON 内容类型
+    BODY_METHODS = ("POST", "PATCH", "PUT")
+    
+    def __init__(self, db: TaskDatabase, address: str = DEFAULT_ADDRESS):
+        self.db = db
+        self.address = address
+        self.kind, self.target = parse_address(address)
+        # ETag 前缀区分不同进程，避免重启后版本号重复造成误判
+        self._etag_prefix = uuid.uuid4().hex[:8]
+        self._bridge: Optional[AsyncBridge] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: set = set()
+        # 允许的 Host 头（监听后按实际端口生成，Unix 套接字不检查）
+        self._allowed_hosts: set = set()
+        
+        self.routes: List[Tuple[re.Pattern, Dict[str, Callable]]] = [
+            (re.compile(r"^/$"), {"GET": self.handle_info}),
+            (re.compile(r"^/tasks$"), {"GET": self.handle_list, "POST": self.handle_create}),
+            (re.compile(r"^/tasks/(?P<task_id>[^/]+)$"), {
+                "GET": self.handle_get, "PATCH": self.handle_update, "DELETE": self.handle_delete
+            }),
+            (re.compile(r"^/stats$"), {"GET": self.handle_stats}),
+            (re.compile(r"^/batch$"), {"POST": self.handle_batch}),
+        ]
+    
+    @property
+    def url(self) -> str:
+        """可显示的服务地址"""
+        if self.kind == "unix":
+            return f"unix:{self.target}"
+        host, port = self.target
+        if self._server is not None and self._server.sockets:
+            port = self._server.sockets[0].getsockname()[1]
+        return f"http://{host}:{port}"
+    
+    @property
+    def is_running(self) -> bool:
+        """是否正在监听"""
+        return self._server is not None
+    
+    def start(self, bridge: Optional[AsyncBridge] = None) -> Tuple[bool, str]:
+        """在异步桥接的事件循环中启动服务器
+        
+        Returns:
+            tuple: (success, message)
+        """
+        if self.is_running:
+            return True, f"API 服务器已在运行: {self.url}"
+        
+        self._bridge = bridge or async_bridge
+        try:
+            self._bridge.submit(self.open()).result(5)
+        except Exception as e:
+            return False, f"API 服务器启动失败: {e}"
+        return True, f"API 服务器已启动: {self.url}"
+    
+    def start_nowait(self, bridge: AsyncBridge, callback: Callable[[bool, str], None]):
+        """启动服务器但不等待监听完成（界面线程使用），结果 (success, message) 在 Tk 主线程交给 callback"""
+        self._bridge = bridge
+        
+        def on_done(future):
+            if future.cancelled():
+                callback(False, "API 服务器启动已取消")
+            elif future.exception() is not None:
+                callback(False, f"API 服务器启动失败: {future.exception()}")
+            else:
+                callback(True, f"API 服务器已启动: {self.url}")
+        
+        bridge.submit(self.open(), on_done=on_done)
+    
+    def stop(self):
+        """停止服务器并等待所有连接关闭"""
+        if not self.is_running or self._bridge is None or not self._bridge.is_running:
+            return
+        try:
+            self._bridge.submit(self.close()).result(5)
+        except Exception as e:
+            print(f"停止 API 服务器失败: {e}")
+    
+    async def open(self):
+        """开始监听（在事件循环中调用）"""
+        # 数据库操作在单个工作线程中按顺序执行
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="api-db")
+        if self.kind == "unix":
+            remove_stale_socket(self.target)
+            self._server = await asyncio.start_unix_server(self._handle_connection, path=self.target)
+            os.chmod(self.target, 0o600)
+        else:
+            host, port = self.target
+            self._server = await asyncio.start_server(self._handle_connection, host=host, port=port)
+            port = self._server.sockets[0].getsockname()[1]
+            self._allowed_hosts = {f"{name}:{port}" for name in ("127.0.0.1", "localhost", "[::1]")}
+    
+    async def close(self):
+        """停止监听并结束所有连接（在事件循环中调用）"""
+        server, self._server = self._server, None
+        if server is None:
+            return
+        server.close()
+        # 先结束所有连接，否则 wait_closed 会等到客户端断开
+        for task in list(self._connections):
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        await server.wait_closed()
+        await asyncio.to_thread(self._executor.shutdown)
+        if self.kind == "unix" and os.path.exists(self.target):
+            os.unlink(self.target)
+    
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """处理一个连接上的所有请求（keep-alive）"""
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), self.KEEP_ALIVE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                except ApiError as e:
+                    # 请求格式错误时无法确定下一个请求的起点，回复后关闭连接
+                    writer.write(self._error_response(e).encode(keep_alive=False))
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                
+                response = await self._dispatch(request)
+                keep_alive = request.keep_alive
+                writer.write(response.encode(keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except asyncio.CancelledError:
+            # 服务器停止时取消的空闲连接
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+    
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[ApiRequest]:
+        """读取一个请求，连接关闭时返回 None"""
+        try:
+            request_line = await reader.readline()
+        except ValueError:
+            raise ApiError(414)
+        if not request_line:
+            return None
+        
+        try:
+            method, target, version = request_line.decode("latin-1").split()
+        except ValueError:
+            raise ApiError(400, "无效的请求行")
+        if not version.startswith("HTTP/1."):
+            raise ApiError(505)
+        
+        headers: Dict[str, str] = {}
+        while True:
+            try:
+                line = await reader.readline()
+            except ValueError:
+                raise ApiError(431)
+            if line in (b"\r\n", b"\n", b""):
+                break
+            if len(headers) >= self.MAX_HEADERS:
+                raise ApiError(431)
+            name, sep, value = line.decode("latin-1").partition(":")
+            if not sep:
+                raise ApiError(400, "无效的请求头")
+            headers[name.strip().lower()] = value.strip()
+        # HTTP/1.0 默认不保持连接
+        if version == "HTTP/1.0" and headers.get("connection", "").lower() != "keep-alive":
+            headers["connection"] = "close"
+        
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            raise ApiError(501, "不支持分块传输的请求体")
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            raise ApiError(400, "无效的 Content-Length")
+        if length < 0:
+            raise ApiError(400, "无效的 Content-Length")
+        if length > self.MAX_BODY_SIZE:
+            raise ApiError(413)
+        body = await reader.readexactly(length) if length else b""
+        
+        parts = urlsplit(target)
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        return ApiRequest(method.upper(), unquote(parts.path), query, headers, body)
+    
+    def _check_origin(self, request: ApiRequest):
+        """拒绝来自浏览器网页的跨站请求和 DNS 重绑定"""
+        if self.kind == "tcp" and request.headers.get("host", "").lower() not in self._allowed_hosts:
+            raise ApiError(403, "Host 必须是本机回环地址和监听端口")
+        origin = request.headers.get("origin")
+        if origin is not None:
+            scheme, _, host = origin.lower().partition("://")
+            if self.kind == "unix" or scheme != "http" or host not in self._allowed_hosts:
+                raise ApiError(403, f"不允许跨站请求: {origin}")
+    
+    def _check_content_type(self, request: ApiRequest):
+        """写请求必须是 JSON（浏览器跨站发送 application/json 前必须经过 CORS 预检，本服务不响应预检）"""
+        if request.method in self.BODY_METHODS:
+            media_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+            if media_type != "application/json":
+                raise ApiError(415, "请求体必须是 application/json")
+    
+    async def _dispatch(self, request: ApiRequest) -> ApiResponse:
+        """按路由调用处理函数（在数据库工作线程中执行）"""
+        try:
+            self._check_origin(request)
+            for pattern, handlers in self.routes:
+                match = pattern.match(request.path)
+                if not match:
+                    continue
+                handler = handlers.get(request.method)
+                if handler is None:
+                    raise ApiError(405, headers={"Allow": ", ".join(handlers)})
+                self._check_content_type(request)
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(
+                    self._executor, lambda: handler(request, **match.groupdict())
+                )
+            raise ApiError(404)
+        except ApiError as e:
+            return self._error_response(e)
+        except Exception as e:
+            print(f"API 请求处理失败: {request.method} {request.path}: {e}")
+            return ApiResponse(500, {"error": str(e)})
+    
+    @staticmethod
+    def _error_response(error: ApiError) -> ApiResponse:
+        """错误响应"""
+        return ApiResponse(error.status, {"error": error.message}, dict(error.headers))
+    
+    # ---- 版本与条件请求 ----
+    
+    def etag(self, version: int) -> str:
+        """数据库版本对应的 ETag"""
+        return f'"{self._etag_prefix}-{version}"'
+    
+    def _expected_version(self, request: ApiRequest) -> Optional[int]:
+        """解析 If-Match，返回期望的数据库版本（未提供时为 None）"""
+        value = request.headers.get("if-match")
+        if value is None or value.strip() == "*":
+            return None
+        prefix = f'"{self._etag_prefix}-'
+        value = value.strip()
+        if value.startswith(prefix) and value.endswith('"') and value[len(prefix):-1].isdigit():
+            return int(value[len(prefix):-1])
+        # 其他进程或格式错误的 ETag 必然不匹配当前版本
+        return -1
+    
+    def _read(self, request: ApiRequest, build: Callable[[], Any]) -> ApiResponse:
+        """在数据库锁内生成读响应，版本未变化时返回 304"""
+        self.db.ensure_loaded()
+        with self.db.lock:
+            etag = self.etag(self.db.version)
+            if request.headers.get("if-none-match") == etag:
+                return ApiResponse(304, headers={"ETag": etag})
+            body = build()
+        return ApiResponse(200, body, {"ETag": etag})
+    
+    def _write(self, request: ApiRequest, operations: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """执行写操作，If-Match 与当前版本不一致时返回 412"""
+        outcome = self.db.apply_batch(operations, self._expected_version(request))
+        if outcome is None:
+            with self.db.lock:
+                etag = self.etag(self.db.version)
+            raise ApiError(412, "任务已被修改，请重新获取", {"ETag": etag})
+        return outcome
+    
+    def _single_result(self, request: ApiRequest, operation: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
+        """执行单个写操作，返回 (结果, ETag)"""
+        outcome = self._write(request, [operation])
+        result = outcome["results"][0]
+        if not result["ok"]:
+            raise ApiError(404 if result.get("error") == "找不到任务" else 500, result.get("error", ""))
+        return result, self.etag(outcome["version"])
+    
+    # ---- 路由处理 ----
+    
+    def handle_info(self, request: ApiRequest) -> ApiResponse:
+        """服务信息"""
+        return self._read(request, lambda: {
+            "name": app_config.app_name,
+            "version": app_config.version,
+            "db_version": self.db.version,
+        })
+    
+    def handle_list(self, request: ApiRequest) -> ApiResponse:
+        """任务列表
+        
+        查询参数: completed=true/false, priority, tag, q（搜索标题和描述）,
+        sort, reverse=true, offset, limit（最大 MAX_PAGE_SIZE）
+        """
+        query = request.query
+        completed = query.get("completed")
+        if completed not in (None, "true", "false"):
+            raise ApiError(400, "completed 必须是 true 或 false")
+        priority = query.get("priority")
+        if priority is not None and priority not in PRIORITIES:
+            raise ApiError(400, f"priority 必须是 {'/'.join(PRIORITIES)} 之一")
+        sort_by = query.get("sort", "created_at")
+        if sort_by not in SORT_FIELDS:
+            raise ApiError(400, f"sort 必须是 {'/'.join(SORT_FIELDS)} 之一")
+        try:
+            offset = int(query.get("offset", 0))
+            limit = int(query.get("limit", self.DEFAULT_PAGE_SIZE))
+        except ValueError:
+            raise ApiError(400, "offset 和 limit 必须是整数")
+        if offset < 0 or not 0 < limit <= self.MAX_PAGE_SIZE:
+            raise ApiError(400, f"offset 不能为负数，limit 范围为 1-{self.MAX_PAGE_SIZE}")
+        tag = query.get("tag")
+        text = query.get("q", "").lower()
+        
+        def build() -> Dict[str, Any]:
+            tasks = self.db.sort_tasks(sort_by, query.get("reverse") == "true")
+            if completed is not None:
+                tasks = [task for task in tasks if task.completed == (completed == "true")]
+            if priority is not None:
+                tasks = [task for task in tasks if task.priority == priority]
+            if tag is not None:
+                tasks = [task for task in tasks if tag in task.tags]
+            if text:
+                tasks = [
+                    task for task in tasks
+                    if text in task.title.lower() or text in task.description.lower()
+                ]
+            page = tasks[offset:offset + limit]
+            return {
+                "total": len(tasks),
+                "offset": offset,
+                "limit": limit,
+                "next_offset": offset + limit if offset + limit < len(tasks) else None,
+                "tasks": [task.to_dict() for task in page],
+            }
+        
+        return self._read(request, build)
+    
+    def handle_get(self, request: ApiRequest, task_id: str) -> ApiResponse:
+        """单个任务"""
+        def build() -> Dict[str, Any]:
+            task = self.db.get_task_by_id(task_id)
+            if task is None:
+                raise ApiError(404, "找不到任务")
+            return task.to_dict()
+        
+        return self._read(request, build)
+    
+    def handle_create(self, request: ApiRequest) -> ApiResponse:
+        """添加任务"""
+        fields = validate_fields(request.json(), partial=False)
+        task = Task(id="", **fields)
+        result, etag = self._single_result(request, {"op": "add", "task": task.to_dict()})
+        return ApiResponse(201, result["task"], {"ETag": etag, "Location": f"/tasks/{task.id}"})
+    
+    def handle_update(self, request: ApiRequest, task_id: str) -> ApiResponse:
+        """修改任务（只修改请求中给出的字段）"""
+        fields = validate_fields(request.json(), partial=True)
+        result, etag = self._single_result(request, {"op": "update", "id": task_id, "fields": fields})
+        return ApiResponse(200, result["task"], {"ETag": etag})
+    
+    def handle_delete(self, request: ApiRequest, task_id: str) -> ApiResponse:
+        """删除任务"""
+        _, etag = self._single_result(request, {"op": "delete", "id": task_id})
+        return ApiResponse(204, headers={"ETag": etag})
+    
+    def handle_stats(self, request: ApiRequest) -> ApiResponse:
+        """统计信息"""
+        return self._read(request, self.db.get_statistics)
+    
+    def handle_batch(self, request: ApiRequest) -> ApiResponse:
+        """批量操作
+        
+        请求体: {"operations": [{"op": "add", "task": {...}},
+                                {"op": "update", "id": "...", "fields": {...}},
+                                {"op": "delete", "id": "..."}]}
+        各操作独立执行，响应中按顺序给出每个操作的结果；
+        带 If-Match 时整批操作要么全部尝试，要么（版本不一致）全部不执行
+        """
+        data = request.json()
+        operations = data.get("operations") if isinstance(data, dict) else None
+        if not isinstance(operations, list) or not operations:
+            raise ApiError(400, "operations 必须是非空列表")
+        if len(operations) > self.MAX_BATCH_SIZE:
+            raise ApiError(413, f"单次最多 {self.MAX_BATCH_SIZE} 个操作")
+        
+        prepared = []
+        for operation in operations:
+            if not isinstance(operation, dict):
+                raise ApiError(400, "每个操作必须是 JSON 对象")
+            op = operation.get("op")
+            if op == "add":
+                task = Task(id="", **validate_fields(operation.get("task"), partial=False))
+                prepared.append({"op": "add", "task": task.to_dict()})
+            elif op == "update":
+                prepared.append({
+                    "op": "update", "id": str(operation.get("id", "")),
+                    "fields": validate_fields(operation.get("fields"), partial=True)
+                })
+            elif op == "delete":
+                prepared.append({"op": "delete", "id": str(operation.get("id", ""))})
+            else:
+                raise ApiError(400, f"未知操作: {op}")
+        
+        outcome = self._write(request, prepared)
+        return ApiResponse(200, outcome, {"ETag": self.etag(outcome["version"])})
@@ -14,16 +14,30 @@ from pathlib import Path
 current_dir = Path(__file__).parent
 sys.path.insert(0, str(current_dir))
 
+# 最先导入，以记录完整的启动耗时
+from startup_trace import startup_tracer, trace_enabled
+
 def check_dependencies():
-    """检查依赖包"""
+    """检查依赖包（customtkinter 只查找模块，不实际导入，避免拖慢启动）"""
+    import importlib.util
+    from importlib import metadata
+    
     try:
-        # 首先检查 tkinter
+        # 首先检查 tkinter：导入 _tkinter 会加载系统 Tcl/Tk 动态库，
+        # 创建 Tcl 解释器会执行 init.tcl，可以发现 Tcl 安装损坏。
+        # 界面随后也要导入 tkinter，这里额外的开销只有创建解释器的约 3 毫秒
         import tkinter
+        tkinter.Tcl()
         print(f"✓ tkinter 可用")
         
         # 然后检查 customtkinter
-        import customtkinter
-        print(f"✓ customtkinter 版本: {customtkinter.__version__}")
+        if importlib.util.find_spec("customtkinter") is None:
+            raise ImportError("No module named 'customtkinter'")
+        try:
+            version = metadata.version("customtkinter")
+        except metadata.PackageNotFoundError:
+            version = "未知"
+        print(f"✓ customtkinter 版本: {version}")
         return True
     except ImportError as e:
         print(f"❌ 缺少依赖包: {e}")
@@ -42,80 +56,11 @@ def setup_environment():
     except:
         pass
     
-    # 如果是打包环境，尝试设置正确的TCL/TK路径
+    # 打包环境中 TCL/TK 路径已由运行时钩子按构建时生成的清单设置（pyi_rth_tk_manifest.py）
     if getattr(sys, 'frozen', False):
-        # 运行在PyInstaller环境中
-        base_dir = sys._MEIPASS
-        
-        # 尝试多种可能的路径
-        possible_tcl_paths = [
-            os.path.join(base_dir, '_tcl_data', 'tcl8.6'),  # 主要路径
-            os.path.join(base_dir, 'tcl', 'tcl8.6'),        # 备用路径1
-            os.path.join(base_dir, 'tcl')                   # 备用路径2
-        ]
-        
-        possible_tk_paths = [
-            os.path.join(base_dir, '_tcl_data', 'tk8.6'),   # 主要路径
-            os.path.join(base_dir, 'tk', 'tk8.6'),          # 备用路径1
-            os.path.join(base_dir, 'tk')                    # 备用路径2
-        ]
-        
-        # 查找有效的TCL路径
-        for tcl_path in possible_tcl_paths:
-            if os.path.exists(tcl_path):
-                os.environ['TCL_LIBRARY'] = tcl_path
-                print(f"已设置TCL_LIBRARY={tcl_path}")
-                break
-        
-        # 查找有效的TK路径 - 需要找到包含 tk.tcl 的目录
-        tk_library_set = False
-        for tk_path in possible_tk_paths:
-            if os.path.exists(tk_path):
-                # 检查是否包含 tk.tcl 文件
-                tk_tcl_file = os.path.join(tk_path, 'tk.tcl')
-                if os.path.exists(tk_tcl_file):
-                    os.environ['TK_LIBRARY'] = tk_path
-                    print(f"已设置TK_LIBRARY={tk_path} (找到 tk.tcl)")
-                    tk_library_set = True
-                    break
-                else:
-                    print(f"路径 {tk_path} 存在但缺少 tk.tcl 文件")
-        
-        # 如果没有找到包含 tk.tcl 的路径，尝试其他位置
-        if not tk_library_set:
-            additional_tk_paths = [
-                os.path.join(base_dir, '_tk_data'),
-                os.path.join(base_dir, '_tcl_data', 'tcl8.6', 'tk8.6'),
-                os.path.join(base_dir, 'lib', 'tk8.6'),
-            ]
-            
-            for tk_path in additional_tk_paths:
-                if os.path.exists(tk_path):
-                    tk_tcl_file = os.path.join(tk_path, 'tk.tcl')
-                    if os.path.exists(tk_tcl_file):
-                        os.environ['TK_LIBRARY'] = tk_path
-                        print(f"已设置TK_LIBRARY={tk_path} (在备用位置找到 tk.tcl)")
-                        tk_library_set = True
-                        break
-        
-        if not tk_library_set:
-            print("⚠️ 警告：未找到包含 tk.tcl 的 TK 库路径")
-            # 列出 MEIPASS 中的相关文件用于调试
-            print("MEIPASS 中的 TK 相关文件:")
-            for item in os.listdir(base_dir):
-                if 'tk' in item.lower() or 'tcl' in item.lower():
-                    item_path = os.path.join(base_dir, item)
-                    if os.path.isdir(item_path):
-                        print(f"  目录: {item}/")
-                        # 检查目录内容
-                        try:
-                            for subitem in os.listdir(item_path):
-                                if subitem.endswith('.tcl'):
-                                    print(f"    - {subitem}")
-                        except:
-                            pass
-                    else:
-                        print(f"  文件: {item}")
+        tk_library = os.environ.get('TK_LIBRARY')
+        if not tk_library or not os.path.exists(os.path.join(tk_library, 'tk.tcl')):
+            print(f"⚠️ 警告：TK_LIBRARY 无效（{tk_library}），请检查构建生成的 tk_paths.json")
 
 def print_system_info():
     """打印系统信息"""
@@ -172,28 +117,54 @@ def print_system_info():
 
 def main():
     """主函数"""
+    # 命令行子命令不启动界面（不导入 Tk）
+    from cli_commands import COMMANDS
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        from cli import main as run_cli
+        sys.exit(run_cli(sys.argv[1:]))
+    
+    # 已有实例在运行时把参数转发过去后直接退出（不导入 Tk）
+    from single_instance import acquire, parse_launch_args
+    instance_server = acquire(parse_launch_args(sys.argv[1:]))
+    if instance_server is None:
+        print("✓ Todo App 已在运行，已转发到现有窗口")
+        return
+    
     print_system_info()
     
     # 检查依赖
-    if not check_dependencies():
+    with startup_tracer.phase("check_deps"):
+        deps_ok = check_dependencies()
+    if not deps_ok:
         print("❌ 缺少必要依赖，程序无法启动")
         print("请运行: pip install -r requirements.txt")
         # 移除 input() 调用，直接退出
         sys.exit(1)
     
     # 设置环境
-    setup_environment()
+    with startup_tracer.phase("environment"):
+        setup_environment()
     
     try:
-        # 导入数据库和任务数量
-        from database import task_db
-        tasks = task_db.get_all_tasks()
-        print(f"已加载 {len(tasks)} 个任务")
+        # 导入并启动主应用（任务在窗口显示后于后台加载）
+        with startup_tracer.phase("imports"):
+            from main_app import main as run_app
+        from profiler import profiler, mode_from_env
+        
+        # 设置 TODO_APP_PROFILE 时分析整个主循环
+        profile_mode = mode_from_env()
+        if profile_mode:
+            success, message = profiler.start(profile_mode)
+            print(message)
         
-        # 导入并启动主应用
-        from main_app import main as run_app
         print("🚀 启动 Todo App v0.3.1...")
-        run_app()
+        try:
+            run_app(instance_server)
+        finally:
+            instance_server.close()
+            if profiler.is_running:
+                success, message = profiler.stop()
+                print(message)
     except KeyboardInterrupt:
         print("\n👋 程序被用户中断")
     except Exception as e:
@@ -0,0 +1,161 @@
+"""
+异步任务桥接 - Todo App v0.3.1
+在专用线程中运行 asyncio 事件循环，与 Tk 主循环配合使用。
+
+后台 I/O（自动保存、快照、导出、API 服务器等）写成协程提交到这里，
+不再各自创建线程；需要更新界面时通过 call_in_tk 交回 Tk 主线程
+（Tk 只能在主线程操作，由 root.after 定时取出执行）。
+程序关闭时 shutdown 统一取消所有协程。
+
+用法:
+    async_bridge.attach(root)
+    async_bridge.submit(save(), on_done=lambda future: ...)   # on_done 在 Tk 线程调用
+    async_bridge.every(30, auto_save)                         # 定时执行协程函数
+"""
+import asyncio
+import concurrent.futures
+import queue
+import threading
+from typing import Any, Awaitable, Callable, Optional
+
+class AsyncBridge:
+    """asyncio 事件循环线程与 Tk 主线程之间的桥接"""
+    
+    POLL_INTERVAL_MS = 50
+    
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        # 提交的协程对应的任务（在事件循环线程中增删）
+        self._tasks: set = set()
+        # 等待在 Tk 线程执行的回调: (callback, args)
+        self._tk_calls: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._root = None
+    
+    @property
+    def is_running(self) -> bool:
+        """事件循环线程是否在运行"""
+        return self._thread is not None and self._thread.is_alive()
+    
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """事件循环（首次访问时启动线程）"""
+        self.start()
+        return self._loop
+    
+    def start(self):
+        """启动事件循环线程（已启动时直接返回）"""
+        with self._start_lock:
+            if self.is_running:
+                return
+            ready = threading.Event()
+            self._thread = threading.Thread(target=self._run, args=(ready,), name="async-bridge", daemon=True)
+            self._thread.start()
+            ready.wait()
+    
+    def _run(self, ready: threading.Event):
+        """事件循环线程"""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        loop.call_soon(ready.set)
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+    
+    def attach(self, root):
+        """开始在 Tk 主线程中执行 call_in_tk 提交的回调"""
+        self._root = root
+        root.after(self.POLL_INTERVAL_MS, self._drain_tk_calls)
+    
+    def call_in_tk(self, callback: Callable, *args):
+        """在 Tk 主线程中调用（任意线程可用）"""
+        self._tk_calls.put((callback, args))
+    
+    def _drain_tk_calls(self):
+        """执行等待中的 Tk 回调"""
+        while True:
+            try:
+                callback, args = self._tk_calls.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"后台任务回调失败: {e}")
+        
+        try:
+            self._root.after(self.POLL_INTERVAL_MS, self._drain_tk_calls)
+        except Exception:
+            # 窗口已销毁
+            self._root = None
+    
+    def submit(self, coro: Awaitable, on_done: Optional[Callable[[concurrent.futures.Future], None]] = None
+               ) -> concurrent.futures.Future:
+        """提交协程，返回线程安全的 Future
+        
+        Args:
+            coro: 协程
+            on_done: 完成（包括失败和取消）后在 Tk 主线程调用，参数为 Future
+        """
+        future = asyncio.run_coroutine_threadsafe(self._track(coro), self.loop)
+        if on_done is not None:
+            future.add_done_callback(lambda done: self.call_in_tk(on_done, done))
+        return future
+    
+    async def _track(self, coro: Awaitable) -> Any:
+        """记录正在运行的任务，供 shutdown 取消"""
+        task = asyncio.current_task()
+        self._tasks.add(task)
+        try:
+            return await coro
+        finally:
+            self._tasks.discard(task)
+    
+    async def run_blocking(self, func: Callable, *args) -> Any:
+        """在线程池中执行阻塞函数（文件读写等），不阻塞事件循环"""
+        return await asyncio.to_thread(func, *args)
+    
+    def every(self, interval: float, func: Callable[[], Awaitable], name: str = "") -> concurrent.futures.Future:
+        """每隔 interval 秒执行一次协程函数，单次失败不影响后续执行
+        
+        Returns:
+            Future，取消即停止定时执行
+        """
+        async def periodic():
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    await func()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    print(f"定时任务 {name or func.__name__} 失败: {e}")
+        
+        return self.submit(periodic())
+    
+    def shutdown(self, timeout: float = 5.0):
+        """取消所有协程，等待线程池中的阻塞调用结束后停止事件循环"""
+        if not self.is_running:
+            return
+        
+        async def cancel_all():
+            tasks = list(self._tasks)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            # asyncio.to_thread 中的阻塞调用无法取消，等待其结束（如正在写入的保存）
+            await asyncio.wait_for(self._loop.shutdown_default_executor(), timeout)
+        
+        try:
+            asyncio.run_coroutine_threadsafe(cancel_all(), self._loop).result(timeout)
+        except Exception as e:
+            print(f"停止后台任务超时: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+        self._thread = None
+
+# 全局异步桥接实例（首次提交协程时启动线程）
+async_bridge = AsyncBridge()
@@ -0,0 +1,4 @@
+"""
+性能基准 - Todo App v0.3.1
+存储、查询与界面刷新的基准测试
+"""
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+存储与查询基准 - Todo App v0.3.1
+在不同任务规模下测量 TaskDatabase 各操作的吞吐量和峰值内存，结果输出为 JSON
+
+用法:
+    python benchmarks/bench_storage.py --sizes 1000,10000,100000 --output bench_storage.json
+    python benchmarks/bench_storage.py --sizes 1000000 --compare bench_storage.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.task_generator import generate_tasks, write_tasks_file
+from config import app_config
+from database import TaskDatabase
+from models import Task
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+SEARCH_QUERIES = ["周报", "review", "deadline", "不存在的内容"]
+SORT_KEYS = ["created_at", "priority", "due_date", "title", "completed"]
+
+def measure(operation: Callable[[], Any], repeat: int, trace_memory: bool) -> Dict[str, float]:
+    """重复执行操作并统计耗时，可选地单独再执行一次测量峰值内存"""
+    # 屏蔽数据库自身的打印输出
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            operation()
+        elapsed = time.perf_counter() - start
+        
+        peak = None
+        if trace_memory:
+            # tracemalloc 会拖慢执行，因此与计时分开
+            tracemalloc.start()
+            operation()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+    
+    return {
+        "ops": repeat,
+        "seconds": elapsed,
+        "ops_per_sec": repeat / elapsed if elapsed > 0 else float("inf"),
+        "peak_memory_bytes": peak
+    }
+
+def bench_size(size: int, work_dir: Path, trace_memory: bool) -> List[Dict[str, Any]]:
+    """测量单个规模下的所有操作"""
+    tasks_file = work_dir / f"tasks_{size}.json"
+    write_tasks_file(tasks_file, size)
+    db = TaskDatabase(autoload=False, tasks_file=tasks_file)
+    
+    # 大规模下每次写操作都要重写整个文件，相应减少重复次数
+    repeat = max(1, min(20, 100000 // size))
+    write_repeat = max(1, min(20, 20000 // size))
+    results = []
+    
+    def record(name: str, operation: Callable[[], Any], times: int):
+        result = measure(operation, times, trace_memory)
+        result.update({"size": size, "operation": name})
+        results.append(result)
+        print(f"  {name:<28} {result['ops_per_sec']:>12.2f} ops/s"
+              + (f"  峰值 {result['peak_memory_bytes'] / 1024 / 1024:.1f} MB" if result["peak_memory_bytes"] else ""))
+    
+    print(f"\n规模: {size} 个任务 ({tasks_file.stat().st_size / 1024 / 1024:.1f} MB)")
+    
+    record("load_tasks", db.load_tasks, repeat)
+    record("save_tasks", db.save_tasks, write_repeat)
+    for query in SEARCH_QUERIES:
+        record(f"search_tasks[{query}]", lambda q=query: db.search_tasks(q), repeat)
+    for key in SORT_KEYS:
+        record(f"sort_tasks[{key}]", lambda k=key: db.sort_tasks(k), repeat)
+    record("get_statistics", db.get_statistics, repeat)
+    
+    new_tasks = iter(generate_tasks(write_repeat * 2 + 2, seed=size))
+    record("add_task", lambda: db.add_task(next(new_tasks)), write_repeat)
+    
+    target_ids = [task.id for task in db.get_all_tasks()[:write_repeat + 1]]
+    target_iter = iter(target_ids)
+    record("update_task", lambda: db.update_task(next(target_iter), title="基准更新"), write_repeat)
+    
+    delete_iter = iter(target_ids)
+    record("delete_task", lambda: db.delete_task(next(delete_iter)), write_repeat)
+    
+    # 快速添加只追加日志，不读取任务文件，耗时不应随任务规模增长
+    capture_db = TaskDatabase(autoload=False, tasks_file=tasks_file)
+    quick_tasks = iter(generate_tasks(repeat + 1, seed=size + 1))
+    record("quick_add", lambda: capture_db.quick_add(next(quick_tasks)), repeat)
+    capture_db.journal.path.unlink()
+    
+    tasks_file.unlink()
+    return results
+
+def compare(previous_file: Path, results: List[Dict[str, Any]]):
+    """与之前的结果比较吞吐量"""
+    with open(previous_file, 'r', encoding='utf-8') as f:
+        previous = {(r["size"], r["operation"]): r for r in json.load(f)["results"]}
+    
+    print(f"\n与 {previous_file} 比较（>1 表示更快）:")
+    for result in results:
+        old = previous.get((result["size"], result["operation"]))
+        if old and old["ops_per_sec"]:
+            ratio = result["ops_per_sec"] / old["ops_per_sec"]
+            print(f"  {result['size']:>8} {result['operation']:<28} x{ratio:.2f}")
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="TaskDatabase 存储与查询基准")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="逗号分隔的任务规模，例如 1000,10000,100000,1000000")
+    parser.add_argument("--output", default="bench_storage.json", help="结果 JSON 文件")
+    parser.add_argument("--compare", help="与之前的结果 JSON 比较")
+    parser.add_argument("--no-memory", action="store_true", help="不测量峰值内存")
+    args = parser.parse_args()
+    
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for size in sizes:
+            results.extend(bench_size(size, Path(work_dir), not args.no_memory))
+    
+    report = {
+        "meta": {
+            "benchmark": "storage",
+            "app_version": app_config.version,
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
+        },
+        "results": results
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n结果已写入: {args.output}")
+    
+    if args.compare:
+        compare(Path(args.compare), results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+界面基准 - Todo App v0.3.1
+在 Xvfb（或现有显示）下运行 TodoApp，测量真实的界面耗时和控件数量
+
+用法:
+    python benchmarks/bench_ui.py --sizes 100,1000 --renderer both --output bench_ui.json
+
+没有 DISPLAY 时会自动启动 Xvfb（需要已安装 Xvfb）。
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+DEFAULT_SIZES = [100, 1000]
+
+def start_virtual_display() -> Optional[subprocess.Popen]:
+    """需要时启动 Xvfb 虚拟显示"""
+    if os.environ.get("DISPLAY") or sys.platform in ("win32", "darwin"):
+        return None
+    
+    xvfb = shutil.which("Xvfb")
+    if not xvfb:
+        sys.exit("❌ 没有可用的显示，且未找到 Xvfb（Linux 可运行: sudo apt-get install xvfb）")
+    
+    display = ":97"
+    process = subprocess.Popen(
+        [xvfb, display, "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    os.environ["DISPLAY"] = display
+    time.sleep(0.5)
+    return process
+
+def pump_until(app, predicate: Callable[[], bool], timeout: float = 120.0):
+    """处理事件直到条件满足（包括 after_idle 分批渲染）"""
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("等待界面完成超时")
+        app.update()
+    app.update_idletasks()
+
+def run_benchmark(size: int, renderer: str) -> List[Dict[str, Any]]:
+    """在独立进程的数据目录中测量一个规模/渲染方式组合"""
+    # 这些模块在设置 TODO_APP_HOME 之后才导入
+    from main_app import TodoApp
+    from database import task_db
+    from perf_hud import count_widgets
+    
+    results = []
+    
+    def record(step: str, seconds: float, app):
+        result = {
+            "size": size,
+            "renderer": renderer,
+            "step": step,
+            "seconds": seconds,
+            "widgets": count_widgets(app)
+        }
+        results.append(result)
+        print(f"  {step:<24} {seconds * 1000:>10.1f} ms   控件数 {result['widgets']}")
+    
+    start = time.perf_counter()
+    app = TodoApp()
+    app.update()
+    record("startup_to_first_paint", time.perf_counter() - start, app)
+    
+    pump_until(app, lambda: task_db.is_loaded and app.render_complete)
+    record("startup_to_tasks_ready", time.perf_counter() - start, app)
+    
+    def timed(step: str, action: Callable[[], None]):
+        step_start = time.perf_counter()
+        action()
+        pump_until(app, lambda: app.render_complete)
+        record(step, time.perf_counter() - step_start, app)
+    
+    timed("refresh_tasks", app.refresh_tasks)
+    
+    def search_keystroke():
+        app.search_entry.insert("end", "e")
+        app.on_search_changed()
+    timed("search_keystroke", search_keystroke)
+    
+    def clear_search():
+        app.search_entry.delete(0, "end")
+        app.on_search_changed()
+    timed("clear_search", clear_search)
+    
+    def sort_change():
+        app.sort_var.set("优先级")
+        app.on_sort_changed("优先级")
+    timed("sort_change", sort_change)
+    
+    def toggle_first():
+        app.on_task_toggle(task_db.get_all_tasks()[0])
+    timed("toggle_task", toggle_first)
+    
+    for step in ("open_settings_first", "open_settings_again"):
+        step_start = time.perf_counter()
+        app.show_settings()
+        app.update()
+        record(step, time.perf_counter() - step_start, app)
+        app.settings_dialog.cancel()
+        app.update()
+    
+    app.destroy()
+    return results
+
+def run_child(size: int, renderer: str, result_file: Path):
+    """子进程入口：准备数据目录后运行基准"""
+    from benchmarks.task_generator import write_tasks_file
+    
+    home = Path(os.environ["TODO_APP_HOME"])
+    write_tasks_file(home / "tasks.json", size)
+    with open(home / "config.json", 'w', encoding='utf-8') as f:
+        json.dump({
+            "list_renderer": renderer,
+            "auto_save": False,
+            "snapshot_enabled": False
+        }, f)
+    
+    results = run_benchmark(size, renderer)
+    with open(result_file, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False)
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="TodoApp 界面基准")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="逗号分隔的任务规模")
+    parser.add_argument("--renderer", choices=["widget", "canvas", "both"], default="both", help="列表渲染方式")
+    parser.add_argument("--output", default="bench_ui.json", help="结果 JSON 文件")
+    parser.add_argument("--child", nargs=3, metavar=("SIZE", "RENDERER", "RESULT"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        run_child(int(args.child[0]), args.child[1], Path(args.child[2]))
+        return
+    
+    xvfb = start_virtual_display()
+    renderers = ["widget", "canvas"] if args.renderer == "both" else [args.renderer]
+    results = []
+    try:
+        for size in [int(size) for size in args.sizes.split(",") if size.strip()]:
+            for renderer in renderers:
+                print(f"\n规模: {size} 个任务，渲染方式: {renderer}")
+                # 每个组合使用独立进程和数据目录，避免全局单例互相影响
+                with tempfile.TemporaryDirectory() as home:
+                    result_file = Path(home) / "result.json"
+                    env = dict(os.environ, TODO_APP_HOME=home)
+                    subprocess.run(
+                        [sys.executable, __file__, "--child", str(size), renderer, str(result_file)],
+                        env=env, check=True
+                    )
+                    with open(result_file, 'r', encoding='utf-8') as f:
+                        results.extend(json.load(f))
+    finally:
+        if xvfb:
+            xvfb.terminate()
+    
+    report = {
+        "meta": {
+            "benchmark": "ui",
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
+        },
+        "results": results
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n结果已写入: {args.output}")
+
+if __name__ == "__main__":
+    main()
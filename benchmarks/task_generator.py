@@ -0,0 +1,81 @@
+"""
+合成任务生成器 - Todo App v0.3.1
+生成中英文混合、带优先级/截止日期/标签的逼真任务数据
+"""
+import json
+import random
+import sys
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models import Task
+
+ZH_VERBS = ["整理", "完成", "提交", "检查", "准备", "回复", "更新", "预约", "购买", "复习"]
+ZH_NOUNS = ["周报", "会议纪要", "项目文档", "报销单", "体检", "机票", "合同", "读书笔记", "代码评审", "年度计划"]
+EN_VERBS = ["Review", "Write", "Fix", "Plan", "Call", "Email", "Refactor", "Deploy", "Read", "Book"]
+EN_NOUNS = ["quarterly report", "pull request", "dentist", "release notes", "budget", "slides",
+            "CI pipeline", "client meeting", "onboarding doc", "flight"]
+DESCRIPTION_WORDS = ["需要", "尽快", "和团队", "确认", "细节", "deadline", "follow up", "before Friday",
+                     "参考上次", "记录", "TODO", "blocked by", "优先处理", "draft", "v2"]
+TAGS = ["工作", "生活", "学习", "work", "home", "urgent", "later", "健康", "finance", "reading"]
+PRIORITIES = ["高", "中", "中", "低"]  # 中优先级更常见
+
+def generate_task_dicts(count: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """逐个生成任务字典（与 tasks.json 中的格式一致）"""
+    rng = random.Random(seed)
+    base_time = datetime(2025, 1, 1)
+    
+    for index in range(count):
+        if rng.random() < 0.5:
+            title = f"{rng.choice(ZH_VERBS)}{rng.choice(ZH_NOUNS)}"
+        else:
+            title = f"{rng.choice(EN_VERBS)} {rng.choice(EN_NOUNS)}"
+        title += f" #{index}"
+        
+        description = ""
+        if rng.random() < 0.6:
+            description = " ".join(rng.choice(DESCRIPTION_WORDS) for _ in range(rng.randint(3, 20)))
+        
+        created = base_time + timedelta(minutes=rng.randint(0, 365 * 24 * 60))
+        updated = created + timedelta(minutes=rng.randint(0, 30 * 24 * 60))
+        due_date = None
+        if rng.random() < 0.4:
+            due = created + timedelta(days=rng.randint(-10, 60))
+            due_date = due.strftime("%Y-%m-%dT23:59:59")
+        
+        yield {
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "title": title,
+            "description": description,
+            "priority": rng.choice(PRIORITIES),
+            "completed": rng.random() < 0.3,
+            "created_at": created.isoformat(),
+            "updated_at": updated.isoformat(),
+            "due_date": due_date,
+            "tags": rng.sample(TAGS, rng.randint(0, 3))
+        }
+
+def generate_tasks(count: int, seed: int = 0) -> List[Task]:
+    """生成任务对象列表"""
+    return [Task.from_dict(data) for data in generate_task_dicts(count, seed)]
+
+def write_tasks_file(path: Path, count: int, seed: int = 0):
+    """生成任务并写入文件（格式与 TaskDatabase.save_tasks 相同）"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(list(generate_task_dicts(count, seed)), f, ensure_ascii=False, indent=2)
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="生成合成任务文件")
+    parser.add_argument("count", type=int, help="任务数量")
+    parser.add_argument("output", help="输出文件路径")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    args = parser.parse_args()
+    
+    write_tasks_file(Path(args.output), args.count, args.seed)
+    print(f"已生成 {args.count} 个任务: {args.output}")
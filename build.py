@@ -17,6 +17,16 @@ def main():
     print("Todo App v0.3.1 - 本地构建脚本")
     print("=" * 60)
     
+    # 精简打包: python build.py --slim bundle_trace.json
+    if "--slim" in sys.argv:
+        index = sys.argv.index("--slim")
+        if index + 1 >= len(sys.argv) or not Path(sys.argv[index + 1]).exists():
+            print("❌ --slim 需要指定已记录的追踪文件")
+            print("请先运行: TODO_APP_BUNDLE_TRACE=bundle_trace.json python app.py")
+            return False
+        os.environ["TODO_APP_SLIM_TRACE"] = str(Path(sys.argv[index + 1]).resolve())
+        print(f"✓ 精简打包，使用追踪文件: {sys.argv[index + 1]}")
+    
     # 检查 PyInstaller
     try:
         import PyInstaller
@@ -103,7 +113,7 @@ def main():
         else:
             print("❌ 构建失败")
             return False
-            
+    
     except subprocess.CalledProcessError as e:
         print(f"❌ 构建过程出错: {e}")
         return False
@@ -2,6 +2,7 @@
 import os
 import sys
 import glob
+import json
 from pathlib import Path
 
 # 添加当前目录到路径
@@ -13,6 +14,9 @@ block_cipher = None
 # 数据文件收集
 datas = []
 
+# 构建时解析出的 TCL/TK 库目录（相对于 _MEIPASS），由运行时钩子直接应用
+tk_manifest = {}
+
 # CustomTkinter 资源文件
 try:
     import customtkinter
@@ -76,6 +80,7 @@ try:
             init_tcl = tcl_path / 'init.tcl'
             if init_tcl.exists():
                 datas.append((str(tcl_path), '_tcl_data/tcl8.6'))
+                tk_manifest['TCL_LIBRARY'] = '_tcl_data/tcl8.6'
                 print(f"Added complete TCL library: {tcl_path}")
                 break
     
@@ -96,6 +101,7 @@ try:
             if tk_tcl.exists():
                 # 将整个TK库内容直接放在_tk_data目录，而不是_tk_data/tk8.6子目录
                 datas.append((str(tk_path), '_tk_data'))
+                tk_manifest['TK_LIBRARY'] = '_tk_data'
                 print(f"Added complete TK library with tk.tcl: {tk_path} -> _tk_data")
                 print(f"Verified tk.tcl exists: {tk_tcl}")
                 tk_library_found = True
@@ -109,6 +115,7 @@ try:
                 tk_dir = tk_tcl_file.parent
                 # 直接放在_tk_data根目录
                 datas.append((str(tk_dir), '_tk_data'))
+                tk_manifest['TK_LIBRARY'] = '_tk_data'
                 print(f"Found tk.tcl and added TK library: {tk_dir} -> _tk_data")
                 tk_library_found = True
                 break
@@ -125,6 +132,17 @@ try:
 except ImportError as e:
     print(f"Warning: Tkinter import failed: {e}")
 
+# 生成 TCL/TK 路径清单并打包到 _MEIPASS 根目录
+if tk_manifest:
+    os.makedirs(workpath, exist_ok=True)
+    tk_manifest_path = os.path.join(workpath, 'tk_paths.json')
+    with open(tk_manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(tk_manifest, f, indent=2)
+    datas.append((tk_manifest_path, '.'))
+    print(f"Generated TCL/TK path manifest: {tk_manifest}")
+else:
+    print("Warning: 未找到 TCL/TK 库，不生成路径清单")
+
 # 隐藏导入 - 使用 collect-submodules 方式
 hiddenimports = [
     'customtkinter',
@@ -176,7 +194,7 @@ a = Analysis(
     hiddenimports=hiddenimports,
     hookspath=['.'],
     hooksconfig={},
-    runtime_hooks=['pyi_rth_tkinter_fix.py', 'pyi_rth_tkinter_override.py', 'pyi_rth_tkinter_final.py', 'hook-runtime.py'],
+    runtime_hooks=['pyi_rth_tk_manifest.py'],
     additional_hooks_dir=['.'],
     excludes=excludes,
     win_no_prefer_redirects=False,
@@ -187,6 +205,16 @@ a = Analysis(
     collect_submodules=['tkinter'],
 )
 
+# 精简打包：根据运行时追踪剔除未用到的 Tcl/Tk 和 customtkinter 资源
+slim_trace = os.environ.get('TODO_APP_SLIM_TRACE')
+if slim_trace:
+    from bundle_slim import BundlePruner, load_trace, report
+    pruner = BundlePruner(load_trace(slim_trace), tk_manifest)
+    slim_datas, removed_datas = pruner.prune(a.datas)
+    print(f"Slim build: removed {len(removed_datas)} data files using trace {slim_trace}")
+    print(report(a.datas, slim_datas))
+    a.datas = slim_datas
+
 
 pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
 
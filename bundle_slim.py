@@ -0,0 +1,240 @@
+"""
+精简打包 - Todo App v0.3.1
+根据运行时记录的 Tcl 文件访问和主题使用情况，
+在打包时剔除用不到的 Tcl 编码、消息目录、时区数据、演示程序和 customtkinter 主题
+"""
+import fnmatch
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# 打包后 Tcl/Tk 库目录相对于 _MEIPASS 的位置（与 build.spec 生成的 tk_paths.json 一致）
+DEFAULT_LIBRARY_DESTS = {
+    "TCL_LIBRARY": "_tcl_data/tcl8.6",
+    "TK_LIBRARY": "_tk_data",
+}
+
+# 即使追踪中没有出现也保留的编码（Tk 字体和常见系统编码可能在 C 层直接加载）。
+# 追踪只反映构建机器的系统编码，中文系统的编码始终保留，
+# 否则在非中文系统上构建的精简包在目标系统上无法正确处理中文
+ALWAYS_KEEP_ENCODINGS = {"ascii", "iso8859-1", "cp1252", "utf-8", "unicode",
+                         "cp936", "gb2312", "euc-cn"}
+
+# 即使追踪中没有出现也保留的 Tcl 文件（msgcat 是 Tk 对话框本地化的依赖，缺失时会直接报错）
+ALWAYS_KEEP_TCL = ["tcl8/8.5/msgcat-*.tm"]
+
+# 始终保留的消息语言（同样不依赖构建机器的语言设置）
+ALWAYS_KEEP_LOCALES = {"en", "zh", "zh_cn"}
+
+# ---------------------------------------------------------------------------
+# 运行时追踪
+# ---------------------------------------------------------------------------
+
+_TCL_TRACE_SCRIPT = """
+if {[info commands ::_todo_traced_source] eq ""} {
+    set ::_todo_sourced {}
+    rename ::source ::_todo_traced_source
+    proc ::source {args} {
+        lappend ::_todo_sourced [file normalize [lindex $args end]]
+        uplevel 1 [linsert $args 0 ::_todo_traced_source]
+    }
+}
+"""
+
+def start_trace(root):
+    """在 Tk 解释器中记录之后被 source 的 Tcl 文件（init.tcl、tk.tcl 等启动脚本总是保留）"""
+    root.tk.eval(_TCL_TRACE_SCRIPT)
+
+def _relative_to(path: str, library: str) -> Optional[str]:
+    """path 位于 library 下时返回相对路径（/ 分隔）"""
+    try:
+        return Path(path).resolve().relative_to(Path(library).resolve()).as_posix()
+    except ValueError:
+        return None
+
+def collect_trace(root) -> Dict[str, Any]:
+    """收集追踪结果"""
+    tk = root.tk
+    tcl_library = tk.eval("info library")
+    tk_library = tk.eval("set tk_library")
+    sourced = tk.splitlist(tk.eval("if {[info exists ::_todo_sourced]} {set ::_todo_sourced}"))
+    
+    tcl_files, tk_files = set(), set()
+    for path in sourced:
+        relative = _relative_to(path, tk_library)
+        if relative is not None:
+            tk_files.add(relative)
+            continue
+        relative = _relative_to(path, tcl_library)
+        if relative is not None:
+            tcl_files.add(relative)
+    
+    try:
+        from customtkinter import ThemeManager
+        theme = ThemeManager._currently_loaded_theme
+    except Exception:
+        theme = None
+    
+    # Tk 对话框使用的 msgcat 语言偏好（msgcat 未加载时为空）
+    locales = []
+    if tk.eval("info commands ::msgcat::mcpreferences"):
+        locales = [locale for locale in tk.splitlist(tk.eval("::msgcat::mcpreferences")) if locale]
+    
+    return {
+        "python_version": sys.version.split()[0],
+        "platform": sys.platform,
+        "modules": sorted(sys.modules),
+        "tcl_files": sorted(tcl_files),
+        "tk_files": sorted(tk_files),
+        "encodings": [tk.eval("encoding system")],
+        "locales": locales,
+        "ctk_themes": [theme] if theme else [],
+    }
+
+def write_trace(root, path) -> bool:
+    """把追踪结果写入 JSON 文件"""
+    try:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(collect_trace(root), f, ensure_ascii=False, indent=2)
+        print(f"已写入打包追踪: {path}")
+        return True
+    except Exception as e:
+        print(f"写入打包追踪失败: {e}")
+        return False
+
+def load_trace(path) -> Dict[str, Any]:
+    """读取追踪文件"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+# ---------------------------------------------------------------------------
+# 打包时剪裁
+# ---------------------------------------------------------------------------
+
+class BundlePruner:
+    """判断打包数据文件是否需要保留
+    
+    只剪裁以下几类可确定的资源，其余文件一律保留:
+        Tcl: encoding/*.enc、msgs/、tzdata/、tcl8/ 下的模块和 http1.0 等包目录
+        Tk: demos/、images/、msgs/
+        customtkinter: assets/themes/*.json
+        tkinter: build.spec 额外复制的 .py 源文件中运行时未导入的模块
+    其中运行时追踪中出现过的文件总是保留。
+    """
+    
+    def __init__(self, trace: Dict[str, Any], library_dests: Optional[Dict[str, str]] = None):
+        dests = dict(DEFAULT_LIBRARY_DESTS, **(library_dests or {}))
+        self.tcl_prefix = dests["TCL_LIBRARY"].rstrip("/") + "/"
+        self.tk_prefix = dests["TK_LIBRARY"].rstrip("/") + "/"
+        self.tcl_files = set(trace.get("tcl_files", []))
+        self.tk_files = set(trace.get("tk_files", []))
+        self.encodings = ALWAYS_KEEP_ENCODINGS | set(trace.get("encodings", []))
+        self.locales = ALWAYS_KEEP_LOCALES | {locale.lower() for locale in trace.get("locales", [])}
+        self.themes = {os.path.splitext(os.path.basename(theme))[0] for theme in trace.get("ctk_themes", [])}
+        self.modules = set(trace.get("modules", []))
+    
+    def _keep_tcl(self, relative: str) -> bool:
+        """Tcl 库中的文件"""
+        if relative in self.tcl_files or any(fnmatch.fnmatch(relative, p) for p in ALWAYS_KEEP_TCL):
+            return True
+        parts = relative.split("/")
+        if len(parts) == 1:
+            return True  # 库根目录下的脚本体积很小且可能被自动加载
+        if parts[0] == "encoding":
+            return os.path.splitext(parts[-1])[0] in self.encodings
+        if parts[0] == "msgs" and os.path.splitext(parts[-1])[0].lower() in self.locales:
+            return True
+        # msgs/、tzdata/、tcl8/ 以及 http1.0 等包目录只保留被用到的文件
+        return False
+    
+    def _keep_tk(self, relative: str) -> bool:
+        """Tk 库中的文件"""
+        if relative in self.tk_files:
+            return True
+        parts = relative.split("/")
+        if parts[0] in ("demos", "images"):
+            return False
+        if parts[0] == "msgs":
+            return os.path.splitext(parts[-1])[0].lower() in self.locales
+        return True
+    
+    def _keep_ctk(self, relative: str) -> bool:
+        """customtkinter 资源文件"""
+        if relative.startswith("assets/themes/") and self.themes:
+            return os.path.splitext(os.path.basename(relative))[0] in self.themes
+        return True
+    
+    def _keep_tkinter_source(self, relative: str) -> bool:
+        """tkinter 的 .py 源文件"""
+        if not relative.endswith(".py") or not self.modules:
+            return True
+        module = "tkinter/" + relative[:-len(".py")]
+        if module.endswith("/__init__"):
+            module = module[:-len("/__init__")]
+        return module.replace("/", ".") in self.modules
+    
+    def keep(self, dest_name: str) -> bool:
+        """打包目标路径（相对于 _MEIPASS）是否保留"""
+        dest = dest_name.replace("\\", "/")
+        if dest.startswith(self.tcl_prefix):
+            return self._keep_tcl(dest[len(self.tcl_prefix):])
+        if dest.startswith(self.tk_prefix):
+            return self._keep_tk(dest[len(self.tk_prefix):])
+        if dest.startswith("customtkinter/"):
+            return self._keep_ctk(dest[len("customtkinter/"):])
+        if dest.startswith("tkinter/"):
+            return self._keep_tkinter_source(dest[len("tkinter/"):])
+        return True
+    
+    def prune(self, toc: Iterable[Tuple]) -> Tuple[List[Tuple], List[Tuple]]:
+        """拆分 PyInstaller TOC 条目 (dest_name, src_name, typecode)，返回 (保留, 剔除)"""
+        kept, removed = [], []
+        for entry in toc:
+            (kept if self.keep(entry[0]) else removed).append(entry)
+        return kept, removed
+
+def toc_size(toc: Sequence[Tuple]) -> int:
+    """TOC 条目源文件的总字节数"""
+    total = 0
+    for entry in toc:
+        try:
+            total += os.path.getsize(entry[1])
+        except OSError:
+            pass
+    return total
+
+def measure_extraction(toc: Sequence[Tuple], repeat: int = 3) -> float:
+    """模拟单文件模式启动时的解包：把所有文件复制到临时目录，返回中位耗时（秒）"""
+    durations = []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory(prefix="todo_extract_") as temp_dir:
+            start = time.perf_counter()
+            for dest_name, src_name, *_ in toc:
+                target = os.path.join(temp_dir, dest_name)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.copyfile(src_name, target)
+            durations.append(time.perf_counter() - start)
+    durations.sort()
+    return durations[len(durations) // 2]
+
+def report(before: Sequence[Tuple], after: Sequence[Tuple]) -> str:
+    """生成精简前后的体积和解包耗时对比"""
+    size_before, size_after = toc_size(before), toc_size(after)
+    time_before, time_after = measure_extraction(before), measure_extraction(after)
+    
+    def percent(old, new):
+        return (old - new) / old * 100 if old else 0.0
+    
+    return "\n".join([
+        "精简打包报告:",
+        f"  数据文件: {len(before)} -> {len(after)}",
+        f"  体积: {size_before / 1024 / 1024:.2f} MB -> {size_after / 1024 / 1024:.2f} MB"
+        f"（减少 {percent(size_before, size_after):.1f}%）",
+        f"  模拟解包: {time_before * 1000:.1f} ms -> {time_after * 1000:.1f} ms"
+        f"（减少 {percent(time_before, time_after):.1f}%）",
+    ])
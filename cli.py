@@ -0,0 +1,298 @@
+"""
+命令行模式 - Todo App v0.3.1
+不启动界面直接操作任务数据，适合脚本、cron 和管道批量处理。
+本模块不导入 tkinter / customtkinter / main_app
+"""
+import argparse
+import json
+import sys
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+from typing import List, Optional, TextIO, Tuple
+from models import Task
+from database import TaskDatabase, task_db
+from config import app_config
+from exporters import FORMATS, export_to_file, write_tasks as write_export
+from cli_commands import COMMANDS
+PRIORITIES = ("高", "中", "低")
+SHORT_ID_LENGTH = 8
+
+def due_date(value: str) -> str:
+    """截止日期参数：校验 YYYY-MM-DD，保存为当天结束时间（与界面编辑一致）"""
+    try:
+        datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"日期格式错误，应为 YYYY-MM-DD: {value}")
+    return f"{value}T23:59:59"
+
+def build_parser() -> argparse.ArgumentParser:
+    """命令行参数定义"""
+    parser = argparse.ArgumentParser(prog="app.py", description="Todo App 命令行模式")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    add_parser = subparsers.add_parser("add", help="添加任务（标题为 - 或省略时从标准输入逐行读取）")
+    add_parser.add_argument("titles", nargs="*", help="任务标题")
+    add_parser.add_argument("-p", "--priority", choices=PRIORITIES, default="中", help="优先级")
+    add_parser.add_argument("-d", "--description", default="", help="任务描述")
+    add_parser.add_argument("--due", type=due_date, help="截止日期 (YYYY-MM-DD)")
+    add_parser.add_argument("-t", "--tag", action="append", default=[], help="标签（可重复）")
+    add_parser.add_argument("-q", "--quick", action="store_true",
+                            help="只追加到任务日志，不读取任务文件（由界面或下次启动合并）")
+    
+    list_parser = subparsers.add_parser("list", help="列出任务")
+    status_group = list_parser.add_mutually_exclusive_group()
+    status_group.add_argument("--done", action="store_true", help="只显示已完成")
+    status_group.add_argument("--pending", action="store_true", help="只显示未完成")
+    list_parser.add_argument("-p", "--priority", choices=PRIORITIES, help="按优先级筛选")
+    list_parser.add_argument("-s", "--sort", default="created_at",
+                             choices=("created_at", "priority", "due_date", "title", "completed"), help="排序方式")
+    list_parser.add_argument("--json", action="store_true", help="以 JSON 输出")
+    
+    done_parser = subparsers.add_parser("done", help="标记任务完成（ID 可用前缀，- 或省略时从标准输入读取）")
+    done_parser.add_argument("ids", nargs="*", help="任务 ID 或 ID 前缀")
+    done_parser.add_argument("--undo", action="store_true", help="标记为未完成")
+    
+    search_parser = subparsers.add_parser("search", help="搜索任务标题和描述")
+    search_parser.add_argument("query", help="关键词")
+    search_parser.add_argument("--json", action="store_true", help="以 JSON 输出")
+    
+    stats_parser = subparsers.add_parser("stats", help="任务统计")
+    stats_parser.add_argument("--json", action="store_true", help="以 JSON 输出")
+    
+    export_parser = subparsers.add_parser("export", help="导出任务（与界面导出格式相同）")
+    export_parser.add_argument("file", nargs="?", default="-", help="输出文件，默认标准输出")
+    export_parser.add_argument("-f", "--format", choices=tuple(FORMATS),
+                               help="导出格式，默认按文件扩展名判断（标准输出为 json）")
+    
+    import_parser = subparsers.add_parser("import", help="导入任务（界面导出的文件或任务列表，跳过已存在的 ID）")
+    import_parser.add_argument("file", nargs="?", default="-", help="输入文件，默认标准输入")
+    
+    snapshots_parser = subparsers.add_parser("snapshots", help="列出快照，或从快照恢复任务和设置（恢复前先关闭界面）")
+    snapshots_parser.add_argument("action", nargs="?", choices=("list", "restore"), default="list", help="操作，默认 list")
+    snapshots_parser.add_argument("snapshot_id", nargs="?", help="要恢复的快照 ID（可用前缀）")
+    snapshots_parser.add_argument("--to", metavar="DIR", help="恢复到指定目录，不覆盖当前数据")
+    snapshots_parser.add_argument("--json", action="store_true", help="以 JSON 输出快照列表")
+    
+    serve_parser = subparsers.add_parser("serve", help="在前台运行本地 REST/JSON 接口（Ctrl+C 停止）")
+    serve_parser.add_argument("--address", help="监听地址（主机:端口 或 unix:路径），默认使用设置中的 api_address")
+    
+    return parser
+
+def read_stdin_lines(stdin: TextIO) -> List[str]:
+    """从标准输入读取非空行"""
+    return [line.strip() for line in stdin if line.strip()]
+
+def parse_import_data(data) -> List[Task]:
+    """把导入文件的内容转换为任务列表，格式不正确时抛出 ValueError"""
+    items = data.get("tasks", []) if isinstance(data, dict) else data
+    if not isinstance(items, list):
+        raise ValueError("导入文件格式错误：应为任务列表或包含 tasks 列表的对象")
+    tasks = []
+    for index, item in enumerate(items, 1):
+        if not isinstance(item, dict) or not isinstance(item.get("title", item.get("text")), str):
+            raise ValueError(f"导入文件格式错误：第 {index} 个任务不是包含标题的对象")
+        try:
+            tasks.append(Task.from_dict(dict(item)))
+        except TypeError as e:
+            raise ValueError(f"导入文件格式错误：第 {index} 个任务无效（{e}）")
+    return tasks
+
+def format_task(task: Task) -> str:
+    """单行显示任务"""
+    status = "✓" if task.completed else "○"
+    line = f"{status} {task.id[:SHORT_ID_LENGTH]}  [{task.priority}] {task.title}"
+    if task.due_date:
+        line += f"  (截止 {task.due_date[:10]})"
+    if task.tags:
+        line += "  " + " ".join(f"#{tag}" for tag in task.tags)
+    return line
+
+def resolve_ids(db: TaskDatabase, prefixes: List[str]) -> Tuple[List[str], List[str]]:
+    """把 ID 前缀解析为完整 ID，返回 (ID 列表, 错误信息列表)"""
+    all_ids = [task.id for task in db.get_all_tasks()]
+    resolved, errors = [], []
+    for prefix in prefixes:
+        matches = [task_id for task_id in all_ids if task_id.startswith(prefix)]
+        if len(matches) == 1:
+            resolved.append(matches[0])
+        elif not matches:
+            errors.append(f"找不到任务: {prefix}")
+        else:
+            errors.append(f"ID 前缀不唯一: {prefix}（匹配 {len(matches)} 个任务）")
+    return resolved, errors
+
+def write_tasks(tasks: List[Task], as_json: bool, stdout: TextIO):
+    """输出任务列表"""
+    if as_json:
+        json.dump([task.to_dict() for task in tasks], stdout, ensure_ascii=False, indent=2)
+        stdout.write("\n")
+    else:
+        for task in tasks:
+            stdout.write(format_task(task) + "\n")
+
+def run(args: argparse.Namespace, db: TaskDatabase, stdin: TextIO, stdout: TextIO, stderr: TextIO,
+        store=None) -> int:
+    """执行子命令，返回退出码（store 为快照存储，默认使用全局实例）"""
+    if args.command == "add":
+        titles = args.titles
+        if not titles or titles == ["-"]:
+            titles = read_stdin_lines(stdin)
+        if not titles:
+            stderr.write("没有要添加的任务\n")
+            return 1
+        tasks = [
+            Task(id="", title=title, description=args.description, priority=args.priority,
+                 due_date=args.due, tags=list(args.tag))
+            for title in titles
+        ]
+        if args.quick:
+            if not all(db.quick_add(task) for task in tasks):
+                stderr.write("快速添加任务失败\n")
+                return 1
+        elif not db.add_tasks(tasks):
+            stderr.write("添加任务失败\n")
+            return 1
+        for task in tasks:
+            stdout.write(f"已添加 {task.id[:SHORT_ID_LENGTH]}  {task.title}\n")
+        return 0
+    
+    if args.command == "list":
+        tasks = db.sort_tasks(args.sort)
+        if args.done or args.pending:
+            tasks = [task for task in tasks if task.completed == args.done]
+        if args.priority:
+            tasks = [task for task in tasks if task.priority == args.priority]
+        write_tasks(tasks, args.json, stdout)
+        return 0
+    
+    if args.command == "done":
+        prefixes = args.ids
+        if not prefixes or prefixes == ["-"]:
+            # 支持 `app.py list --pending | ... | app.py done`，每行取第一个像 ID 的字段
+            prefixes = [line.lstrip("✓○ ").split()[0] for line in read_stdin_lines(stdin)]
+        task_ids, errors = resolve_ids(db, prefixes)
+        for error in errors:
+            stderr.write(error + "\n")
+        updated = db.update_tasks(task_ids, completed=not args.undo) if task_ids else 0
+        stdout.write(f"已更新 {updated} 个任务\n")
+        return 0 if not errors and updated == len(task_ids) else 1
+    
+    if args.command == "search":
+        write_tasks(db.search_tasks(args.query), args.json, stdout)
+        return 0
+    
+    if args.command == "stats":
+        stats = db.get_statistics()
+        if args.json:
+            json.dump(stats, stdout, ensure_ascii=False, indent=2)
+            stdout.write("\n")
+        else:
+            stdout.write(f"总任务: {stats['total']}\n")
+            stdout.write(f"已完成: {stats['completed']}\n")
+            stdout.write(f"未完成: {stats['pending']}\n")
+            stdout.write(f"已过期: {stats['overdue']}\n")
+            stdout.write(f"完成率: {stats['completion_rate']:.1f}%\n")
+            stdout.write("优先级: " + "  ".join(f"{p} {n}" for p, n in stats["priority_stats"].items()) + "\n")
+        return 0
+    
+    if args.command == "export":
+        tasks = db.get_all_tasks()
+        if args.file == "-":
+            # CSV 和 iCalendar 自己写入 \r\n，标准输出不能再转换换行符（Windows 上会变成 \r\r\n）
+            if hasattr(stdout, "reconfigure"):
+                stdout.reconfigure(newline="")
+            write_export(tasks, stdout, args.format or "json")
+        else:
+            written = export_to_file(tasks, args.file, args.format)
+            stderr.write(f"已导出 {written} 个任务到: {args.file}\n")
+        return 0
+    
+    if args.command == "import":
+        if args.file == "-":
+            data = json.load(stdin)
+        else:
+            with open(args.file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        tasks = parse_import_data(data)
+        existing_ids = {task.id for task in db.get_all_tasks()}
+        new_tasks = [task for task in tasks if task.id not in existing_ids]
+        if new_tasks and not db.add_tasks(new_tasks):
+            stderr.write("导入任务失败\n")
+            return 1
+        stdout.write(f"已导入 {len(new_tasks)} 个任务，跳过 {len(tasks) - len(new_tasks)} 个已存在的任务\n")
+        return 0
+    
+    if args.command == "snapshots":
+        if store is None:
+            from snapshot_store import snapshot_store as store
+        snapshots = store.list_snapshots()
+        if args.action == "list":
+            if args.json:
+                json.dump(snapshots, stdout, ensure_ascii=False, indent=2)
+                stdout.write("\n")
+            else:
+                for snapshot in snapshots:
+                    size = sum(snapshot["files"].values())
+                    stdout.write(f"{snapshot['id']}  {snapshot['timestamp'][:19]}  {snapshot['description']}  ({size} 字节)\n")
+            return 0
+        
+        if not args.snapshot_id:
+            stderr.write("请指定要恢复的快照 ID\n")
+            return 1
+        matches = [snapshot["id"] for snapshot in snapshots if snapshot["id"].startswith(args.snapshot_id)]
+        if len(matches) != 1:
+            stderr.write(f"找不到快照: {args.snapshot_id}\n" if not matches
+                         else f"快照 ID 前缀不唯一: {args.snapshot_id}（匹配 {len(matches)} 个快照）\n")
+            return 1
+        if not args.to:
+            # 覆盖当前数据前先保存一份，恢复错了还能再恢复回来
+            success, message = store.create_snapshot("恢复前自动快照")
+            stderr.write(message + "\n")
+            if not success:
+                return 1
+        success, message = store.restore_snapshot(matches[0], args.to)
+        (stdout if success else stderr).write(message + "\n")
+        return 0 if success else 1
+    
+    if args.command == "serve":
+        from api_server import ApiServer
+        from async_bridge import async_bridge
+        
+        server = ApiServer(db, args.address or app_config.get("api_address"))
+        success, message = server.start()
+        stderr.write(message + "\n")
+        if not success:
+            return 1
+        try:
+            while server.is_running:
+                time.sleep(0.5)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.stop()
+            async_bridge.shutdown()
+        return 0
+    
+    return 1
+
+def main(argv: Optional[List[str]] = None, db: Optional[TaskDatabase] = None,
+         stdin: Optional[TextIO] = None, stdout: Optional[TextIO] = None, stderr: Optional[TextIO] = None,
+         store=None) -> int:
+    """命令行入口，返回退出码"""
+    args = build_parser().parse_args(argv)
+    db = db or task_db
+    stderr = stderr or sys.stderr
+    try:
+        # 快速添加只写日志，快照直接读写文件，都不需要加载任务
+        if not (args.command == "add" and args.quick) and args.command != "snapshots":
+            # 数据库的加载提示写到标准错误，保持标准输出可被管道解析
+            with redirect_stdout(stderr):
+                db.ensure_loaded()
+        return run(args, db, stdin or sys.stdin, stdout or sys.stdout, stderr, store)
+    except (OSError, ValueError) as e:
+        stderr.write(f"❌ {e}\n")
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
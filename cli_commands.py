@@ -0,0 +1,7 @@
+"""
+命令行子命令 - Todo App v0.3.1
+app.py 遇到这些子命令时不启动界面，直接交给 cli.py 处理。
+本模块不导入任何模块，入口可以在加载 Tk 和任务数据之前判断
+"""
+
+COMMANDS = ("add", "list", "done", "search", "stats", "export", "import", "snapshots", "serve")
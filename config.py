@@ -4,21 +4,41 @@
 """
 import os
 import json
+import copy
+import stat
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Callable, List, Tuple
+from perf import perf
+from startup_trace import startup_tracer
+
+# 进程的 umask（只能通过设置再恢复读取，在导入时读取一次，此时还没有其他线程创建文件）
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+def replacement_file_mode(path: Path) -> int:
+    """替换文件时应使用的权限
+    
+    tempfile.mkstemp 创建的临时文件权限固定为 0600，替换前需改回：
+    目标文件已存在时沿用其权限，否则与 open() 新建文件一样按 umask 计算。
+    """
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
 
 class Config:
     def __init__(self):
         self.app_name = "Todo App v0.3.1"
         self.version = "0.3.1"
         
-        # 配置文件路径 - 存放在软件根目录
-        self.config_dir = Path(__file__).parent
+        # 配置文件路径 - 默认存放在软件根目录，可通过 TODO_APP_HOME 环境变量指定
+        self.config_dir = Path(os.environ.get("TODO_APP_HOME") or Path(__file__).parent)
         self.config_file = self.config_dir / "config.json"
         self.tasks_file = self.config_dir / "tasks.json"
         
         # 确保配置目录存在
-        self.config_dir.mkdir(exist_ok=True)
+        self.config_dir.mkdir(parents=True, exist_ok=True)
         
         # 默认配置
         self.default_config = {
@@ -29,6 +49,12 @@ class Config:
             "show_completed": True,
             "font_size": 14,
             "language": "zh-cn",
+            "list_renderer": "widget",  # widget, canvas
+            "snapshot_enabled": True,  # 定时创建任务/设置快照
+            "snapshot_interval_minutes": 60,
+            "snapshot_keep": 48,
+            "api_enabled": False,  # 本地 REST/JSON 接口（见 api_server.py）
+            "api_address": "127.0.0.1:8765",  # 主机:端口 或 unix:套接字路径
             "priority_colors": {
                 "高": "#ff4444",
                 "中": "#ffaa00", 
@@ -36,7 +62,16 @@ class Config:
             }
         }
         
-        self.config = self.load_config()
+        with startup_tracer.phase("config_load"):
+            self.config = self.load_config()
+        
+        # 配置变更监听器: listener(key, old_value, new_value)
+        self._listeners: List[Callable[[str, Any, Any], None]] = []
+        
+        # 批量修改状态
+        self._batch_depth = 0
+        self._batch_snapshot: Dict[str, Any] = {}
+        self._batch_changes: Dict[str, Tuple[Any, Any]] = {}
     
     def load_config(self) -> Dict[str, Any]:
         """加载配置文件"""
@@ -55,11 +90,22 @@ class Config:
         else:
             return self.default_config.copy()
     
+    @perf.timed()
     def save_config(self):
-        """保存配置文件"""
+        """保存配置文件（先写临时文件再替换，保证原子性）"""
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, ensure_ascii=False, indent=2)
+            import tempfile
+            fd, temp_path = tempfile.mkstemp(
+                dir=self.config_file.parent, prefix=".config_", suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(self.config, f, ensure_ascii=False, indent=2)
+                os.chmod(temp_path, replacement_file_mode(self.config_file))
+                os.replace(temp_path, self.config_file)
+            except Exception:
+                os.unlink(temp_path)
+                raise
         except Exception as e:
             print(f"保存配置失败: {e}")
     
@@ -69,8 +115,91 @@ class Config:
     
     def set(self, key: str, value: Any):
         """设置配置值"""
+        old_value = self.config.get(key)
         self.config[key] = value
+        
+        if self._batch_depth:
+            # 批量模式：记录变更，结束时统一保存和通知
+            first_old = self._batch_changes.get(key, (old_value, None))[0]
+            self._batch_changes[key] = (first_old, value)
+            return
+        
         self.save_config()
+        if old_value != value:
+            self._notify(key, old_value, value)
+    
+    @contextmanager
+    def batch(self):
+        """批量修改配置
+        
+        块内任意次数的 set 只在最外层结束时原子写入一次文件并通知监听器；
+        块内发生异常时回滚到进入前的配置，不写文件。
+        
+        用法:
+            with app_config.batch():
+                app_config.set("theme", "dark")
+                app_config.set("font_size", 16)
+        """
+        if self._batch_depth == 0:
+            self._batch_snapshot = copy.deepcopy(self.config)
+            self._batch_changes = {}
+        self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.config = self._batch_snapshot
+                self._batch_changes = {}
+            raise
+        else:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._commit_batch()
+    
+    def _commit_batch(self):
+        """提交批量修改"""
+        changes, self._batch_changes = self._batch_changes, {}
+        self._batch_snapshot = {}
+        if not changes:
+            return
+        
+        self.save_config()
+        for key, (old_value, new_value) in changes.items():
+            if old_value != new_value:
+                self._notify(key, old_value, new_value)
+    
+    def replace(self, values: Dict[str, Any]):
+        """用 values 替换全部配置（重置为默认值、从备份恢复）
+        
+        与 batch 中逐项 set 相同：只写入一次文件，只通知值发生变化的配置项。
+        """
+        values = copy.deepcopy(values)
+        with self.batch():
+            for key in [key for key in self.config if key not in values]:
+                old_value = self.config.pop(key)
+                # 记为未变化：批量结束时写入文件，但不通知监听器
+                self._batch_changes.setdefault(key, (old_value, old_value))
+            for key, value in values.items():
+                self.set(key, value)
+    
+    def add_listener(self, listener: Callable[[str, Any, Any], None]):
+        """注册配置变更监听器"""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+    
+    def remove_listener(self, listener: Callable[[str, Any, Any], None]):
+        """移除配置变更监听器"""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+    
+    def _notify(self, key: str, old_value: Any, new_value: Any):
+        """通知监听器配置已变更"""
+        for listener in list(self._listeners):
+            try:
+                listener(key, old_value, new_value)
+            except Exception as e:
+                print(f"配置监听器执行失败: {e}")
     
     def get_priority_color(self, priority: str) -> str:
         """获取优先级颜色"""
@@ -3,77 +3,309 @@
 处理任务数据的存储和检索
 """
 import json
+import os
+import threading
+import time
 from typing import List, Optional, Dict, Any
 from pathlib import Path
 from models import Task
-from config import app_config
+from config import app_config, replacement_file_mode
+from perf import perf
+from task_journal import TaskJournal
 
 class TaskDatabase:
     """任务数据库管理类"""
     
-    def __init__(self):
-        self.tasks_file = app_config.tasks_file
-        self._tasks: List[Task] = []
-        self.load_tasks()
+    def __init__(self, autoload: bool = True, tasks_file: Optional[Path] = None):
+        self.tasks_file = Path(tasks_file) if tasks_file else app_config.tasks_file
+        self._task_list: Optional[List[Task]] = None
+        self._load_lock = threading.Lock()
+        # 界面线程、自动保存线程和 API 服务器共享同一个实例：
+        # lock 保护任务列表和版本号，_write_lock 保证文件按修改顺序写入。
+        # 加锁顺序固定为 _load_lock -> _write_lock -> lock，持有 lock 时不写文件
+        self.lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        # 每次修改任务后递增（API 服务器据此生成 ETag）
+        self.version = 0
+        self.last_save_duration = 0.0
+        # 快速添加的追加日志，加载时和界面运行中合并
+        self.journal = TaskJournal(self.tasks_file.with_suffix(".journal"))
+        if autoload:
+            self.load_tasks()
     
+    @property
+    def _tasks(self) -> List[Task]:
+        """任务列表（首次访问时加载）"""
+        if self._task_list is None:
+            self.ensure_loaded()
+        return self._task_list
+    
+    @_tasks.setter
+    def _tasks(self, tasks: List[Task]):
+        self._task_list = tasks
+    
+    @property
+    def is_loaded(self) -> bool:
+        """任务是否已经加载"""
+        return self._task_list is not None
+    
+    def ensure_loaded(self) -> bool:
+        """确保任务已加载（线程安全，可在后台线程调用）"""
+        if self._task_list is not None:
+            return True
+        with self._load_lock:
+            if self._task_list is None:
+                return self.load_tasks()
+        return True
+    
+    @perf.timed()
     def load_tasks(self) -> bool:
         """从文件加载任务"""
         try:
+            tasks = []
             if self.tasks_file.exists():
                 with open(self.tasks_file, 'r', encoding='utf-8') as f:
                     data = json.load(f)
-                    self._tasks = [Task.from_dict(task_data) for task_data in data]
-                print(f"已加载 {len(self._tasks)} 个任务")
-                return True
-            else:
-                self._tasks = []
-                return True
+                    tasks = [Task.from_dict(task_data) for task_data in data]
+                print(f"已加载 {len(tasks)} 个任务")
+            with self.lock:
+                self._tasks = tasks
+                self.version += 1
         except Exception as e:
             print(f"加载任务失败: {e}")
-            self._tasks = []
+            with self.lock:
+                self._tasks = []
+                self.version += 1
+            return False
+        
+        # 只在任务文件正常读取后合并日志，避免用空列表覆盖损坏的文件
+        self.merge_journal()
+        return True
+    
+    def quick_add(self, task: Task) -> bool:
+        """只追加到日志（不读取任务文件），耗时与任务总数无关"""
+        try:
+            self.journal.append({"op": "add", "task": task.to_dict()})
+            return True
+        except Exception as e:
+            print(f"快速添加任务失败: {e}")
             return False
     
+    @perf.timed()
+    def merge_journal(self) -> int:
+        """把日志中的新任务合并进任务列表并保存，返回合并的数量"""
+        try:
+            records = self.journal.take()
+            with self.lock:
+                existing_ids = {task.id for task in self._tasks}
+                new_tasks = []
+                for record in records:
+                    if not isinstance(record, dict) or record.get("op") != "add":
+                        continue
+                    try:
+                        task = Task.from_dict(dict(record["task"]))
+                    except Exception as e:
+                        # 跳过无效记录，不影响其他记录的合并
+                        print(f"跳过无效的日志记录: {e}")
+                        continue
+                    if task.id not in existing_ids:
+                        existing_ids.add(task.id)
+                        new_tasks.append(task)
+                
+                if new_tasks:
+                    self._tasks.extend(new_tasks)
+                    self.version += 1
+            
+            if new_tasks:
+                if not self.save_tasks():
+                    # 保留已取出的日志，下次重试
+                    return 0
+                print(f"已从日志合并 {len(new_tasks)} 个任务")
+            self.journal.commit()
+            return len(new_tasks)
+        except Exception as e:
+            print(f"合并任务日志失败: {e}")
+            return 0
+    
+    @perf.timed()
     def save_tasks(self) -> bool:
         """保存任务到文件"""
+        if not self.is_loaded:
+            # 尚未加载时没有需要保存的改动，避免用空列表覆盖文件
+            return True
+        start = time.perf_counter()
         try:
-            data = [task.to_dict() for task in self._tasks]
-            with open(self.tasks_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            with self._write_lock:
+                # 只在复制数据时持有 lock，写文件期间其他线程仍可读写任务
+                with self.lock:
+                    data = [task.to_dict() for task in self._task_list]
+                # 先写临时文件再替换，避免读取方（如快照）看到写了一半的文件
+                import tempfile
+                fd, temp_path = tempfile.mkstemp(
+                    dir=self.tasks_file.parent, prefix=".tasks_", suffix=".tmp"
+                )
+                try:
+                    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                        json.dump(data, f, ensure_ascii=False, indent=2)
+                    os.chmod(temp_path, replacement_file_mode(self.tasks_file))
+                    os.replace(temp_path, self.tasks_file)
+                except Exception:
+                    os.unlink(temp_path)
+                    raise
+            self.last_save_duration = time.perf_counter() - start
             return True
         except Exception as e:
             print(f"保存任务失败: {e}")
             return False
     
+    @perf.timed()
     def add_task(self, task: Task) -> bool:
         """添加新任务"""
         try:
-            self._tasks.append(task)
+            self.ensure_loaded()
+            with self.lock:
+                self._tasks.append(task)
+                self.version += 1
             return self.save_tasks()
         except Exception as e:
             print(f"添加任务失败: {e}")
             return False
     
+    @perf.timed()
+    def add_tasks(self, tasks: List[Task]) -> bool:
+        """批量添加任务（只写入一次文件）"""
+        try:
+            self.ensure_loaded()
+            with self.lock:
+                self._tasks.extend(tasks)
+                self.version += 1
+            return self.save_tasks()
+        except Exception as e:
+            print(f"批量添加任务失败: {e}")
+            return False
+    
+    @perf.timed()
+    def update_tasks(self, task_ids: List[str], **kwargs) -> int:
+        """批量更新任务（只写入一次文件），返回更新的数量"""
+        try:
+            self.ensure_loaded()
+            wanted = set(task_ids)
+            updated = 0
+            with self.lock:
+                for task in self._tasks:
+                    if task.id in wanted:
+                        task.update(**kwargs)
+                        updated += 1
+                if updated:
+                    self.version += 1
+            if updated and not self.save_tasks():
+                return 0
+            return updated
+        except Exception as e:
+            print(f"批量更新任务失败: {e}")
+            return 0
+    
+    @perf.timed()
     def update_task(self, task_id: str, **kwargs) -> bool:
         """更新任务"""
         try:
-            task = self.get_task_by_id(task_id)
-            if task:
+            self.ensure_loaded()
+            with self.lock:
+                task = self.get_task_by_id(task_id)
+                if not task:
+                    return False
                 task.update(**kwargs)
-                return self.save_tasks()
-            return False
+                self.version += 1
+            return self.save_tasks()
         except Exception as e:
             print(f"更新任务失败: {e}")
             return False
     
+    @perf.timed()
     def delete_task(self, task_id: str) -> bool:
         """删除任务"""
         try:
-            self._tasks = [task for task in self._tasks if task.id != task_id]
+            self.ensure_loaded()
+            with self.lock:
+                self._tasks = [task for task in self._tasks if task.id != task_id]
+                self.version += 1
             return self.save_tasks()
         except Exception as e:
             print(f"删除任务失败: {e}")
             return False
     
+    @perf.timed()
+    def apply_batch(self, operations: List[Dict[str, Any]],
+                    expected_version: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """批量执行添加/更新/删除操作（只写入一次文件）
+        
+        每个操作:
+            {"op": "add", "task": {...}}
+            {"op": "update", "id": "...", "fields": {...}}
+            {"op": "delete", "id": "..."}
+        
+        各操作独立执行，失败的操作不影响其他操作。
+        
+        Args:
+            operations: 操作列表
+            expected_version: 不为空且与当前版本不一致时不做任何修改
+        
+        Returns:
+            {"version": 修改后的版本号, "results": 每个操作的结果}，版本不一致时返回 None
+        """
+        self.ensure_loaded()
+        with self.lock:
+            if expected_version is not None and expected_version != self.version:
+                return None
+            
+            results = [self._apply_operation(operation) for operation in operations]
+            changed = any(result["ok"] for result in results)
+            if changed:
+                self.version += 1
+            version = self.version
+        
+        if changed and not self.save_tasks():
+            for result in results:
+                if result["ok"]:
+                    result.update(ok=False, error="保存任务失败")
+        return {"version": version, "results": results}
+    
+    def _apply_operation(self, operation: Dict[str, Any]) -> Dict[str, Any]:
+        """执行单个批量操作（调用方持有 lock）"""
+        op = operation.get("op")
+        result: Dict[str, Any] = {"op": op, "ok": False}
+        try:
+            if op == "add":
+                task = Task.from_dict(dict(operation["task"]))
+                if self.get_task_by_id(task.id):
+                    result.update(id=task.id, error="任务 ID 已存在")
+                    return result
+                self._tasks.append(task)
+                result.update(id=task.id, ok=True, task=task.to_dict())
+            elif op == "update":
+                task = self.get_task_by_id(operation.get("id", ""))
+                result["id"] = operation.get("id")
+                if not task:
+                    result["error"] = "找不到任务"
+                    return result
+                task.update(**operation.get("fields", {}))
+                result.update(ok=True, task=task.to_dict())
+            elif op == "delete":
+                task_id = operation.get("id", "")
+                result["id"] = task_id
+                remaining = [task for task in self._tasks if task.id != task_id]
+                if len(remaining) == len(self._tasks):
+                    result["error"] = "找不到任务"
+                    return result
+                self._tasks = remaining
+                result["ok"] = True
+            else:
+                result["error"] = f"未知操作: {op}"
+        except Exception as e:
+            result["error"] = str(e)
+        return result
+    
+    @perf.timed()
     def get_task_by_id(self, task_id: str) -> Optional[Task]:
         """根据ID获取任务"""
         for task in self._tasks:
@@ -97,6 +329,7 @@ class TaskDatabase:
         """获取过期任务"""
         return [task for task in self._tasks if task.is_overdue()]
     
+    @perf.timed()
     def search_tasks(self, query: str) -> List[Task]:
         """搜索任务"""
         query = query.lower()
@@ -105,6 +338,7 @@ class TaskDatabase:
             if query in task.title.lower() or query in task.description.lower()
         ]
     
+    @perf.timed()
     def sort_tasks(self, sort_by: str = "created_at", reverse: bool = False) -> List[Task]:
         """排序任务"""
         if sort_by == "priority":
@@ -123,6 +357,7 @@ class TaskDatabase:
         else:  # created_at
             return sorted(self._tasks, key=lambda x: x.created_at, reverse=reverse)
     
+    @perf.timed()
     def get_statistics(self) -> Dict[str, Any]:
         """获取任务统计信息"""
         total = len(self._tasks)
@@ -143,23 +378,30 @@ class TaskDatabase:
             "priority_stats": priority_stats
         }
     
+    @perf.timed()
     def clear_completed_tasks(self) -> bool:
         """清除已完成的任务"""
         try:
-            self._tasks = [task for task in self._tasks if not task.completed]
+            self.ensure_loaded()
+            with self.lock:
+                self._tasks = [task for task in self._tasks if not task.completed]
+                self.version += 1
             return self.save_tasks()
         except Exception as e:
             print(f"清除已完成任务失败: {e}")
             return False
     
+    @perf.timed()
     def clear_all_tasks(self) -> bool:
         """清除所有任务"""
         try:
-            self._tasks = []
+            with self.lock:
+                self._tasks = []
+                self.version += 1
             return self.save_tasks()
         except Exception as e:
             print(f"清除所有任务失败: {e}")
             return False
 
-# 全局数据库实例
-task_db = TaskDatabase()
\ No newline at end of file
+# 全局数据库实例（任务在首次使用或后台预加载时读取）
+task_db = TaskDatabase(autoload=False)
\ No newline at end of file
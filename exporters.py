@@ -0,0 +1,222 @@
+"""
+任务导出 - Todo App v0.3.1
+逐条流式写出任务，支持 JSON、NDJSON、CSV、Markdown 清单和 iCalendar (VTODO)。
+不在内存中构建完整的导出数据，可在后台线程运行并报告进度、响应取消。
+本模块不导入 tkinter
+"""
+import csv
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Sequence, TextIO, Tuple
+from models import Task
+from config import app_config, replacement_file_mode
+
+# 格式 -> (显示名称, 扩展名)
+FORMATS: Dict[str, Tuple[str, str]] = {
+    "json": ("JSON", ".json"),
+    "ndjson": ("NDJSON", ".ndjson"),
+    "csv": ("CSV", ".csv"),
+    "markdown": ("Markdown 清单", ".md"),
+    "ical": ("iCalendar", ".ics"),
+}
+
+# 其他常见扩展名
+EXTENSION_ALIASES = {".jsonl": "ndjson", ".markdown": "markdown", ".ical": "ical"}
+
+CSV_FIELDS = ("id", "title", "description", "priority", "completed",
+              "created_at", "updated_at", "due_date", "tags")
+# iCalendar 优先级: 1 最高, 9 最低
+ICAL_PRIORITIES = {"高": 1, "中": 5, "低": 9}
+
+class ExportCancelled(Exception):
+    """导出被取消"""
+
+def format_from_path(path: str) -> str:
+    """根据扩展名判断导出格式，无法识别时为 JSON"""
+    suffix = Path(path).suffix.lower()
+    for fmt, (_, extension) in FORMATS.items():
+        if suffix == extension:
+            return fmt
+    return EXTENSION_ALIASES.get(suffix, "json")
+
+# ---- 各格式的写入函数: (任务序列, 输出流) -> 每写完一条任务产出一次 ----
+
+def _write_json(tasks: Sequence[Task], out: TextIO) -> Iterable[None]:
+    """与界面和命令行导入兼容的 JSON，每条任务一行"""
+    out.write("{\n")
+    out.write(f'  "app_version": {json.dumps(app_config.version)},\n')
+    out.write(f'  "export_time": {json.dumps(time.strftime("%Y-%m-%d %H:%M:%S"))},\n')
+    out.write('  "tasks": [')
+    for index, task in enumerate(tasks):
+        out.write(",\n    " if index else "\n    ")
+        out.write(json.dumps(task.to_dict(), ensure_ascii=False))
+        yield
+    out.write("\n  ]\n}\n" if tasks else "]\n}\n")
+
+def _write_ndjson(tasks: Sequence[Task], out: TextIO) -> Iterable[None]:
+    """每行一个任务对象"""
+    for task in tasks:
+        out.write(json.dumps(task.to_dict(), ensure_ascii=False))
+        out.write("\n")
+        yield
+
+def _write_csv(tasks: Sequence[Task], out: TextIO) -> Iterable[None]:
+    """CSV（标签以分号分隔）"""
+    writer = csv.writer(out)
+    writer.writerow(CSV_FIELDS)
+    for task in tasks:
+        writer.writerow([
+            task.id, task.title, task.description, task.priority,
+            "true" if task.completed else "false",
+            task.created_at, task.updated_at, task.due_date or "", ";".join(task.tags),
+        ])
+        yield
+
+def _write_markdown(tasks: Sequence[Task], out: TextIO) -> Iterable[None]:
+    """Markdown 任务清单"""
+    out.write(f"# 任务清单\n\n导出时间: {time.strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+    for task in tasks:
+        line = f"- [{'x' if task.completed else ' '}] {task.title.replace(chr(10), ' ')}"
+        details = [f"优先级: {task.priority}"]
+        if task.due_date:
+            details.append(f"截止: {task.due_date[:10]}")
+        line += f" （{'，'.join(details)}）"
+        if task.tags:
+            line += " " + " ".join(f"#{tag}" for tag in task.tags)
+        out.write(line + "\n")
+        # 描述作为清单项下的引用块
+        for description_line in task.description.splitlines():
+            out.write(f"  > {description_line}\n")
+        yield
+
+def _ical_text(value: str) -> str:
+    """转义 iCalendar 文本值"""
+    return (value.replace("\\", "\\\\").replace(";", "\\;")
+            .replace(",", "\\,").replace("\r\n", "\\n").replace("\n", "\\n"))
+
+def _ical_datetime(value: str) -> Optional[str]:
+    """ISO 时间转为 iCalendar 本地时间格式，无法解析时返回 None"""
+    try:
+        return datetime.fromisoformat(value).strftime("%Y%m%dT%H%M%S")
+    except (TypeError, ValueError):
+        return None
+
+def _ical_line(out: TextIO, line: str):
+    """写入一行内容，超过 75 字节时折行（RFC 5545 3.1）"""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        out.write(line + "\r\n")
+        return
+    chunk, size, first = [], 0, True
+    for char in line:
+        char_size = len(char.encode("utf-8"))
+        # 续行以一个空格开头，占用一个字节
+        if size + char_size > (75 if first else 74):
+            out.write(("" if first else " ") + "".join(chunk) + "\r\n")
+            chunk, size, first = [], 0, False
+        chunk.append(char)
+        size += char_size
+    out.write(("" if first else " ") + "".join(chunk) + "\r\n")
+
+def _write_ical(tasks: Sequence[Task], out: TextIO) -> Iterable[None]:
+    """iCalendar，每个任务一个 VTODO"""
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    for line in ("BEGIN:VCALENDAR", "VERSION:2.0",
+                 f"PRODID:-//Todo App//{app_config.version}//ZH", "CALSCALE:GREGORIAN"):
+        _ical_line(out, line)
+    for task in tasks:
+        _ical_line(out, "BEGIN:VTODO")
+        _ical_line(out, f"UID:{task.id}")
+        _ical_line(out, f"DTSTAMP:{stamp}")
+        for name, value in (("CREATED", task.created_at), ("LAST-MODIFIED", task.updated_at)):
+            converted = _ical_datetime(value)
+            if converted:
+                _ical_line(out, f"{name}:{converted}")
+        _ical_line(out, f"SUMMARY:{_ical_text(task.title)}")
+        if task.description:
+            _ical_line(out, f"DESCRIPTION:{_ical_text(task.description)}")
+        _ical_line(out, f"PRIORITY:{ICAL_PRIORITIES.get(task.priority, 0)}")
+        _ical_line(out, f"STATUS:{'COMPLETED' if task.completed else 'NEEDS-ACTION'}")
+        if task.due_date:
+            if len(task.due_date) == 10:
+                _ical_line(out, f"DUE;VALUE=DATE:{task.due_date.replace('-', '')}")
+            else:
+                due = _ical_datetime(task.due_date)
+                if due:
+                    _ical_line(out, f"DUE:{due}")
+        if task.tags:
+            _ical_line(out, "CATEGORIES:" + ",".join(_ical_text(tag) for tag in task.tags))
+        _ical_line(out, "END:VTODO")
+        yield
+    _ical_line(out, "END:VCALENDAR")
+
+WRITERS: Dict[str, Callable[[Sequence[Task], TextIO], Iterable[None]]] = {
+    "json": _write_json,
+    "ndjson": _write_ndjson,
+    "csv": _write_csv,
+    "markdown": _write_markdown,
+    "ical": _write_ical,
+}
+
+def write_tasks(tasks: Sequence[Task], out: TextIO, fmt: str = "json",
+                progress: Optional[Callable[[int, int], None]] = None,
+                cancel_event: Optional[threading.Event] = None,
+                progress_interval: float = 0.1) -> int:
+    """把任务逐条写入输出流
+    
+    Args:
+        tasks: 任务序列
+        out: 文本输出流（CSV 和 iCalendar 需以 newline="" 打开）
+        fmt: FORMATS 中的格式
+        progress: 进度回调 (已写入数量, 总数)，最多每 progress_interval 秒调用一次，结束时再调用一次
+        cancel_event: 设置后在下一条任务前停止
+    
+    Returns:
+        写入的任务数量
+    
+    Raises:
+        ExportCancelled: 导出被取消
+    """
+    if fmt not in WRITERS:
+        raise ValueError(f"不支持的导出格式: {fmt}")
+    
+    total = len(tasks)
+    written = 0
+    next_report = time.perf_counter() + progress_interval
+    for _ in WRITERS[fmt](tasks, out):
+        written += 1
+        if cancel_event is not None and cancel_event.is_set():
+            raise ExportCancelled()
+        if progress is not None and time.perf_counter() >= next_report:
+            progress(written, total)
+            next_report = time.perf_counter() + progress_interval
+    if progress is not None:
+        progress(written, total)
+    return written
+
+def export_to_file(tasks: Sequence[Task], path: str, fmt: Optional[str] = None,
+                   progress: Optional[Callable[[int, int], None]] = None,
+                   cancel_event: Optional[threading.Event] = None) -> int:
+    """导出到文件（先写临时文件，完成后替换；取消或失败时不留下不完整的文件）
+    
+    Returns:
+        写入的任务数量
+    """
+    path = Path(path)
+    fmt = fmt or format_from_path(str(path))
+    import tempfile
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".export_", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline="") as f:
+            written = write_tasks(tasks, f, fmt, progress, cancel_event)
+        # 与 open() 直接写入一样按 umask 设置权限（mkstemp 固定为 0600），覆盖时沿用原文件权限
+        os.chmod(temp_path, replacement_file_mode(path))
+        os.replace(temp_path, path)
+        return written
+    except BaseException:
+        os.unlink(temp_path)
+        raise
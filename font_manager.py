@@ -0,0 +1,67 @@
+"""
+字体管理 - Todo App v0.3.1
+共享字体对象，统一应用字体大小设置
+"""
+import customtkinter as ctk
+from typing import Any, Dict
+from config import app_config
+
+class FontRegistry:
+    """共享字体注册表
+    
+    所有控件按角色使用同一组 CTkFont 对象，字号根据 font_size 设置按比例计算。
+    字体大小改变时只需重新配置这几个字体对象，使用它们的控件会自动更新。
+    """
+    
+    BASE_SIZE = 14
+    
+    # 角色: (默认字号, 字重)
+    ROLES = {
+        "display": (48, "normal"),
+        "hero": (24, "bold"),
+        "title": (20, "bold"),
+        "heading": (16, "bold"),
+        "icon": (16, "normal"),
+        "subtitle": (14, "bold"),
+        "body": (14, "normal"),
+        "strong": (12, "bold"),
+        "control": (12, "normal"),
+        "caption": (11, "normal"),
+        "small": (10, "normal"),
+    }
+    
+    def __init__(self):
+        self._fonts: Dict[str, ctk.CTkFont] = {}
+        app_config.add_listener(self._on_config_changed)
+    
+    def scaled_size(self, role: str) -> int:
+        """根据 font_size 设置计算角色字号"""
+        size, _ = self.ROLES[role]
+        font_size = app_config.get("font_size", self.BASE_SIZE)
+        return max(6, round(size * font_size / self.BASE_SIZE))
+    
+    def get(self, role: str) -> ctk.CTkFont:
+        """获取角色对应的共享字体（首次使用时创建，需要已有 Tk 根窗口）"""
+        font = self._fonts.get(role)
+        if font is None:
+            _, weight = self.ROLES[role]
+            font = ctk.CTkFont(size=self.scaled_size(role), weight=weight)
+            self._fonts[role] = font
+        return font
+    
+    def apply_font_size(self):
+        """按当前设置重新配置所有已创建的字体"""
+        for role, font in self._fonts.items():
+            font.configure(size=self.scaled_size(role))
+    
+    def _on_config_changed(self, key: str, old_value: Any, new_value: Any):
+        """配置变更监听"""
+        if key == "font_size":
+            self.apply_font_size()
+
+# 全局字体注册表
+font_registry = FontRegistry()
+
+def get_font(role: str) -> ctk.CTkFont:
+    """获取共享字体"""
+    return font_registry.get(role)
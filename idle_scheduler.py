@@ -0,0 +1,168 @@
+"""
+空闲任务调度 - Todo App v0.3.1
+把不紧急的工作（预创建对话框、合并快速添加日志、启动后台服务等）排队，
+只在 Tk 事件队列空闲时分片执行，每片不超过时间预算，
+用户刚有输入时暂停，后台维护不与界面响应争抢主线程。
+
+任务可以是普通函数（一次执行完），也可以是生成器或返回生成器的函数，
+每次 next() 为一步，调度器在时间片内执行尽可能多的步，剩余的留到下一次空闲。
+
+用法:
+    job = idle_scheduler.schedule(build_index, priority=IdleScheduler.PRIORITY_LOW, name="build_index")
+    job.cancel()
+"""
+import heapq
+import itertools
+import time
+import tkinter
+from typing import Any, List, Optional, Tuple
+
+class IdleJob:
+    """排队中的空闲任务"""
+    
+    def __init__(self, work: Any, priority: int, name: str, budget: Optional[float]):
+        self.work = work
+        self.priority = priority
+        self.name = name or getattr(work, "__name__", "job")
+        self.budget = budget
+        self.steps = 0
+        self.cancelled = False
+        self.done = False
+        self._generator = None
+    
+    def cancel(self):
+        """取消任务（尚未执行的步骤不再执行）"""
+        self.cancelled = True
+    
+    def step(self) -> bool:
+        """执行一步，返回任务是否已完成"""
+        if self._generator is None:
+            result = self.work() if callable(self.work) else self.work
+            if not hasattr(result, "__next__"):
+                # 普通函数一次执行完
+                self.steps += 1
+                return True
+            self._generator = result
+        
+        self.steps += 1
+        try:
+            next(self._generator)
+            return False
+        except StopIteration:
+            return True
+
+class IdleScheduler:
+    """按优先级在空闲时分片执行任务"""
+    
+    PRIORITY_HIGH = 0
+    PRIORITY_NORMAL = 1
+    PRIORITY_LOW = 2
+    
+    DEFAULT_BUDGET = 0.008  # 每个时间片 8 毫秒，远低于一帧
+    QUIET_PERIOD = 0.15  # 用户输入后等待的秒数
+    INPUT_EVENTS = ("<KeyPress>", "<ButtonPress>", "<MouseWheel>")
+    
+    def __init__(self, root=None, budget: float = DEFAULT_BUDGET):
+        self.root = None
+        self.budget = budget
+        self._queue: List[Tuple[int, int, IdleJob]] = []
+        self._counter = itertools.count()
+        self._scheduled = False
+        self._last_input = 0.0
+        # 统计信息（供性能面板和测试使用）
+        self.slices = 0
+        self.deferred = 0
+        if root is not None:
+            self.attach(root)
+    
+    def attach(self, root):
+        """关联 Tk 根窗口并监听用户输入"""
+        self.root = root
+        for sequence in self.INPUT_EVENTS:
+            try:
+                root.bind_all(sequence, self.note_input, add="+")
+            except tkinter.TclError:
+                # 只有 Tcl 解释器（没有 Tk）时没有事件绑定
+                break
+        self._wake()
+    
+    @property
+    def pending(self) -> int:
+        """排队中的任务数量"""
+        return sum(1 for _, _, job in self._queue if not (job.cancelled or job.done))
+    
+    def note_input(self, event=None):
+        """记录用户输入时间，之后 QUIET_PERIOD 内不执行空闲任务"""
+        self._last_input = time.perf_counter()
+    
+    def schedule(self, work: Any, priority: int = PRIORITY_NORMAL, name: str = "",
+                 budget: Optional[float] = None) -> IdleJob:
+        """添加空闲任务
+        
+        Args:
+            work: 函数、生成器或返回生成器的函数
+            priority: 数字越小越先执行
+            name: 任务名称（用于日志）
+            budget: 执行该任务时每个时间片的预算（秒），默认使用调度器的预算
+        """
+        job = IdleJob(work, priority, name, budget)
+        heapq.heappush(self._queue, (priority, next(self._counter), job))
+        self._wake()
+        return job
+    
+    def cancel_all(self):
+        """取消所有排队中的任务"""
+        for _, _, job in self._queue:
+            job.cancel()
+        self._queue.clear()
+    
+    def _wake(self):
+        """有任务时安排下一次空闲回调"""
+        if self.root is None or self._scheduled or not self.pending:
+            return
+        self._scheduled = True
+        self.root.after_idle(self._on_idle)
+    
+    def _on_idle(self):
+        """空闲回调：用户刚有输入时推迟，否则执行一个时间片"""
+        self._scheduled = False
+        quiet_left = self._last_input + self.QUIET_PERIOD - time.perf_counter()
+        if quiet_left > 0:
+            self.deferred += 1
+            self._scheduled = True
+            self.root.after(int(quiet_left * 1000) + 1, lambda: self.root.after_idle(self._on_idle))
+            return
+        
+        self.run_slice()
+        # 新的空闲回调在下一轮事件处理之后才执行，两个时间片之间会先处理界面事件
+        self._wake()
+    
+    def run_slice(self) -> int:
+        """执行一个时间片，返回执行的步数"""
+        self.slices += 1
+        steps = 0
+        started = time.perf_counter()
+        while self._queue:
+            job = self._queue[0][2]
+            if job.cancelled or job.done:
+                heapq.heappop(self._queue)
+                continue
+            # 每个任务按自己的预算计算截止时间（都从时间片开始算起），每个时间片至少执行一步
+            deadline = started + (job.budget or self.budget)
+            if steps and time.perf_counter() >= deadline:
+                break
+            
+            try:
+                finished = job.step()
+            except Exception as e:
+                print(f"空闲任务 {job.name} 失败: {e}")
+                finished = True
+            steps += 1
+            # 任务执行中可能添加了新任务，不能直接弹出堆顶，完成的任务在下一轮循环移除
+            job.done = finished
+            if time.perf_counter() >= deadline:
+                break
+        return steps
+
+# 全局空闲调度器（主窗口创建后 attach）
+idle_scheduler = IdleScheduler()
@@ -0,0 +1,67 @@
+"""
+本地套接字 - Todo App v0.3.1
+Unix 域套接字文件的检查、残留清理和私有目录，单实例和本地 API 共用。
+本模块只依赖标准库
+"""
+import os
+import socket
+import stat
+
+def check_socket_file(path: str) -> bool:
+    """检查套接字文件，不存在返回 False，是当前用户的套接字返回 True
+    
+    连接或删除之前调用：其他用户可能抢先在共享目录中创建同名文件，
+    连接过去会把消息发给对方，删除则可能误删别人的文件。
+    
+    Raises:
+        OSError: 路径是普通文件等非套接字文件，或属于其他用户
+    """
+    try:
+        # 不跟随符号链接
+        st = os.lstat(path)
+    except FileNotFoundError:
+        return False
+    if not stat.S_ISSOCK(st.st_mode):
+        raise OSError(f"{path} 已存在且不是套接字文件")
+    if hasattr(os, "getuid") and st.st_uid != os.getuid():
+        raise OSError(f"{path} 属于其他用户")
+    return True
+
+def remove_stale_socket(path: str):
+    """删除上次异常退出留下的无人监听的套接字文件
+    
+    Raises:
+        OSError: 路径不是当前用户的套接字文件，或仍有服务在监听
+    """
+    if not check_socket_file(path):
+        return
+    
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    probe.settimeout(1)
+    try:
+        probe.connect(path)
+    except ConnectionRefusedError:
+        os.unlink(path)
+        return
+    except FileNotFoundError:
+        return
+    finally:
+        probe.close()
+    raise OSError(f"{path} 上已有其他服务在监听")
+
+def private_dir(path: str) -> str:
+    """创建（或收紧）只有当前用户可访问的目录，返回路径
+    
+    Raises:
+        OSError: 路径不是目录或属于其他用户
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode):
+        raise OSError(f"{path} 不是目录")
+    if hasattr(os, "getuid"):
+        if st.st_uid != os.getuid():
+            raise OSError(f"{path} 属于其他用户")
+        if stat.S_IMODE(st.st_mode) & 0o077:
+            os.chmod(path, 0o700)
+    return path
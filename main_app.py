@@ -5,35 +5,90 @@
 """
 import customtkinter as ctk
 from tkinter import messagebox
+import os
 import threading
 import time
-from typing import List, Optional
+from typing import List, Optional, Set, TYPE_CHECKING
 from models import Task
 from database import task_db
 from config import app_config
-from ui_components import TaskEditDialog, TaskItem, StatisticsFrame
-from settings_dialog import SettingsDialog
+from perf import perf
+from startup_trace import startup_tracer, trace_enabled
+from font_manager import get_font
+from ui_components import TaskEditDialog, TaskItem, CanvasTaskList, StatisticsFrame, ExportProgressDialog
+from stall_watchdog import StallWatchdog, threshold_from_env
+from single_instance import InstanceServer
+from idle_scheduler import IdleScheduler, IdleJob, idle_scheduler
+
+if TYPE_CHECKING:
+    # 设置对话框及其依赖（设置管理、备份、分析器等）在首次打开时才导入
+    from settings_dialog import SettingsDialog
+    from api_server import ApiServer
+    from async_bridge import AsyncBridge
 
 class TodoApp(ctk.CTk):
     """主应用程序类"""
     
-    def __init__(self):
-        super().__init__()
-        
-        # 设置主题
-        self.setup_theme()
-        
-        # 设置窗口属性
-        self.setup_window()
-        
-        # 创建界面
-        self.create_widgets()
-        
-        # 加载任务
-        self.refresh_tasks()
-        
-        # 启动自动保存
-        self.start_auto_save()
+    def __init__(self, instance_server: Optional[InstanceServer] = None):
+        with startup_tracer.phase("tk_init"):
+            super().__init__()
+        
+        # 记录 Tcl 文件访问，供精简打包使用（TODO_APP_BUNDLE_TRACE=追踪文件路径）
+        self.bundle_trace_path = os.environ.get("TODO_APP_BUNDLE_TRACE")
+        if self.bundle_trace_path:
+            import bundle_slim
+            bundle_slim.start_trace(self)
+        
+        # 复用的设置对话框（首次打开时创建）
+        self.settings_dialog: Optional["SettingsDialog"] = None
+        # 复用的任务编辑对话框（空闲时预创建或首次使用时创建）
+        self.edit_dialog: Optional[TaskEditDialog] = None
+        
+        with startup_tracer.phase("window_build"):
+            # 设置主题
+            self.setup_theme()
+            
+            # 设置窗口属性
+            self.setup_window()
+            
+            # 创建界面
+            self.create_widgets()
+        
+        # 主循环开始后的第一次空闲即窗口首次绘制完成
+        self.after(0, lambda: self.after_idle(self.mark_startup, "first_paint"))
+        
+        # 不紧急的工作在界面空闲且没有用户输入时分片执行
+        idle_scheduler.attach(self)
+        
+        # 在后台加载任务，窗口先显示
+        self.start_loading_tasks()
+        
+        # 合并命令行快速添加的任务，并显示其他线程（如 API 服务器）的修改
+        self.rendered_version = 0
+        self.journal_job: Optional[IdleJob] = None
+        self.after(2000, self.poll_journal)
+        
+        # 主循环卡顿检测（TODO_APP_WATCHDOG=1 启用）
+        self.stall_watchdog: Optional[StallWatchdog] = None
+        stall_threshold = threshold_from_env()
+        if stall_threshold:
+            self.stall_watchdog = StallWatchdog(self, threshold=stall_threshold)
+            self.stall_watchdog.start()
+        
+        # 处理后续启动转发过来的消息
+        self.instance_server = instance_server
+        if self.instance_server is not None:
+            self.after(200, self.poll_instance_messages)
+        
+        # 后台协程服务（自动保存、定时快照、API 服务器）在启动后空闲时开始，
+        # 导入 asyncio（约 30 毫秒）不占用窗口显示前的时间
+        self.background: Optional["AsyncBridge"] = None
+        self.api_server: Optional["ApiServer"] = None
+        # 自动保存是否正在执行（供性能面板显示；定时任务按顺序执行，同一时间最多一次）
+        self.auto_save_running = False
+        # 进行中的导出的取消标志（每次导出一个，关闭窗口时全部取消）
+        self.export_cancels: Set[threading.Event] = set()
+        self.after(1000, self.schedule_startup_jobs)
         
         # 绑定关闭事件
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -92,7 +147,7 @@ class TodoApp(ctk.CTk):
         title_label = ctk.CTkLabel(
             toolbar,
             text="📝 Todo App v0.3.1",
-            font=("", 20, "bold")
+            font=get_font("title")
         )
         title_label.pack(side="left", padx=20, pady=15)
         
@@ -108,7 +163,7 @@ class TodoApp(ctk.CTk):
             width=40,
             height=40,
             command=self.show_settings,
-            font=("", 16)
+            font=get_font("icon")
         )
         settings_btn.pack(side="right")
     
@@ -127,7 +182,7 @@ class TodoApp(ctk.CTk):
             input_frame,
             placeholder_text="输入新任务，按回车快速添加...",
             height=40,
-            font=("", 14)
+            font=get_font("body")
         )
         self.task_entry.pack(side="left", fill="x", expand=True, padx=(10, 5), pady=10)
         self.task_entry.bind("<Return>", self.quick_add_task)
@@ -139,7 +194,7 @@ class TodoApp(ctk.CTk):
             width=100,
             height=40,
             command=self.show_add_dialog,
-            font=("", 12)
+            font=get_font("control")
         )
         add_btn.pack(side="right", padx=(5, 10), pady=10)
         
@@ -154,12 +209,12 @@ class TodoApp(ctk.CTk):
             text="显示已完成",
             variable=self.show_completed_var,
             command=self.refresh_tasks,
-            font=("", 12)
+            font=get_font("control")
         )
         show_completed_cb.pack(side="left", padx=10, pady=10)
         
         # 排序选项
-        ctk.CTkLabel(filter_frame, text="排序:", font=("", 12)).pack(side="left", padx=(20, 5), pady=10)
+        ctk.CTkLabel(filter_frame, text="排序:", font=get_font("control")).pack(side="left", padx=(20, 5), pady=10)
         
         self.sort_var = ctk.StringVar(value="created_at")
         sort_menu = ctk.CTkOptionMenu(
@@ -167,7 +222,7 @@ class TodoApp(ctk.CTk):
             values=["创建时间", "优先级", "截止日期", "标题", "完成状态"],
             variable=self.sort_var,
             command=self.on_sort_changed,
-            font=("", 12)
+            font=get_font("control")
         )
         sort_menu.pack(side="left", padx=5, pady=10)
         
@@ -176,14 +231,36 @@ class TodoApp(ctk.CTk):
             filter_frame,
             placeholder_text="搜索任务...",
             width=150,
-            font=("", 12)
+            font=get_font("control")
         )
         self.search_entry.pack(side="right", padx=10, pady=10)
         self.search_entry.bind("<KeyRelease>", self.on_search_changed)
         
-        # 任务列表滚动区域
-        self.task_list_frame = ctk.CTkScrollableFrame(left_frame)
-        self.task_list_frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        # 加载/渲染进度指示器（仅在加载过程中显示）
+        self.progress_bar = ctk.CTkProgressBar(left_frame, height=6)
+        self._render_generation = 0
+        
+        # 渲染状态（供性能面板和基准测试读取）
+        self.render_complete = False
+        self.rows_rendered = 0
+        self.last_refresh_duration = 0.0
+        self._refresh_started = 0.0
+        
+        # 任务列表区域
+        if app_config.get("list_renderer", "widget") == "canvas":
+            # 单画布绘制，控件数量不随任务数增长
+            self.task_canvas = CanvasTaskList(
+                left_frame,
+                self.on_task_toggle,
+                self.on_task_edit,
+                self.on_task_delete
+            )
+            self.task_canvas.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+            self.task_list_frame = None
+        else:
+            self.task_canvas = None
+            self.task_list_frame = ctk.CTkScrollableFrame(left_frame)
+            self.task_list_frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
     
     def create_control_panel(self, parent):
         """创建控制面板"""
@@ -200,14 +277,14 @@ class TodoApp(ctk.CTk):
         actions_frame = ctk.CTkFrame(right_frame)
         actions_frame.pack(fill="x", padx=10, pady=(0, 10))
         
-        ctk.CTkLabel(actions_frame, text="快捷操作", font=("", 16, "bold")).pack(pady=(10, 15))
+        ctk.CTkLabel(actions_frame, text="快捷操作", font=get_font("heading")).pack(pady=(10, 15))
         
         # 清除已完成任务
         clear_completed_btn = ctk.CTkButton(
             actions_frame,
             text="清除已完成任务",
             command=self.clear_completed_tasks,
-            font=("", 12)
+            font=get_font("control")
         )
         clear_completed_btn.pack(fill="x", padx=10, pady=5)
         
@@ -218,7 +295,7 @@ class TodoApp(ctk.CTk):
             command=self.clear_all_tasks,
             fg_color="red",
             hover_color="darkred",
-            font=("", 12)
+            font=get_font("control")
         )
         clear_all_btn.pack(fill="x", padx=10, pady=5)
         
@@ -227,7 +304,7 @@ class TodoApp(ctk.CTk):
             actions_frame,
             text="导出任务",
             command=self.export_tasks,
-            font=("", 12)
+            font=get_font("control")
         )
         export_btn.pack(fill="x", padx=10, pady=(5, 15))
     
@@ -247,7 +324,13 @@ class TodoApp(ctk.CTk):
     
     def show_add_dialog(self):
         """显示详细添加对话框"""
-        dialog = TaskEditDialog(self, callback=self.on_task_added)
+        self.get_edit_dialog().open(None, self.on_task_added)
+    
+    def get_edit_dialog(self) -> TaskEditDialog:
+        """获取复用的编辑对话框（不存在时创建并隐藏）"""
+        if self.edit_dialog is None or not self.edit_dialog.winfo_exists():
+            self.edit_dialog = TaskEditDialog(self, show=False)
+        return self.edit_dialog
     
     def on_task_added(self, task: Task):
         """任务添加回调"""
@@ -258,21 +341,32 @@ class TodoApp(ctk.CTk):
             messagebox.showerror("错误", "添加任务失败")
     
     def on_task_toggle(self, task: Task):
-        """任务状态切换回调"""
-        if task_db.update_task(task.id, completed=task.completed):
+        """任务状态切换回调（在数据库锁内修改，与 API 和自动保存线程互不干扰）"""
+        completed = not task.completed
+        if task_db.update_task(task.id, completed=completed):
             self.refresh_tasks()
-            status = "完成" if task.completed else "未完成"
+            status = "完成" if completed else "未完成"
             self.show_status_message(f"任务已标记为{status}")
+        elif task_db.get_task_by_id(task.id) is None:
+            # 任务已被删除（例如通过 API）
+            self.refresh_tasks()
     
     def on_task_edit(self, task: Task):
         """编辑任务"""
-        dialog = TaskEditDialog(self, task, self.on_task_edited)
+        self.get_edit_dialog().open(task, self.on_task_edited)
     
     def on_task_edited(self, task: Task):
-        """任务编辑回调"""
-        if task_db.save_tasks():
+        """任务编辑回调（只应用对话框中改动的字段）"""
+        changes = self.get_edit_dialog().changes
+        if not changes:
+            return
+        if task_db.update_task(task.id, **changes):
             self.refresh_tasks()
             self.show_status_message(f"已更新任务: {task.title}")
+        elif task_db.get_task_by_id(task.id) is None:
+            # 编辑期间任务已被删除（例如通过 API）
+            self.refresh_tasks()
+            messagebox.showerror("错误", "任务已被删除，修改未保存")
         else:
             messagebox.showerror("错误", "更新任务失败")
     
@@ -285,32 +379,130 @@ class TodoApp(ctk.CTk):
             else:
                 messagebox.showerror("错误", "删除任务失败")
     
+    def start_loading_tasks(self):
+        """在后台线程加载任务，完成后刷新列表"""
+        if task_db.is_loaded:
+            self.refresh_tasks()
+            return
+        
+        self.show_progress(indeterminate=True)
+        
+        def load_worker():
+            with startup_tracer.phase("task_load"):
+                task_db.ensure_loaded()
+        
+        load_thread = threading.Thread(target=load_worker, daemon=True)
+        load_thread.start()
+        self.after(50, self._check_tasks_loaded, load_thread)
+    
+    def _check_tasks_loaded(self, load_thread: threading.Thread):
+        """轮询后台加载是否完成（Tk 只能在主线程操作）"""
+        if load_thread.is_alive():
+            self.after(50, self._check_tasks_loaded, load_thread)
+            return
+        self.hide_progress()
+        self.refresh_tasks()
+    
+    def show_progress(self, indeterminate: bool = False):
+        """显示进度指示器"""
+        if not self.progress_bar.winfo_ismapped():
+            list_widget = self.task_canvas or self.task_list_frame
+            self.progress_bar.pack(fill="x", padx=10, pady=(0, 5), before=list_widget)
+        if indeterminate:
+            self.progress_bar.configure(mode="indeterminate")
+            self.progress_bar.start()
+        else:
+            self.progress_bar.stop()
+            self.progress_bar.configure(mode="determinate")
+            self.progress_bar.set(0)
+    
+    def hide_progress(self):
+        """隐藏进度指示器"""
+        self.progress_bar.stop()
+        self.progress_bar.pack_forget()
+    
+    @perf.timed()
     def refresh_tasks(self):
         """刷新任务列表"""
+        self._refresh_started = time.perf_counter()
+        self.rendered_version = task_db.version
+        self.render_complete = False
+        self.rows_rendered = 0
+        
+        # 获取任务列表
+        tasks = self.get_filtered_and_sorted_tasks()
+        if not self.show_completed_var.get():
+            tasks = [task for task in tasks if not task.completed]
+        
+        if self.task_canvas is not None:
+            self.task_canvas.set_tasks(tasks)
+            self.update_statistics()
+            self._finish_refresh(len(tasks))
+            return
+        
         # 清空现有任务项
         for widget in self.task_list_frame.winfo_children():
             widget.destroy()
         
-        # 获取任务列表
-        tasks = self.get_filtered_and_sorted_tasks()
+        # 更新统计信息
+        self.update_statistics()
         
-        # 创建任务项
-        for task in tasks:
-            if not self.show_completed_var.get() and task.completed:
-                continue
-            
+        # 分批创建任务项，新的刷新会使尚未完成的旧批次失效
+        self._render_generation += 1
+        if tasks:
+            self.after_idle(self._render_task_chunk, self._render_generation, tasks, 0)
+        else:
+            self.hide_progress()
+            self._finish_refresh(0)
+    
+    def _finish_refresh(self, rows: int):
+        """记录一次刷新完成"""
+        self.rows_rendered = rows
+        self.render_complete = True
+        self.last_refresh_duration = time.perf_counter() - self._refresh_started
+        # 分批渲染时 refresh_tasks 本身只包含同步部分，这里记录到全部渲染完成的耗时
+        if perf.enabled:
+            perf.record("TodoApp.refresh_tasks.complete", self.last_refresh_duration)
+        if task_db.is_loaded:
+            self.mark_startup("tasks_rendered")
+    
+    def mark_startup(self, name: str):
+        """记录启动时间点，首次绘制和任务渲染都完成后输出启动报告"""
+        startup_tracer.mark(name)
+        if trace_enabled and startup_tracer.has_marks("first_paint", "tasks_rendered"):
+            startup_tracer.finish(app_config.config_dir / "startup_trace.json")
+    
+    def _render_task_chunk(self, generation: int, tasks: List[Task], start: int, budget: float = 0.012):
+        """在时间片内创建一批任务项，剩余部分留到下一次空闲时"""
+        if generation != self._render_generation:
+            return
+        
+        deadline = time.perf_counter() + budget
+        index = start
+        while index < len(tasks):
             task_item = TaskItem(
                 self.task_list_frame,
-                task,
+                tasks[index],
                 self.on_task_toggle,
                 self.on_task_edit,
                 self.on_task_delete
             )
             task_item.pack(fill="x", padx=5, pady=2)
-        
-        # 更新统计信息
-        self.update_statistics()
+            index += 1
+            if time.perf_counter() >= deadline:
+                break
+        self.rows_rendered = index
+        
+        if index < len(tasks):
+            if start == 0:
+                self.show_progress()
+            self.progress_bar.set(index / len(tasks))
+            self.after_idle(self._render_task_chunk, generation, tasks, index)
+        else:
+            self.hide_progress()
+            self._finish_refresh(index)
     
+    @perf.timed()
     def get_filtered_and_sorted_tasks(self) -> List[Task]:
         """获取过滤和排序后的任务列表"""
         # 搜索过滤
@@ -357,18 +549,21 @@ class TodoApp(ctk.CTk):
         self.stats_frame.update_statistics(stats)
     
     def show_settings(self):
-        """显示设置对话框"""
-        dialog = SettingsDialog(self, callback=self.on_settings_changed)
+        """显示设置对话框（设置 TODO_APP_PERF=1 时在性能统计中记录打开耗时）"""
+        with perf.measure("show_settings"):
+            if self.settings_dialog is not None and self.settings_dialog.winfo_exists():
+                self.settings_dialog.show()
+            else:
+                from settings_dialog import SettingsDialog
+                self.settings_dialog = SettingsDialog(self, callback=self.on_settings_changed)
+            self.settings_dialog.update_idletasks()
     
     def on_settings_changed(self):
         """设置更改后的回调"""
         try:
-            # 重新应用主题
+            # 重新应用主题（颜色变化由各任务行通过 color_signal 就地更新，无需重建列表）
             self.setup_theme()
             
-            # 刷新任务列表以应用新的颜色设置
-            self.refresh_tasks()
-            
             # 更新窗口大小（如果需要）
             window_size = app_config.get("window_size", "900x700")
             current_geometry = self.geometry()
@@ -376,9 +571,11 @@ class TodoApp(ctk.CTk):
             if current_size != window_size:
                 self.geometry(window_size)
             
-            # 更新显示选项
+            # 更新显示选项（只有过滤条件变化时才需要刷新列表）
             show_completed = app_config.get("show_completed", True)
-            self.show_completed_var.set(show_completed)
+            if show_completed != self.show_completed_var.get():
+                self.show_completed_var.set(show_completed)
+                self.refresh_tasks()
             
             # 更新统计面板显示状态
             show_statistics = app_config.get("show_statistics", True)
@@ -389,7 +586,7 @@ class TodoApp(ctk.CTk):
                     self.stats_frame.pack_forget()
             
             self.show_status_message("设置已应用")
-            
+        
         except Exception as e:
             print(f"应用设置时发生错误: {e}")
             self.show_status_message("设置应用时发生错误")
@@ -413,67 +610,236 @@ class TodoApp(ctk.CTk):
                 messagebox.showerror("错误", "清除任务失败")
     
     def export_tasks(self):
-        """导出任务"""
-        try:
-            from tkinter import filedialog
-            import json
-            
-            filename = filedialog.asksaveasfilename(
-                defaultextension=".json",
-                filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
-                title="导出任务"
-            )
-            
-            if filename:
-                tasks = task_db.get_all_tasks()
-                export_data = {
-                    "app_version": app_config.version,
-                    "export_time": time.strftime("%Y-%m-%d %H:%M:%S"),
-                    "tasks": [task.to_dict() for task in tasks]
-                }
-                
-                with open(filename, 'w', encoding='utf-8') as f:
-                    json.dump(export_data, f, ensure_ascii=False, indent=2)
-                
-                self.show_status_message(f"任务已导出到: {filename}")
-        except Exception as e:
-            messagebox.showerror("导出失败", f"导出任务时发生错误: {str(e)}")
+        """导出任务（按扩展名选择格式，在后台线程逐条写出，可取消）"""
+        from tkinter import filedialog
+        from exporters import FORMATS, ExportCancelled, export_to_file
+        
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[(name, f"*{extension}") for name, extension in FORMATS.values()] + [("All files", "*.*")],
+            title="导出任务"
+        )
+        if not filename:
+            return
+        
+        # 只复制任务列表的引用，序列化在后台线程进行
+        tasks = task_db.get_all_tasks()
+        cancel_event = threading.Event()
+        self.export_cancels.add(cancel_event)
+        dialog = ExportProgressDialog(self, filename, len(tasks), cancel_event.set)
+        
+        # 启动后立即导出时后台服务可能尚未启动
+        self.start_background_services()
+        
+        def progress(done: int, total: int):
+            self.background.call_in_tk(dialog.set_progress, done, total)
+        
+        def on_done(future):
+            self.export_cancels.discard(cancel_event)
+            dialog.close()
+            if future.cancelled() or isinstance(future.exception(), ExportCancelled):
+                self.show_status_message("导出已取消")
+            elif future.exception() is not None:
+                messagebox.showerror("导出失败", f"导出任务时发生错误: {future.exception()}")
+            else:
+                self.show_status_message(f"已导出 {future.result()} 个任务到: {filename}")
+        
+        self.background.submit(
+            self.background.run_blocking(export_to_file, tasks, filename, None, progress, cancel_event),
+            on_done=on_done
+        )
     
     def show_status_message(self, message: str, duration: int = 3000):
         """显示状态消息"""
         # 在这里可以实现状态栏或临时消息显示
         print(f"状态: {message}")
     
+    def schedule_startup_jobs(self):
+        """启动一秒后把不影响首屏的初始化交给空闲调度器"""
+        idle_scheduler.schedule(self.start_background_services, name="start_background_services")
+        # 预创建编辑对话框，首次打开时无需等待
+        idle_scheduler.schedule(self.get_edit_dialog, IdleScheduler.PRIORITY_LOW, name="prewarm_edit_dialog")
+    
+    def start_background_services(self):
+        """启动后台协程服务，结果通过异步桥接交回主线程"""
+        if self.background is not None:
+            return
+        from async_bridge import async_bridge
+        
+        self.background = async_bridge
+        self.background.attach(self)
+        
+        # 启动自动保存
+        self.start_auto_save()
+        
+        # 启动定时快照
+        self.start_snapshot_timer()
+        
+        # 本地 REST/JSON 接口（api_enabled 启用）
+        if app_config.get("api_enabled", False):
+            self.start_api_server()
+    
     def start_auto_save(self):
         """启动自动保存"""
         if app_config.get("auto_save", True):
-            def auto_save_worker():
-                while True:
-                    time.sleep(30)  # 每30秒自动保存一次
-                    task_db.save_tasks()
+            async def auto_save():
+                self.auto_save_running = True
+                try:
+                    with perf.measure("auto_save"):
+                        await self.background.run_blocking(task_db.save_tasks)
+                finally:
+                    self.auto_save_running = False
             
-            auto_save_thread = threading.Thread(target=auto_save_worker, daemon=True)
-            auto_save_thread.start()
+            # 每30秒自动保存一次
+            self.background.every(30, auto_save)
+    
+    @staticmethod
+    def positive_setting(key: str, default: int) -> int:
+        """读取正整数设置，无效时使用默认值，小于 1 时取 1"""
+        try:
+            return max(1, int(app_config.get(key, default)))
+        except (TypeError, ValueError):
+            return default
+    
+    def start_snapshot_timer(self):
+        """定时在后台创建任务和设置的快照"""
+        if not app_config.get("snapshot_enabled", True):
+            return
+        
+        # 配置文件可能被手动修改，间隔至少 1 分钟，至少保留 1 个快照
+        interval = self.positive_setting("snapshot_interval_minutes", 60) * 60
+        
+        def snapshot_worker():
+            from snapshot_store import snapshot_store
+            success, message = snapshot_store.create_snapshot("定时快照")
+            print(message)
+            if success:
+                snapshot_store.prune(self.positive_setting("snapshot_keep", 48))
+        
+        async def take_snapshot():
+            await self.background.run_blocking(snapshot_worker)
+        
+        self.background.every(interval, take_snapshot)
+    
+    def poll_journal(self):
+        """定期合并快速添加日志（只检查文件大小，有新记录时才合并）"""
+        if task_db.is_loaded and self.journal_job is None and task_db.journal.has_pending():
+            self.journal_job = idle_scheduler.schedule(
+                self.merge_journal, IdleScheduler.PRIORITY_LOW, name="merge_journal"
+            )
+        # 任务在界面之外被修改（API 请求）时刷新列表
+        if task_db.is_loaded and task_db.version != self.rendered_version:
+            self.refresh_tasks()
+        self.after(2000, self.poll_journal)
+    
+    def merge_journal(self):
+        """合并快速添加日志（重写任务文件在后台线程进行）"""
+        if self.background is None:
+            # 后台服务尚未启动，下次轮询再合并
+            self.journal_job = None
+            return
+        self.background.submit(
+            self.background.run_blocking(task_db.merge_journal), on_done=self._on_journal_merged
+        )
+    
+    def _on_journal_merged(self, future):
+        """日志合并完成（在主线程调用）"""
+        self.journal_job = None
+        if future.cancelled() or future.exception() is not None:
+            return
+        merged = future.result()
+        if merged:
+            self.refresh_tasks()
+            self.show_status_message(f"已合并 {merged} 个快速添加的任务")
+    
+    def start_api_server(self):
+        """在异步桥接的事件循环中启动本地 API 服务器（不等待监听完成）"""
+        from api_server import ApiServer
+        
+        try:
+            self.api_server = ApiServer(task_db, app_config.get("api_address"))
+        except ValueError as e:
+            print(f"API 服务器配置无效: {e}")
+            return
+        
+        def on_started(success: bool, message: str):
+            print(message)
+            if not success:
+                self.api_server = None
+        
+        self.api_server.start_nowait(self.background, on_started)
+    
+    def poll_instance_messages(self):
+        """轮询单实例消息（套接字在后台线程接收，Tk 只能在主线程操作）"""
+        for message in self.instance_server.poll():
+            self.handle_instance_message(message)
+        self.after(200, self.poll_instance_messages)
+    
+    def handle_instance_message(self, message: dict):
+        """处理一条转发消息"""
+        action = message.get("action")
+        if action == "add" and message.get("title", "").strip():
+            self.on_task_added(Task(id="", title=message["title"].strip()))
+        elif action == "raise":
+            self.deiconify()
+            self.lift()
+            self.focus_force()
+    
+    def toggle_perf_overlay(self, show: bool):
+        """显示或隐藏性能浮窗"""
+        from perf_hud import PerfOverlay
+        
+        overlay = getattr(self, "perf_overlay", None)
+        if show and (overlay is None or not overlay.winfo_exists()):
+            self.perf_overlay = PerfOverlay(self)
+        elif not show and overlay is not None and overlay.winfo_exists():
+            overlay.destroy()
+            self.perf_overlay = None
     
     def on_closing(self):
         """程序关闭时的处理"""
-        # 保存当前窗口大小和位置
+        # 保存当前窗口大小和显示设置（一次写入）
         geometry = self.geometry()
-        app_config.set("window_size", geometry.split('+')[0])
+        with app_config.batch():
+            app_config.set("window_size", geometry.split('+')[0])
+            app_config.set("show_completed", self.show_completed_var.get())
+        
+        idle_scheduler.cancel_all()
+        for cancel_event in self.export_cancels:
+            cancel_event.set()
         
-        # 保存显示设置
-        app_config.set("show_completed", self.show_completed_var.get())
+        # 先停止 API 服务器，之后不会再有外部修改
+        if self.api_server is not None:
+            self.api_server.stop()
+        
+        # 取消自动保存等后台协程，等待正在进行的写入结束
+        if self.background is not None:
+            self.background.shutdown()
         
         # 最终保存任务
         task_db.save_tasks()
         
+        if self.stall_watchdog is not None:
+            self.stall_watchdog.stop()
+        
+        # 导出性能计时数据
+        if perf.enabled:
+            perf.dump_json(app_config.config_dir / "perf_timings.json")
+        
+        if self.bundle_trace_path:
+            import bundle_slim
+            bundle_slim.write_trace(self, self.bundle_trace_path)
+        
+        if self.instance_server is not None:
+            self.instance_server.close()
+        
         # 关闭程序
         self.destroy()
 
-def main():
+def main(instance_server: Optional[InstanceServer] = None):
     """主函数"""
     try:
-        app = TodoApp()
+        app = TodoApp(instance_server)
         app.mainloop()
     except Exception as e:
         print(f"程序启动失败: {e}")
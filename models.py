@@ -5,7 +5,6 @@
 from dataclasses import dataclass, asdict
 from datetime import datetime, date
 from typing import Optional, Dict, Any
-import uuid
 
 @dataclass
 class Task:
@@ -23,6 +22,8 @@ class Task:
     def __post_init__(self):
         """初始化后处理"""
         if not self.id:
+            # 延迟导入：uuid 会连带导入 platform，读取已有任务时用不到
+            import uuid
             self.id = str(uuid.uuid4())
         
         if not self.created_at:
@@ -86,7 +87,7 @@ class Task:
         
         # 确保必需字段存在
         if 'id' not in data:
-            data['id'] = str(uuid.uuid4())
+            data['id'] = ""  # 由 __post_init__ 生成
         
         # 只保留Task类支持的字段
         valid_fields = {
@@ -0,0 +1,138 @@
+"""
+性能计时 - Todo App v0.3.1
+热点路径的轻量计时注册表，未启用时几乎没有开销
+"""
+import functools
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+class TimingStats:
+    """单个计时项的统计数据"""
+    
+    def __init__(self, sample_size: int):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        # 只保留最近的样本用于计算分位数
+        self.samples = deque(maxlen=sample_size)
+    
+    def add(self, seconds: float):
+        """记录一次耗时"""
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.samples.append(seconds)
+    
+    @staticmethod
+    def _percentile(sorted_samples, percent: float) -> float:
+        """最近秩法计算分位数"""
+        if not sorted_samples:
+            return 0.0
+        rank = max(1, math.ceil(percent / 100 * len(sorted_samples)))
+        return sorted_samples[rank - 1]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典（时间单位: 毫秒）"""
+        samples = sorted(self.samples)
+        return {
+            "count": self.count,
+            "total_ms": self.total * 1000,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "p50_ms": self._percentile(samples, 50) * 1000,
+            "p95_ms": self._percentile(samples, 95) * 1000,
+            "p99_ms": self._percentile(samples, 99) * 1000,
+            "max_ms": self.max * 1000
+        }
+
+class PerfRegistry:
+    """计时注册表
+    
+    用法:
+        @perf.timed()
+        def load_tasks(self): ...
+        
+        with perf.measure("auto_save"):
+            ...
+    
+    未启用时装饰器只多一次属性判断，measure 直接返回。
+    """
+    
+    def __init__(self, enabled: bool = False, sample_size: int = 1024):
+        self.enabled = enabled
+        self.sample_size = sample_size
+        self._stats: Dict[str, TimingStats] = {}
+        self._lock = threading.Lock()
+    
+    def record(self, name: str, seconds: float):
+        """记录一次耗时"""
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = TimingStats(self.sample_size)
+            stats.add(seconds)
+    
+    def timed(self, name: Optional[str] = None) -> Callable:
+        """计时装饰器，默认使用函数的限定名"""
+        def decorator(func: Callable) -> Callable:
+            label = name or func.__qualname__
+            
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(label, time.perf_counter() - start)
+            
+            return wrapper
+        return decorator
+    
+    @contextmanager
+    def measure(self, name: str):
+        """计时上下文管理器"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+    
+    def stats(self, name: Optional[str] = None) -> Dict[str, Any]:
+        """查询统计数据；指定名称时只返回该项"""
+        with self._lock:
+            if name is not None:
+                stats = self._stats.get(name)
+                return stats.to_dict() if stats else {}
+            return {key: stats.to_dict() for key, stats in sorted(self._stats.items())}
+    
+    def reset(self):
+        """清空所有统计"""
+        with self._lock:
+            self._stats.clear()
+    
+    def dump_json(self, path) -> bool:
+        """导出统计数据到 JSON 文件"""
+        try:
+            data = {
+                "export_time": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "timings": self.stats()
+            }
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            return True
+        except Exception as e:
+            print(f"导出性能数据失败: {e}")
+            return False
+
+# 全局计时注册表（设置环境变量 TODO_APP_PERF=1 启用）
+perf = PerfRegistry(enabled=os.environ.get("TODO_APP_PERF") == "1")
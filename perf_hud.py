@@ -0,0 +1,198 @@
+"""
+性能面板 - Todo App v0.3.1
+在设置对话框和置顶浮窗中显示实时性能数据
+"""
+import os
+import sys
+import time
+import customtkinter as ctk
+from typing import Any, Dict, List, Optional, Tuple
+from config import app_config
+from database import task_db
+from font_manager import get_font
+from idle_scheduler import idle_scheduler
+
+def get_process_rss() -> Optional[int]:
+    """获取当前进程的常驻内存（字节），无法获取时返回 None"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    except Exception:
+        return None
+    
+    # Linux: /proc/self/statm 第二列是常驻页数
+    try:
+        with open("/proc/self/statm", 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        pass
+    
+    # 其他类 Unix 系统只能拿到峰值
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except Exception:
+        return None
+
+def count_widgets(widget) -> int:
+    """递归统计存活的 Tk 控件数量"""
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+class WidgetCountCache:
+    """控件数量缓存
+    
+    遍历整个控件树在任务多时开销明显，不能每秒在界面线程上执行：
+    只在任务列表重新渲染后或超过 INTERVAL 秒时重新统计。
+    """
+    
+    INTERVAL = 30.0  # 秒
+    
+    def __init__(self):
+        self.count = 0
+        self._key = None
+        self._counted_at = 0.0
+    
+    def get(self, app) -> int:
+        """返回控件数量，必要时重新统计"""
+        # 每次刷新列表都会更新这两个值
+        key = (id(app), getattr(app, "rows_rendered", 0), getattr(app, "last_refresh_duration", 0.0))
+        now = time.monotonic()
+        if key != self._key or now - self._counted_at >= self.INTERVAL:
+            self.count = count_widgets(app)
+            self._key, self._counted_at = key, now
+        return self.count
+
+def collect_metrics(app) -> Dict[str, Any]:
+    """收集主窗口的性能数据"""
+    try:
+        tasks_file_size = app_config.tasks_file.stat().st_size
+    except OSError:
+        tasks_file_size = 0
+    
+    watchdog = getattr(app, "stall_watchdog", None)
+    
+    return {
+        "last_refresh_ms": getattr(app, "last_refresh_duration", 0.0) * 1000,
+        "rows_rendered": getattr(app, "rows_rendered", 0),
+        "widget_count": widget_counts.get(app),
+        "tasks_file_size": tasks_file_size,
+        "last_save_ms": task_db.last_save_duration * 1000,
+        "auto_save_running": getattr(app, "auto_save_running", False),
+        "idle_pending": idle_scheduler.pending,
+        "rss": get_process_rss(),
+        "stall_count": watchdog.stall_count if watchdog is not None else None
+    }
+
+def format_metrics(metrics: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """把性能数据格式化为 (名称, 文本) 列表"""
+    rss = metrics["rss"]
+    return [
+        ("上次刷新", f"{metrics['last_refresh_ms']:.1f} ms"),
+        ("已渲染行", f"{metrics['rows_rendered']}"),
+        ("控件数量", f"{metrics['widget_count']}"),
+        ("任务文件", f"{metrics['tasks_file_size'] / 1024:.1f} KB"),
+        ("上次保存", f"{metrics['last_save_ms']:.1f} ms"),
+        ("自动保存中", "是" if metrics["auto_save_running"] else "否"),
+        ("空闲任务队列", f"{metrics['idle_pending']}"),
+        ("内存占用", f"{rss / 1024 / 1024:.1f} MB" if rss is not None else "未知"),
+        ("界面卡顿", f"{metrics['stall_count']} 次" if metrics["stall_count"] is not None else "未启用"),
+    ]
+
+class PerfPanel(ctk.CTkFrame):
+    """设置对话框中的实时性能面板"""
+    
+    UPDATE_INTERVAL = 1000  # 毫秒
+    
+    def __init__(self, parent, app):
+        super().__init__(parent)
+        
+        self.app = app
+        self.value_labels: Dict[str, ctk.CTkLabel] = {}
+        self._after_id = None
+        
+        self.create_widgets()
+        self.update_metrics()
+    
+    def create_widgets(self):
+        """创建组件"""
+        ctk.CTkLabel(self, text="性能监控", font=get_font("subtitle")).pack(anchor="w", padx=10, pady=(10, 5))
+        
+        grid = ctk.CTkFrame(self, fg_color="transparent")
+        grid.pack(fill="x", padx=20)
+        
+        for row, (name, _) in enumerate(format_metrics(collect_metrics(self.app))):
+            ctk.CTkLabel(grid, text=f"{name}:", font=get_font("small"), text_color="gray").grid(
+                row=row, column=0, sticky="w", pady=1
+            )
+            value_label = ctk.CTkLabel(grid, text="", font=get_font("small"))
+            value_label.grid(row=row, column=1, sticky="w", padx=(10, 0), pady=1)
+            self.value_labels[name] = value_label
+        
+        overlay = getattr(self.app, "perf_overlay", None)
+        self.overlay_var = ctk.BooleanVar(value=overlay is not None and overlay.winfo_exists())
+        overlay_switch = ctk.CTkSwitch(
+            self,
+            text="在主窗口显示性能浮窗",
+            variable=self.overlay_var,
+            command=lambda: self.app.toggle_perf_overlay(self.overlay_var.get())
+        )
+        overlay_switch.pack(anchor="w", padx=20, pady=(5, 15))
+    
+    def update_metrics(self):
+        """定时刷新（对话框隐藏时跳过计算）"""
+        if self.winfo_viewable():
+            for name, text in format_metrics(collect_metrics(self.app)):
+                self.value_labels[name].configure(text=text)
+        self._after_id = self.after(self.UPDATE_INTERVAL, self.update_metrics)
+    
+    def destroy(self):
+        """销毁时停止定时刷新"""
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+        super().destroy()
+
+class PerfOverlay(ctk.CTkToplevel):
+    """主窗口右上角的置顶性能浮窗"""
+    
+    UPDATE_INTERVAL = 1000  # 毫秒
+    
+    def __init__(self, app):
+        super().__init__(app)
+        
+        self.app = app
+        self._after_id = None
+        
+        self.title("性能")
+        self.resizable(False, False)
+        self.attributes("-topmost", True)
+        self.transient(app)
+        
+        self.label = ctk.CTkLabel(self, text="", font=get_font("small"), justify="left", anchor="w")
+        self.label.pack(padx=10, pady=5)
+        
+        self.update_metrics()
+    
+    def update_metrics(self):
+        """刷新数据并贴靠主窗口右上角（主窗口最小化时跳过计算）"""
+        if self.app.winfo_viewable():
+            lines = [f"{name}: {text}" for name, text in format_metrics(collect_metrics(self.app))]
+            self.label.configure(text="\n".join(lines))
+            
+            self.update_idletasks()
+            x = self.app.winfo_rootx() + self.app.winfo_width() - self.winfo_width() - 20
+            y = self.app.winfo_rooty() + 20
+            self.geometry(f"+{x}+{y}")
+        
+        self._after_id = self.after(self.UPDATE_INTERVAL, self.update_metrics)
+    
+    def destroy(self):
+        """销毁时停止定时刷新"""
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+        super().destroy()
+
+# 全局控件数量缓存（设置面板和浮窗共用）
+widget_counts = WidgetCountCache()
@@ -0,0 +1,168 @@
+"""
+性能分析 - Todo App v0.3.1
+用 cProfile 或低开销的栈采样器记录主线程的运行情况，
+输出 .pstats 文件和可直接生成火焰图的折叠栈文本
+"""
+import cProfile
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from config import app_config
+
+class StackSampler:
+    """定时采样目标线程调用栈的后台线程"""
+    
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts: Counter = Counter()
+        self.sample_count = 0
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    @staticmethod
+    def _frame_label(frame) -> str:
+        """帧的显示名称: 函数名 (文件名:行号)"""
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    
+    def _sample(self):
+        """记录一次目标线程的调用栈（根在前）"""
+        frame = sys._current_frames().get(self.thread_id)
+        if frame is None:
+            return
+        stack = []
+        while frame is not None:
+            stack.append(self._frame_label(frame))
+            frame = frame.f_back
+        stack.reverse()
+        self.counts[";".join(stack)] += 1
+        self.sample_count += 1
+    
+    def _run(self):
+        """采样循环"""
+        while not self._stop_event.wait(self.interval):
+            self._sample()
+    
+    def start(self):
+        """开始采样"""
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="StackSampler", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """停止采样"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+    
+    def collapsed_lines(self) -> List[str]:
+        """折叠栈格式（每行: 帧1;帧2;帧3 次数），可直接交给 flamegraph.pl / speedscope"""
+        return [f"{stack} {count}" for stack, count in sorted(self.counts.items())]
+
+class Profiler:
+    """性能分析会话
+    
+    模式:
+        cprofile  cProfile 确定性分析（开销较大）+ 栈采样
+        sample    只做栈采样（开销很小），只输出折叠栈文件
+    
+    必须在被分析的线程（通常是 Tk 主线程）中调用 start()。
+    """
+    
+    MODES = ("cprofile", "sample")
+    
+    def __init__(self, output_dir: Optional[Path] = None):
+        self.output_dir = Path(output_dir) if output_dir else Path(app_config.config_dir) / "profiles"
+        self.mode: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self._profile: Optional[cProfile.Profile] = None
+        self._sampler: Optional[StackSampler] = None
+    
+    @property
+    def is_running(self) -> bool:
+        """是否正在分析"""
+        return self.mode is not None
+    
+    def start(self, mode: str = "sample", interval: float = 0.005) -> Tuple[bool, str]:
+        """开始分析
+        
+        Returns:
+            tuple: (success, message)
+        """
+        if self.is_running:
+            return False, "性能分析已在运行"
+        if mode not in self.MODES:
+            return False, f"未知的分析模式: {mode}"
+        
+        if mode == "cprofile":
+            self._profile = cProfile.Profile()
+            try:
+                self._profile.enable()
+            except ValueError as e:
+                # 已有其他分析器（如调试器）在运行
+                self._profile = None
+                return False, f"无法启动 cProfile: {e}"
+        
+        self._sampler = StackSampler(threading.get_ident(), interval)
+        self._sampler.start()
+        self.mode = mode
+        self.started_at = time.perf_counter()
+        return True, f"性能分析已开始（{mode}）"
+    
+    def stop(self) -> Tuple[bool, str]:
+        """停止分析并保存结果
+        
+        Returns:
+            tuple: (success, message)
+        """
+        if not self.is_running:
+            return False, "性能分析未运行"
+        
+        if self._profile is not None:
+            self._profile.disable()
+        self._sampler.stop()
+        duration = time.perf_counter() - self.started_at
+        
+        try:
+            files = self._save()
+            return True, f"已分析 {duration:.1f} 秒，结果保存到: {', '.join(str(path) for path in files.values())}"
+        except Exception as e:
+            return False, f"保存分析结果失败: {str(e)}"
+        finally:
+            self.mode = None
+            self.started_at = None
+            self._profile = None
+            self._sampler = None
+    
+    def _save(self) -> Dict[str, Path]:
+        """写出分析结果文件"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        base = self.output_dir / f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        files = {}
+        
+        if self._profile is not None:
+            files["pstats"] = base.with_suffix(".pstats")
+            self._profile.dump_stats(str(files["pstats"]))
+        
+        files["collapsed"] = base.with_suffix(".collapsed.txt")
+        with open(files["collapsed"], 'w', encoding='utf-8') as f:
+            f.write("\n".join(self._sampler.collapsed_lines()))
+            f.write("\n")
+        return files
+
+def mode_from_env() -> Optional[str]:
+    """读取启动时的分析模式（TODO_APP_PROFILE=cprofile|sample，1 等同 cprofile）"""
+    value = os.environ.get("TODO_APP_PROFILE", "").strip().lower()
+    if not value or value == "0":
+        return None
+    return "cprofile" if value == "1" else value
+
+# 全局分析器实例
+profiler = Profiler()
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tkinter 运行时钩子 - 应用构建时记录的 TCL/TK 库路径
+build.spec 在打包时解析出实际目录并写入 tk_paths.json，
+这里只读取清单并设置环境变量，启动时不再探测目录
+"""
+
+import json
+import os
+import sys
+
+def apply_tk_manifest():
+    """根据清单设置 TCL_LIBRARY / TK_LIBRARY"""
+    if not getattr(sys, 'frozen', False):
+        return
+    
+    base_dir = sys._MEIPASS
+    try:
+        with open(os.path.join(base_dir, 'tk_paths.json'), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        # 没有清单时保留 PyInstaller 内置 tkinter 钩子的设置
+        print(f"[Tk Manifest] 无法读取 TCL/TK 路径清单: {e}")
+        return
+    
+    for name, relative_path in manifest.items():
+        os.environ[name] = os.path.join(base_dir, *relative_path.split('/'))
+
+apply_tk_manifest()
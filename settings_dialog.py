@@ -12,10 +12,23 @@ import time
 import webbrowser
 import subprocess
 from config import app_config
+from font_manager import get_font
 from settings_manager import settings_manager
+from profiler import profiler, Profiler
 
 class SettingsDialog(ctk.CTkToplevel):
-    """设置对话框"""
+    """设置对话框
+    
+    选项卡内容在第一次被选中时才创建；关闭时只隐藏窗口，
+    再次打开时通过 show() 重新载入设置即可复用。
+    """
+    
+    # 语言显示名称与配置值的对应关系
+    LANGUAGE_OPTIONS = {
+        "简体中文 (zh-cn)": "zh-cn",
+        "English (en)": "en",
+        "繁體中文 (zh-tw)": "zh-tw"
+    }
     
     def __init__(self, parent, callback=None):
         super().__init__(parent)
@@ -31,10 +44,14 @@ class SettingsDialog(ctk.CTkToplevel):
         
         # 设置为模态窗口
         self.transient(parent)
+        self.protocol("WM_DELETE_WINDOW", self.cancel)
         
         # 居中显示
         self.center_window()
         
+        # 创建设置变量（选项卡控件创建前就需要存在）
+        self.init_variables()
+        
         # 创建界面
         self.create_widgets()
         
@@ -44,6 +61,39 @@ class SettingsDialog(ctk.CTkToplevel):
         # 确保窗口完全显示后再设置模态
         self.after(100, self.setup_modal)
     
+    def init_variables(self):
+        """创建所有设置项对应的变量"""
+        self.theme_var = ctk.StringVar()
+        self.font_size_var = ctk.IntVar()
+        self.width_var = ctk.StringVar()
+        self.height_var = ctk.StringVar()
+        self.auto_save_var = ctk.BooleanVar()
+        self.show_completed_var = ctk.BooleanVar()
+        self.show_statistics_var = ctk.BooleanVar()
+        self.confirm_delete_var = ctk.BooleanVar()
+        self.canvas_renderer_var = ctk.BooleanVar()
+        self.language_var = ctk.StringVar()
+        self.priority_colors = {}
+        self.color_buttons = {}
+        self.color_labels = {}
+        self.font_size_label = None
+    
+    def show(self):
+        """重新显示已创建的对话框"""
+        self.original_config = app_config.config.copy()
+        self.load_current_settings()
+        self.deiconify()
+        self.lift()
+        self.after(100, self.setup_modal)
+    
+    def hide(self):
+        """隐藏对话框（保留控件以便下次复用）"""
+        try:
+            self.grab_release()
+        except Exception:
+            pass
+        self.withdraw()
+    
     def center_window(self):
         """窗口居中显示"""
         self.update_idletasks()
@@ -74,7 +124,7 @@ class SettingsDialog(ctk.CTkToplevel):
         title_label = ctk.CTkLabel(
             main_frame, 
             text="⚙️ 应用设置", 
-            font=("", 20, "bold")
+            font=get_font("title")
         )
         title_label.pack(pady=(10, 20))
         
@@ -85,29 +135,41 @@ class SettingsDialog(ctk.CTkToplevel):
         self.create_buttons(main_frame)
     
     def create_tabs(self, parent):
-        """创建选项卡"""
+        """创建选项卡（内容延迟到首次选中时创建）"""
         # 选项卡视图
-        self.tabview = ctk.CTkTabview(parent, width=550, height=350)
+        self.tabview = ctk.CTkTabview(parent, width=550, height=350, command=self.on_tab_changed)
         self.tabview.pack(fill="both", expand=True, pady=(0, 20))
         
-        # 外观设置选项卡
-        self.create_appearance_tab()
-        
-        # 行为设置选项卡
-        self.create_behavior_tab()
-        
-        # 颜色设置选项卡
-        self.create_color_tab()
+        self.tab_builders = {
+            "外观": self.create_appearance_tab,
+            "行为": self.create_behavior_tab,
+            "颜色": self.create_color_tab,
+            "高级": self.create_advanced_tab,
+            "关于": self.create_about_tab,
+        }
+        self.built_tabs = set()
         
-        # 高级设置选项卡
-        self.create_advanced_tab()
+        for name in self.tab_builders:
+            self.tabview.add(name)
         
-        # 关于选项卡
-        self.create_about_tab()
+        # 只创建默认显示的选项卡
+        self.tabview.set("外观")
+        self.build_tab("外观")
+    
+    def build_tab(self, name: str):
+        """创建选项卡内容（每个选项卡只创建一次）"""
+        if name in self.built_tabs or name not in self.tab_builders:
+            return
+        self.built_tabs.add(name)
+        self.tab_builders[name]()
+    
+    def on_tab_changed(self):
+        """切换选项卡时按需创建内容"""
+        self.build_tab(self.tabview.get())
     
     def create_appearance_tab(self):
         """创建外观设置选项卡"""
-        tab = self.tabview.add("外观")
+        tab = self.tabview.tab("外观")
         
         # 创建滚动框架
         scroll_frame = ctk.CTkScrollableFrame(tab)
@@ -117,9 +179,8 @@ class SettingsDialog(ctk.CTkToplevel):
         theme_frame = ctk.CTkFrame(scroll_frame)
         theme_frame.pack(fill="x", padx=10, pady=10)
         
-        ctk.CTkLabel(theme_frame, text="主题模式", font=("", 14, "bold")).pack(anchor="w", padx=10, pady=(10, 5))
+        ctk.CTkLabel(theme_frame, text="主题模式", font=get_font("subtitle")).pack(anchor="w", padx=10, pady=(10, 5))
         
-        self.theme_var = ctk.StringVar(value=app_config.get("theme", "system"))
         theme_options = [("跟随系统", "system"), ("深色模式", "dark"), ("浅色模式", "light")]
         
         for text, value in theme_options:
@@ -136,12 +197,11 @@ class SettingsDialog(ctk.CTkToplevel):
         font_frame = ctk.CTkFrame(scroll_frame)
         font_frame.pack(fill="x", padx=10, pady=10)
         
-        ctk.CTkLabel(font_frame, text="字体大小", font=("", 14, "bold")).pack(anchor="w", padx=10, pady=(10, 5))
+        ctk.CTkLabel(font_frame, text="字体大小", font=get_font("subtitle")).pack(anchor="w", padx=10, pady=(10, 5))
         
         font_size_frame = ctk.CTkFrame(font_frame, fg_color="transparent")
         font_size_frame.pack(fill="x", padx=10, pady=(0, 10))
         
-        self.font_size_var = ctk.IntVar(value=app_config.get("font_size", 14))
         self.font_size_slider = ctk.CTkSlider(
             font_size_frame,
             from_=10,
@@ -159,7 +219,7 @@ class SettingsDialog(ctk.CTkToplevel):
         window_frame = ctk.CTkFrame(scroll_frame)
         window_frame.pack(fill="x", padx=10, pady=10)
         
-        ctk.CTkLabel(window_frame, text="窗口设置", font=("", 14, "bold")).pack(anchor="w", padx=10, pady=(10, 5))
+        ctk.CTkLabel(window_frame, text="窗口设置", font=get_font("subtitle")).pack(anchor="w", padx=10, pady=(10, 5))
         
         # 窗口大小
         size_frame = ctk.CTkFrame(window_frame, fg_color="transparent")
@@ -167,22 +227,17 @@ class SettingsDialog(ctk.CTkToplevel):
         
         ctk.CTkLabel(size_frame, text="默认窗口大小:").pack(side="left")
         
-        current_size = app_config.get("window_size", "900x700")
-        width, height = current_size.split('x')
-        
-        self.width_entry = ctk.CTkEntry(size_frame, width=80, placeholder_text="宽度")
+        self.width_entry = ctk.CTkEntry(size_frame, width=80, textvariable=self.width_var)
         self.width_entry.pack(side="left", padx=(10, 5))
-        self.width_entry.insert(0, width)
         
         ctk.CTkLabel(size_frame, text="×").pack(side="left", padx=5)
         
-        self.height_entry = ctk.CTkEntry(size_frame, width=80, placeholder_text="高度")
+        self.height_entry = ctk.CTkEntry(size_frame, width=80, textvariable=self.height_var)
         self.height_entry.pack(side="left", padx=(5, 10))
-        self.height_entry.insert(0, height)
     
     def create_behavior_tab(self):
         """创建行为设置选项卡"""
-        tab = self.tabview.add("行为")
+        tab = self.tabview.tab("行为")
         
         # 创建滚动框架
         scroll_frame = ctk.CTkScrollableFrame(tab)
@@ -192,9 +247,8 @@ class SettingsDialog(ctk.CTkToplevel):
         auto_save_frame = ctk.CTkFrame(scroll_frame)
         auto_save_frame.pack(fill="x", padx=10, pady=10)
         
-        ctk.CTkLabel(auto_save_frame, text="自动保存", font=("", 14, "bold")).pack(anchor="w", padx=10, pady=(10, 5))
+        ctk.CTkLabel(auto_save_frame, text="自动保存", font=get_font("subtitle")).pack(anchor="w", padx=10, pady=(10, 5))
         
-        self.auto_save_var = ctk.BooleanVar(value=app_config.get("auto_save", True))
         auto_save_cb = ctk.CTkCheckBox(
             auto_save_frame,
             text="启用自动保存（每30秒）",
@@ -206,9 +260,8 @@ class SettingsDialog(ctk.CTkToplevel):
         display_frame = ctk.CTkFrame(scroll_frame)
         display_frame.pack(fill="x", padx=10, pady=10)
         
-        ctk.CTkLabel(display_frame, text="显示选项", font=("", 14, "bold")).pack(anchor="w", padx=10, pady=(10, 5))
+        ctk.CTkLabel(display_frame, text="显示选项", font=get_font("subtitle")).pack(anchor="w", padx=10, pady=(10, 5))
         
-        self.show_completed_var = ctk.BooleanVar(value=app_config.get("show_completed", True))
         show_completed_cb = ctk.CTkCheckBox(
             display_frame,
             text="默认显示已完成任务",
@@ -216,7 +269,6 @@ class SettingsDialog(ctk.CTkToplevel):
         )
         show_completed_cb.pack(anchor="w", padx=20, pady=2)
         
-        self.show_statistics_var = ctk.BooleanVar(value=app_config.get("show_statistics", True))
         show_stats_cb = ctk.CTkCheckBox(
             display_frame,
             text="显示统计面板",
@@ -224,36 +276,41 @@ class SettingsDialog(ctk.CTkToplevel):
         )
         show_stats_cb.pack(anchor="w", padx=20, pady=2)
         
-        self.confirm_delete_var = ctk.BooleanVar(value=app_config.get("confirm_delete", True))
         confirm_delete_cb = ctk.CTkCheckBox(
             display_frame,
             text="删除任务时确认",
             variable=self.confirm_delete_var
         )
-        confirm_delete_cb.pack(anchor="w", padx=20, pady=(2, 10))
+        confirm_delete_cb.pack(anchor="w", padx=20, pady=2)
+        
+        canvas_renderer_cb = ctk.CTkCheckBox(
+            display_frame,
+            text="轻量列表渲染（大量任务时更快，需重启）",
+            variable=self.canvas_renderer_var
+        )
+        canvas_renderer_cb.pack(anchor="w", padx=20, pady=(2, 10))
         
         # 语言设置
         language_frame = ctk.CTkFrame(scroll_frame)
         language_frame.pack(fill="x", padx=10, pady=10)
         
-        ctk.CTkLabel(language_frame, text="语言设置", font=("", 14, "bold")).pack(anchor="w", padx=10, pady=(10, 5))
+        ctk.CTkLabel(language_frame, text="语言设置", font=get_font("subtitle")).pack(anchor="w", padx=10, pady=(10, 5))
         
         lang_frame = ctk.CTkFrame(language_frame, fg_color="transparent")
         lang_frame.pack(fill="x", padx=10, pady=(0, 10))
         
         ctk.CTkLabel(lang_frame, text="界面语言:").pack(side="left")
         
-        self.language_var = ctk.StringVar(value=app_config.get("language", "zh-cn"))
         language_menu = ctk.CTkOptionMenu(
             lang_frame,
-            values=["简体中文 (zh-cn)", "English (en)", "繁體中文 (zh-tw)"],
+            values=list(self.LANGUAGE_OPTIONS.keys()),
             variable=self.language_var
         )
         language_menu.pack(side="left", padx=(10, 0))
     
     def create_color_tab(self):
         """创建颜色设置选项卡"""
-        tab = self.tabview.add("颜色")
+        tab = self.tabview.tab("颜色")
         
         # 创建滚动框架
         scroll_frame = ctk.CTkScrollableFrame(tab)
@@ -263,15 +320,8 @@ class SettingsDialog(ctk.CTkToplevel):
         priority_frame = ctk.CTkFrame(scroll_frame)
         priority_frame.pack(fill="x", padx=10, pady=10)
         
-        ctk.CTkLabel(priority_frame, text="优先级颜色", font=("", 14, "bold")).pack(anchor="w", padx=10, pady=(10, 5))
+        ctk.CTkLabel(priority_frame, text="优先级颜色", font=get_font("subtitle")).pack(anchor="w", padx=10, pady=(10, 5))
         
-        self.priority_colors = app_config.get("priority_colors", {
-            "高": "#ff4444",
-            "中": "#ffaa00", 
-            "低": "#44ff44"
-        }).copy()
-        
-        self.color_buttons = {}
         for priority in ["高", "中", "低"]:
             color_frame = ctk.CTkFrame(priority_frame, fg_color="transparent")
             color_frame.pack(fill="x", padx=10, pady=5)
@@ -291,6 +341,7 @@ class SettingsDialog(ctk.CTkToplevel):
             
             color_label = ctk.CTkLabel(color_frame, text=self.priority_colors[priority])
             color_label.pack(side="left")
+            self.color_labels[priority] = color_label
         
         # 重置颜色按钮
         reset_colors_btn = ctk.CTkButton(
@@ -304,7 +355,7 @@ class SettingsDialog(ctk.CTkToplevel):
     
     def create_advanced_tab(self):
         """创建高级设置选项卡"""
-        tab = self.tabview.add("高级")
+        tab = self.tabview.tab("高级")
         
         # 创建滚动框架
         scroll_frame = ctk.CTkScrollableFrame(tab)
@@ -314,7 +365,7 @@ class SettingsDialog(ctk.CTkToplevel):
         data_frame = ctk.CTkFrame(scroll_frame)
         data_frame.pack(fill="x", padx=10, pady=10)
         
-        ctk.CTkLabel(data_frame, text="数据管理", font=("", 14, "bold")).pack(anchor="w", padx=10, pady=(10, 5))
+        ctk.CTkLabel(data_frame, text="数据管理", font=get_font("subtitle")).pack(anchor="w", padx=10, pady=(10, 5))
         
         # 导出设置
         export_btn = ctk.CTkButton(
@@ -349,13 +400,13 @@ class SettingsDialog(ctk.CTkToplevel):
         debug_frame = ctk.CTkFrame(scroll_frame)
         debug_frame.pack(fill="x", padx=10, pady=10)
         
-        ctk.CTkLabel(debug_frame, text="调试信息", font=("", 14, "bold")).pack(anchor="w", padx=10, pady=(10, 5))
+        ctk.CTkLabel(debug_frame, text="调试信息", font=get_font("subtitle")).pack(anchor="w", padx=10, pady=(10, 5))
         
         # 显示配置文件路径
         config_path_label = ctk.CTkLabel(
             debug_frame,
             text=f"配置文件: {app_config.config_file}",
-            font=("", 10),
+            font=get_font("small"),
             text_color="gray"
         )
         config_path_label.pack(anchor="w", padx=20, pady=2)
@@ -364,14 +415,64 @@ class SettingsDialog(ctk.CTkToplevel):
         tasks_path_label = ctk.CTkLabel(
             debug_frame,
             text=f"任务文件: {app_config.tasks_file}",
-            font=("", 10),
+            font=get_font("small"),
             text_color="gray"
         )
         tasks_path_label.pack(anchor="w", padx=20, pady=(2, 15))
+        
+        # 实时性能面板
+        from perf_hud import PerfPanel
+        perf_panel = PerfPanel(scroll_frame, self.parent)
+        perf_panel.pack(fill="x", padx=10, pady=10)
+        
+        # 性能分析
+        profile_frame = ctk.CTkFrame(scroll_frame)
+        profile_frame.pack(fill="x", padx=10, pady=10)
+        
+        ctk.CTkLabel(profile_frame, text="性能分析", font=get_font("subtitle")).pack(anchor="w", padx=10, pady=(10, 5))
+        
+        profile_controls = ctk.CTkFrame(profile_frame, fg_color="transparent")
+        profile_controls.pack(fill="x", padx=20, pady=5)
+        
+        self.profile_mode_var = ctk.StringVar(value=profiler.mode or "sample")
+        ctk.CTkOptionMenu(
+            profile_controls,
+            values=list(Profiler.MODES),
+            variable=self.profile_mode_var,
+            width=110
+        ).pack(side="left", padx=(0, 10))
+        
+        self.profile_button = ctk.CTkButton(
+            profile_controls,
+            text="停止并保存" if profiler.is_running else "开始分析",
+            command=self.toggle_profiling,
+            width=110
+        )
+        self.profile_button.pack(side="left")
+        
+        self.profile_status_label = ctk.CTkLabel(
+            profile_frame,
+            text="采样模式开销很小；cprofile 模式会明显拖慢界面",
+            font=get_font("small"),
+            text_color="gray",
+            wraplength=500,
+            justify="left"
+        )
+        self.profile_status_label.pack(anchor="w", padx=20, pady=(2, 15))
+    
+    def toggle_profiling(self):
+        """开始或停止性能分析"""
+        if profiler.is_running:
+            success, message = profiler.stop()
+        else:
+            success, message = profiler.start(self.profile_mode_var.get())
+        
+        self.profile_button.configure(text="停止并保存" if profiler.is_running else "开始分析")
+        self.profile_status_label.configure(text=message, text_color="gray" if success else "red")
     
     def create_about_tab(self):
         """创建关于选项卡"""
-        tab = self.tabview.add("关于")
+        tab = self.tabview.tab("关于")
         
         # 创建滚动框架
         scroll_frame = ctk.CTkScrollableFrame(tab)
@@ -389,7 +490,7 @@ class SettingsDialog(ctk.CTkToplevel):
         icon_label = ctk.CTkLabel(
             title_frame,
             text="📝",
-            font=("", 48)
+            font=get_font("display")
         )
         icon_label.pack(pady=(0, 10))
         
@@ -397,7 +498,7 @@ class SettingsDialog(ctk.CTkToplevel):
         app_name_label = ctk.CTkLabel(
             title_frame,
             text=f"{app_config.app_name}",
-            font=("", 24, "bold")
+            font=get_font("hero")
         )
         app_name_label.pack()
         
@@ -405,7 +506,7 @@ class SettingsDialog(ctk.CTkToplevel):
         version_label = ctk.CTkLabel(
             title_frame,
             text=f"版本 {app_config.version}",
-            font=("", 16),
+            font=get_font("icon"),
             text_color="gray"
         )
         version_label.pack(pady=(5, 0))
@@ -414,7 +515,7 @@ class SettingsDialog(ctk.CTkToplevel):
         description_label = ctk.CTkLabel(
             title_frame,
             text="现代化跨平台待办事项管理器\n支持 Windows、Linux、macOS 和深色模式",
-            font=("", 14),
+            font=get_font("body"),
             text_color="gray",
             justify="center"
         )
@@ -424,13 +525,13 @@ class SettingsDialog(ctk.CTkToplevel):
         dev_info_frame = ctk.CTkFrame(scroll_frame)
         dev_info_frame.pack(fill="x", padx=10, pady=10)
         
-        ctk.CTkLabel(dev_info_frame, text="开发信息", font=("", 16, "bold")).pack(anchor="w", padx=10, pady=(10, 5))
+        ctk.CTkLabel(dev_info_frame, text="开发信息", font=get_font("heading")).pack(anchor="w", padx=10, pady=(10, 5))
         
         # 开发者
         dev_label = ctk.CTkLabel(
             dev_info_frame,
             text="开发者: SDCOM",
-            font=("", 12)
+            font=get_font("control")
         )
         dev_label.pack(anchor="w", padx=20, pady=2)
         
@@ -439,7 +540,7 @@ class SettingsDialog(ctk.CTkToplevel):
         copyright_label = ctk.CTkLabel(
             dev_info_frame,
             text=f"版权所有 © {current_year} SDCOM",
-            font=("", 12)
+            font=get_font("control")
         )
         copyright_label.pack(anchor="w", padx=20, pady=2)
         
@@ -447,7 +548,7 @@ class SettingsDialog(ctk.CTkToplevel):
         tech_label = ctk.CTkLabel(
             dev_info_frame,
             text="技术栈: Python 3.12 + CustomTkinter",
-            font=("", 12)
+            font=get_font("control")
         )
         tech_label.pack(anchor="w", padx=20, pady=(2, 15))
         
@@ -455,7 +556,7 @@ class SettingsDialog(ctk.CTkToplevel):
         features_frame = ctk.CTkFrame(scroll_frame)
         features_frame.pack(fill="x", padx=10, pady=10)
         
-        ctk.CTkLabel(features_frame, text="主要功能", font=("", 16, "bold")).pack(anchor="w", padx=10, pady=(10, 5))
+        ctk.CTkLabel(features_frame, text="主要功能", font=get_font("heading")).pack(anchor="w", padx=10, pady=(10, 5))
         
         features = [
             "✅ 任务创建、编辑和删除",
@@ -474,7 +575,7 @@ class SettingsDialog(ctk.CTkToplevel):
             feature_label = ctk.CTkLabel(
                 features_frame,
                 text=feature,
-                font=("", 11),
+                font=get_font("caption"),
                 anchor="w"
             )
             feature_label.pack(anchor="w", padx=20, pady=1)
@@ -486,13 +587,13 @@ class SettingsDialog(ctk.CTkToplevel):
         system_info_frame = ctk.CTkFrame(scroll_frame)
         system_info_frame.pack(fill="x", padx=10, pady=10)
         
-        ctk.CTkLabel(system_info_frame, text="系统信息", font=("", 16, "bold")).pack(anchor="w", padx=10, pady=(10, 5))
+        ctk.CTkLabel(system_info_frame, text="系统信息", font=get_font("heading")).pack(anchor="w", padx=10, pady=(10, 5))
         
         # Python版本
         python_version_label = ctk.CTkLabel(
             system_info_frame,
             text=f"Python 版本: {sys.version.split()[0]}",
-            font=("", 11),
+            font=get_font("caption"),
             text_color="gray"
         )
         python_version_label.pack(anchor="w", padx=20, pady=1)
@@ -543,7 +644,7 @@ class SettingsDialog(ctk.CTkToplevel):
         os_info_label = ctk.CTkLabel(
             system_info_frame,
             text=f"操作系统: {os_display}",
-            font=("", 11),
+            font=get_font("caption"),
             text_color="gray"
         )
         os_info_label.pack(anchor="w", padx=20, pady=1)
@@ -552,7 +653,7 @@ class SettingsDialog(ctk.CTkToplevel):
         arch_label = ctk.CTkLabel(
             system_info_frame,
             text=f"系统架构: {platform.machine()}",
-            font=("", 11),
+            font=get_font("caption"),
             text_color="gray"
         )
         arch_label.pack(anchor="w", padx=20, pady=(1, 15))
@@ -561,17 +662,17 @@ class SettingsDialog(ctk.CTkToplevel):
         contact_frame = ctk.CTkFrame(scroll_frame)
         contact_frame.pack(fill="x", padx=10, pady=10)
         
-        ctk.CTkLabel(contact_frame, text="联系方式", font=("", 16, "bold")).pack(anchor="w", padx=10, pady=(10, 5))
+        ctk.CTkLabel(contact_frame, text="联系方式", font=get_font("heading")).pack(anchor="w", padx=10, pady=(10, 5))
         
         # 邮箱
         email_frame = ctk.CTkFrame(contact_frame, fg_color="transparent")
         email_frame.pack(fill="x", padx=20, pady=2)
         
-        ctk.CTkLabel(email_frame, text="📧 邮箱: ", font=("", 12)).pack(side="left")
+        ctk.CTkLabel(email_frame, text="📧 邮箱: ", font=get_font("control")).pack(side="left")
         email_link = ctk.CTkButton(
             email_frame,
             text="sdcom@sdcom.asia",
-            font=("", 12),
+            font=get_font("control"),
             fg_color="transparent",
             text_color=("blue", "lightblue"),
             hover_color=("lightgray", "darkgray"),
@@ -585,11 +686,11 @@ class SettingsDialog(ctk.CTkToplevel):
         github_frame = ctk.CTkFrame(contact_frame, fg_color="transparent")
         github_frame.pack(fill="x", padx=20, pady=2)
         
-        ctk.CTkLabel(github_frame, text="🐙 GitHub: ", font=("", 12)).pack(side="left")
+        ctk.CTkLabel(github_frame, text="🐙 GitHub: ", font=get_font("control")).pack(side="left")
         github_link = ctk.CTkButton(
             github_frame,
             text="https://github.com/SDCOM-0415/To-do.app",
-            font=("", 12),
+            font=get_font("control"),
             fg_color="transparent",
             text_color=("blue", "lightblue"),
             hover_color=("lightgray", "darkgray"),
@@ -603,11 +704,11 @@ class SettingsDialog(ctk.CTkToplevel):
         website_frame = ctk.CTkFrame(contact_frame, fg_color="transparent")
         website_frame.pack(fill="x", padx=20, pady=(2, 15))
         
-        ctk.CTkLabel(website_frame, text="🌐 个人网站: ", font=("", 12)).pack(side="left")
+        ctk.CTkLabel(website_frame, text="🌐 个人网站: ", font=get_font("control")).pack(side="left")
         website_link = ctk.CTkButton(
             website_frame,
             text="www.sdcom.top",
-            font=("", 12),
+            font=get_font("control"),
             fg_color="transparent",
             text_color=("blue", "lightblue"),
             hover_color=("lightgray", "darkgray"),
@@ -652,11 +753,41 @@ class SettingsDialog(ctk.CTkToplevel):
         ok_btn.pack(side="right", padx=(0, 5), pady=10)
     
     def load_current_settings(self):
-        """加载当前设置"""
-        # 主题已在创建时设置
-        # 字体大小已在创建时设置
-        # 其他设置也已在创建时设置
-        pass
+        """把当前配置载入到设置变量（已创建的控件会随变量更新）"""
+        self.theme_var.set(app_config.get("theme", "system"))
+        self.font_size_var.set(app_config.get("font_size", 14))
+        if self.font_size_label is not None:
+            self.font_size_label.configure(text=f"{self.font_size_var.get()}px")
+        
+        width, height = app_config.get("window_size", "900x700").split('x')
+        self.width_var.set(width)
+        self.height_var.set(height)
+        
+        self.auto_save_var.set(app_config.get("auto_save", True))
+        self.show_completed_var.set(app_config.get("show_completed", True))
+        self.show_statistics_var.set(app_config.get("show_statistics", True))
+        self.confirm_delete_var.set(app_config.get("confirm_delete", True))
+        self.canvas_renderer_var.set(app_config.get("list_renderer", "widget") == "canvas")
+        
+        language = app_config.get("language", "zh-cn")
+        for display_name, code in self.LANGUAGE_OPTIONS.items():
+            if code == language:
+                self.language_var.set(display_name)
+                break
+        
+        self.priority_colors = app_config.get("priority_colors", {
+            "高": "#ff4444",
+            "中": "#ffaa00", 
+            "低": "#44ff44"
+        }).copy()
+        for priority, color in self.priority_colors.items():
+            self.update_color_widgets(priority, color)
+    
+    def update_color_widgets(self, priority, color):
+        """更新颜色选项卡中的按钮和标签（选项卡未创建时跳过）"""
+        if priority in self.color_buttons:
+            self.color_buttons[priority].configure(fg_color=color)
+            self.color_labels[priority].configure(text=color)
     
     def on_theme_changed(self):
         """主题改变时的处理"""
@@ -677,12 +808,7 @@ class SettingsDialog(ctk.CTkToplevel):
         
         if color[1]:  # 如果用户选择了颜色
             self.priority_colors[priority] = color[1]
-            self.color_buttons[priority].configure(fg_color=color[1])
-            # 更新颜色标签
-            for widget in self.color_buttons[priority].master.winfo_children():
-                if isinstance(widget, ctk.CTkLabel) and widget.cget("text").startswith("#"):
-                    widget.configure(text=color[1])
-                    break
+            self.update_color_widgets(priority, color[1])
     
     def reset_priority_colors(self):
         """重置优先级颜色为默认值"""
@@ -694,12 +820,7 @@ class SettingsDialog(ctk.CTkToplevel):
         
         for priority, color in default_colors.items():
             self.priority_colors[priority] = color
-            self.color_buttons[priority].configure(fg_color=color)
-            # 更新颜色标签
-            for widget in self.color_buttons[priority].master.winfo_children():
-                if isinstance(widget, ctk.CTkLabel) and widget.cget("text").startswith("#"):
-                    widget.configure(text=color)
-                    break
+            self.update_color_widgets(priority, color)
     
     def export_settings(self):
         """导出设置"""
@@ -715,7 +836,7 @@ class SettingsDialog(ctk.CTkToplevel):
                 messagebox.showinfo("导出成功", message)
             else:
                 messagebox.showerror("导出失败", message)
-
+    
     def import_settings(self):
         """导入设置"""
         filename = filedialog.askopenfilename(
@@ -732,78 +853,75 @@ class SettingsDialog(ctk.CTkToplevel):
                     apply_success, apply_errors = settings_manager.apply_settings(settings_data)
                     if apply_success:
                         messagebox.showinfo("导入成功", "设置已导入，请重启应用程序以应用所有更改")
-                        self.destroy()
+                        self.hide()
                     else:
                         error_msg = "应用导入的设置时发生错误:\n" + "\n".join(apply_errors)
                         messagebox.showerror("应用失败", error_msg)
             else:
                 messagebox.showerror("导入失败", message)
-
+    
     def reset_all_settings(self):
         """重置所有设置"""
         if messagebox.askyesno("确认重置", "确定要重置所有设置为默认值吗？此操作不可恢复！"):
             success, message = settings_manager.reset_to_defaults()
             if success:
                 messagebox.showinfo("重置完成", f"{message}，请重启应用程序")
-                self.destroy()
+                self.hide()
             else:
                 messagebox.showerror("重置失败", message)
     
     def apply_settings(self):
         """应用设置"""
         try:
-            # 保存主题设置
-            app_config.set("theme", self.theme_var.get())
-            
-            # 保存字体大小
-            app_config.set("font_size", self.font_size_var.get())
-            
-            # 保存窗口大小
-            width = self.width_entry.get().strip()
-            height = self.height_entry.get().strip()
-            if width.isdigit() and height.isdigit():
-                app_config.set("window_size", f"{width}x{height}")
-            
-            # 保存行为设置
-            # 保存行为设置
-            app_config.set("auto_save", self.auto_save_var.get())
-            app_config.set("show_completed", self.show_completed_var.get())
-            app_config.set("show_statistics", self.show_statistics_var.get())
-            app_config.set("confirm_delete", self.confirm_delete_var.get())
-            
-            # 保存语言设置
-            lang_mapping = {
-                "简体中文 (zh-cn)": "zh-cn",
-                "English (en)": "en",
-                "繁體中文 (zh-tw)": "zh-tw"
-            }
-            selected_lang = self.language_var.get()
-            if selected_lang in lang_mapping:
-                app_config.set("language", lang_mapping[selected_lang])
-            
-            # 保存优先级颜色
-            app_config.set("priority_colors", self.priority_colors)
+            # 所有设置一次性写入配置文件
+            with app_config.batch():
+                # 保存主题设置
+                app_config.set("theme", self.theme_var.get())
+                
+                # 保存字体大小
+                app_config.set("font_size", self.font_size_var.get())
+                
+                # 保存窗口大小
+                width = self.width_var.get().strip()
+                height = self.height_var.get().strip()
+                if width.isdigit() and height.isdigit():
+                    app_config.set("window_size", f"{width}x{height}")
+                
+                # 保存行为设置
+                app_config.set("auto_save", self.auto_save_var.get())
+                app_config.set("show_completed", self.show_completed_var.get())
+                app_config.set("show_statistics", self.show_statistics_var.get())
+                app_config.set("confirm_delete", self.confirm_delete_var.get())
+                app_config.set("list_renderer", "canvas" if self.canvas_renderer_var.get() else "widget")
+                
+                # 保存语言设置
+                selected_lang = self.language_var.get()
+                if selected_lang in self.LANGUAGE_OPTIONS:
+                    app_config.set("language", self.LANGUAGE_OPTIONS[selected_lang])
+                
+                # 保存优先级颜色
+                app_config.set("priority_colors", dict(self.priority_colors))
             
             # 通知父窗口设置已更改
             if self.callback:
                 self.callback()
             
             messagebox.showinfo("设置已保存", "设置已成功保存")
-            
+        
         except Exception as e:
             messagebox.showerror("保存失败", f"保存设置时发生错误: {str(e)}")
     
     def ok(self):
         """确定按钮处理"""
         self.apply_settings()
-        self.destroy()
+        self.hide()
     
     def cancel(self):
         """取消按钮处理"""
         # 恢复原始主题
         original_theme = self.original_config.get("theme", "dark")
         ctk.set_appearance_mode(original_theme)
-        self.destroy()
+        self.hide()
     
     def open_url(self, url):
         """打开网页链接"""
@@ -18,11 +18,17 @@ class SettingsManager:
             "window_size": self._validate_window_size,
             "font_size": self._validate_font_size,
             "language": self._validate_language,
+            "list_renderer": self._validate_list_renderer,
             "priority_colors": self._validate_priority_colors,
             "auto_save": self._validate_boolean,
             "show_completed": self._validate_boolean,
             "show_statistics": self._validate_boolean,
             "confirm_delete": self._validate_boolean,
+            "snapshot_enabled": self._validate_boolean,
+            "snapshot_interval_minutes": self._validate_positive_int,
+            "snapshot_keep": self._validate_positive_int,
+            "api_enabled": self._validate_boolean,
+            "api_address": self._validate_api_address,
         }
     
     def validate_setting(self, key: str, value: Any) -> Tuple[bool, str]:
@@ -64,8 +70,9 @@ class SettingsManager:
         
         # 应用设置
         try:
-            for key, value in settings.items():
-                app_config.set(key, value)
+            with app_config.batch():
+                for key, value in settings.items():
+                    app_config.set(key, value)
             return True, []
         except Exception as e:
             return False, [f"应用设置时发生错误: {str(e)}"]
@@ -113,7 +120,7 @@ class SettingsManager:
                 return False, error_msg, None
             
             return True, "设置文件验证通过", settings
-            
+        
         except json.JSONDecodeError:
             return False, "无效的JSON文件格式", None
         except FileNotFoundError:
@@ -128,8 +135,7 @@ class SettingsManager:
             tuple: (success, message)
         """
         try:
-            app_config.config = app_config.default_config.copy()
-            app_config.save_config()
+            app_config.replace(app_config.default_config)
             return True, "所有设置已重置为默认值"
         except Exception as e:
             return False, f"重置设置失败: {str(e)}"
@@ -166,6 +172,13 @@ class SettingsManager:
                 "choices": ["zh-cn", "en", "zh-tw"],
                 "default": "zh-cn"
             },
+            "list_renderer": {
+                "name": "列表渲染方式",
+                "description": "任务列表使用独立控件还是单画布绘制",
+                "type": "choice",
+                "choices": ["widget", "canvas"],
+                "default": "widget"
+            },
             "priority_colors": {
                 "name": "优先级颜色",
                 "description": "不同优先级任务的颜色配置",
@@ -240,6 +253,16 @@ class SettingsManager:
         
         return True, ""
     
+    def _validate_positive_int(self, value: Any) -> Tuple[bool, str]:
+        """验证正整数设置（快照间隔、保留数量）"""
+        if not isinstance(value, int) or isinstance(value, bool):
+            return False, "必须是整数"
+        
+        if value < 1:
+            return False, "必须大于等于 1"
+        
+        return True, ""
+    
     def _validate_language(self, value: Any) -> Tuple[bool, str]:
         """验证语言设置"""
         valid_languages = ["zh-cn", "en", "zh-tw"]
@@ -247,6 +270,24 @@ class SettingsManager:
             return False, f"语言必须是以下值之一: {', '.join(valid_languages)}"
         return True, ""
     
+    def _validate_list_renderer(self, value: Any) -> Tuple[bool, str]:
+        """验证列表渲染方式设置"""
+        valid_renderers = ["widget", "canvas"]
+        if value not in valid_renderers:
+            return False, f"列表渲染方式必须是以下值之一: {', '.join(valid_renderers)}"
+        return True, ""
+    
+    def _validate_api_address(self, value: Any) -> Tuple[bool, str]:
+        """验证 API 监听地址"""
+        if not isinstance(value, str):
+            return False, "监听地址必须是字符串"
+        from api_server import parse_address
+        try:
+            parse_address(value)
+        except ValueError as e:
+            return False, str(e)
+        return True, ""
+    
     def _validate_priority_colors(self, value: Any) -> Tuple[bool, str]:
         """验证优先级颜色设置"""
         if not isinstance(value, dict):
@@ -4,25 +4,79 @@
 """
 import json
 import os
-from typing import Dict, Any, List, Tuple
+import tempfile
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
 from config import app_config
 
 class SettingsBackup:
-    """设置备份管理器"""
+    """设置备份管理器
     
-    def __init__(self):
-        self.backup_dir = Path(app_config.config_dir) / "backups"
+    所有备份的元数据保存在 backups/manifest.json 中，
+    列出备份时只需读取这一个小文件，而不必逐个解析备份文件。
+    """
+    
+    MANIFEST_NAME = "manifest.json"
+    
+    def __init__(self, backup_dir: Optional[Path] = None):
+        self.backup_dir = Path(backup_dir) if backup_dir else Path(app_config.config_dir) / "backups"
         self.backup_dir.mkdir(exist_ok=True)
+        self.manifest_file = self.backup_dir / self.MANIFEST_NAME
         self.max_backups = 10  # 最多保留10个备份
     
+    def _load_manifest(self) -> List[Dict[str, Any]]:
+        """读取备份清单（按创建顺序），清单缺失或损坏时从备份文件重建"""
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            if isinstance(entries, list):
+                return entries
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"读取备份清单失败，将重建: {e}")
+        
+        entries = self._rebuild_manifest()
+        self._save_manifest(entries)
+        return entries
+    
+    def _rebuild_manifest(self) -> List[Dict[str, Any]]:
+        """扫描备份文件重建清单（仅在迁移或清单损坏时使用）"""
+        entries = []
+        for backup_file in self.backup_dir.glob("settings_backup_*.json"):
+            try:
+                with open(backup_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                entries.append({
+                    "filename": backup_file.name,
+                    "timestamp": data.get("timestamp", "未知"),
+                    "description": data.get("description", "无描述"),
+                    "app_version": data.get("app_version", "未知"),
+                    "size": backup_file.stat().st_size
+                })
+            except Exception:
+                continue
+        entries.sort(key=lambda x: (x["timestamp"], x["filename"]))
+        return entries
+    
+    def _save_manifest(self, entries: List[Dict[str, Any]]):
+        """原子写入备份清单"""
+        fd, temp_path = tempfile.mkstemp(dir=self.backup_dir, prefix=".manifest_", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.manifest_file)
+        except Exception:
+            os.unlink(temp_path)
+            raise
+    
     def create_backup(self, description: str = "") -> Tuple[bool, str]:
         """创建设置备份
         
         Args:
             description: 备份描述
-            
+        
         Returns:
             tuple: (success, message)
         """
@@ -31,6 +85,13 @@ class SettingsBackup:
             backup_filename = f"settings_backup_{timestamp}.json"
             backup_path = self.backup_dir / backup_filename
             
+            # 同一秒内的多次备份使用序号区分
+            counter = 1
+            while backup_path.exists():
+                backup_filename = f"settings_backup_{timestamp}_{counter}.json"
+                backup_path = self.backup_dir / backup_filename
+                counter += 1
+            
             backup_data = {
                 "timestamp": timestamp,
                 "description": description or "手动备份",
@@ -41,38 +102,33 @@ class SettingsBackup:
             with open(backup_path, 'w', encoding='utf-8') as f:
                 json.dump(backup_data, f, ensure_ascii=False, indent=2)
             
-            # 清理旧备份
-            self._cleanup_old_backups()
+            # 更新清单并清理旧备份
+            entries = self._load_manifest()
+            entries = [entry for entry in entries if entry["filename"] != backup_filename]
+            entries.append({
+                "filename": backup_filename,
+                "timestamp": timestamp,
+                "description": backup_data["description"],
+                "app_version": backup_data["app_version"],
+                "size": backup_path.stat().st_size
+            })
+            entries = self._cleanup_old_backups(entries)
+            self._save_manifest(entries)
             
             return True, f"备份已创建: {backup_filename}"
-            
+        
         except Exception as e:
             return False, f"创建备份失败: {str(e)}"
     
     def list_backups(self) -> List[Dict[str, Any]]:
-        """列出所有备份"""
+        """列出所有备份（最新的在前，只读取清单文件）"""
         backups = []
         
         try:
-            for backup_file in self.backup_dir.glob("settings_backup_*.json"):
-                try:
-                    with open(backup_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                    
-                    backups.append({
-                        "filename": backup_file.name,
-                        "path": str(backup_file),
-                        "timestamp": data.get("timestamp", "未知"),
-                        "description": data.get("description", "无描述"),
-                        "app_version": data.get("app_version", "未知"),
-                        "size": backup_file.stat().st_size
-                    })
-                except Exception:
-                    continue
-            
-            # 按时间戳排序
-            backups.sort(key=lambda x: x["timestamp"], reverse=True)
-            
+            for entry in reversed(self._load_manifest()):
+                backup = dict(entry)
+                backup["path"] = str(self.backup_dir / entry["filename"])
+                backups.append(backup)
         except Exception:
             pass
         
@@ -83,7 +139,7 @@ class SettingsBackup:
         
         Args:
             backup_path: 备份文件路径
-            
+        
         Returns:
             tuple: (success, message)
         """
@@ -98,11 +154,10 @@ class SettingsBackup:
             self.create_backup("恢复前自动备份")
             
             # 恢复设置
-            app_config.config = backup_data["settings"]
-            app_config.save_config()
+            app_config.replace(backup_data["settings"])
             
             return True, "设置已从备份恢复"
-            
+        
         except Exception as e:
             return False, f"恢复备份失败: {str(e)}"
     
@@ -111,27 +166,39 @@ class SettingsBackup:
         
         Args:
             backup_path: 备份文件路径
-            
+        
         Returns:
             tuple: (success, message)
         """
         try:
-            Path(backup_path).unlink()
+            path = Path(backup_path)
+            path.unlink()
+            
+            entries = self._load_manifest()
+            self._save_manifest([entry for entry in entries if entry["filename"] != path.name])
             return True, "备份已删除"
         except Exception as e:
             return False, f"删除备份失败: {str(e)}"
     
-    def _cleanup_old_backups(self):
-        """清理旧备份"""
-        try:
-            backups = list(self.backup_dir.glob("settings_backup_*.json"))
-            if len(backups) > self.max_backups:
-                # 按修改时间排序，删除最旧的
-                backups.sort(key=lambda x: x.stat().st_mtime)
-                for old_backup in backups[:-self.max_backups]:
-                    old_backup.unlink()
-        except Exception:
-            pass
+    def _cleanup_old_backups(self, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """清理超出保留数量的旧备份，返回保留的清单项
+        
+        删除失败的备份仍留在清单中，下次清理时重试，避免文件脱离清单后无人管理。
+        """
+        if len(entries) <= self.max_backups:
+            return entries
+        
+        # 清单按创建顺序排列，删除最旧的
+        kept = []
+        for old_entry in entries[:-self.max_backups]:
+            try:
+                (self.backup_dir / old_entry["filename"]).unlink()
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f"删除旧备份失败: {e}")
+                kept.append(old_entry)
+        return kept + entries[-self.max_backups:]
 
 class SettingsPresets:
     """设置预设管理器"""
@@ -198,7 +265,7 @@ class SettingsPresets:
         
         Args:
             name: 预设名称
-            
+        
         Returns:
             tuple: (success, message)
         """
@@ -208,12 +275,13 @@ class SettingsPresets:
         try:
             preset_settings = self.presets[name]
             
-            # 应用预设设置
-            for key, value in preset_settings.items():
-                app_config.set(key, value)
+            # 应用预设设置（一次写入）
+            with app_config.batch():
+                for key, value in preset_settings.items():
+                    app_config.set(key, value)
             
             return True, f"已应用预设: {name}"
-            
+        
         except Exception as e:
             return False, f"应用预设失败: {str(e)}"
 
@@ -268,7 +336,7 @@ class SettingsValidator:
             app_config.save_config()
             
             return True, "配置已修复"
-            
+        
         except Exception as e:
             return False, f"修复配置失败: {str(e)}"
 
@@ -0,0 +1,190 @@
+"""
+单实例 - Todo App v0.3.1
+第一个实例监听 Unix 域套接字，之后的启动把参数转发给它后立即退出。
+本模块只依赖标准库和配置，不导入 Tk / customtkinter
+"""
+import hashlib
+import json
+import os
+import queue
+import socket
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional
+from config import app_config
+from local_socket import check_socket_file, private_dir, remove_stale_socket
+
+CONNECT_TIMEOUT = 0.5  # 秒
+MAX_SOCKET_PATH = 100  # Unix 套接字路径长度有限（约 104 字节）
+
+def socket_path() -> str:
+    """当前用户、当前数据目录对应的套接字路径
+    
+    放在只有当前用户可访问的目录中，避免其他用户抢先创建同名套接字：
+    优先使用 $XDG_RUNTIME_DIR，否则使用数据目录下的 .run 目录；
+    数据目录路径太长时改用临时目录下按用户区分的私有目录。
+    文件名中的数据目录哈希用来区分不同的 TODO_APP_HOME。
+    
+    Raises:
+        OSError: 私有目录被其他用户占用
+    """
+    digest = hashlib.sha1(str(app_config.config_dir.resolve()).encode("utf-8")).hexdigest()[:12]
+    name = f"todo-app-{digest}.sock"
+    
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, name)
+    
+    directory = os.path.join(str(app_config.config_dir), ".run")
+    if len(os.path.join(directory, name).encode("utf-8")) > MAX_SOCKET_PATH:
+        user = os.getuid() if hasattr(os, "getuid") else os.environ.get("USERNAME", "user")
+        directory = os.path.join(tempfile.gettempdir(), f"todo-app-{user}")
+    return os.path.join(private_dir(directory), name)
+
+def is_supported() -> bool:
+    """当前平台是否支持 Unix 域套接字"""
+    return hasattr(socket, "AF_UNIX")
+
+def parse_launch_args(argv: List[str]) -> List[Dict[str, Any]]:
+    """把命令行参数转换为消息列表
+    
+    支持:
+        --add "标题"   添加任务（可重复）
+        无参数         激活已有窗口
+    """
+    messages = []
+    index = 0
+    while index < len(argv):
+        if argv[index] == "--add" and index + 1 < len(argv):
+            messages.append({"action": "add", "title": argv[index + 1]})
+            index += 2
+        else:
+            index += 1
+    messages.append({"action": "raise"})
+    return messages
+
+def forward(messages: List[Dict[str, Any]], path: Optional[str] = None) -> bool:
+    """把消息发给正在运行的实例，成功返回 True"""
+    if not is_supported():
+        return False
+    
+    path = path or socket_path()
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(CONNECT_TIMEOUT)
+    try:
+        # 只连接当前用户的套接字，不把消息发给别人创建的同名文件
+        if not check_socket_file(path):
+            return False
+        client.connect(path)
+        client.sendall(json.dumps({"messages": messages}, ensure_ascii=False).encode("utf-8") + b"\n")
+        reply = client.makefile("rb").readline()
+        return json.loads(reply or b"{}").get("ok", False)
+    except (OSError, ValueError):
+        return False
+    finally:
+        client.close()
+
+class InstanceServer:
+    """第一个实例的监听端
+    
+    后台线程接收消息放入队列，由 Tk 主线程通过 poll() 取出处理。
+    """
+    
+    def __init__(self, path: Optional[str] = None):
+        self.path = socket_path() if path is None else path
+        self.messages: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        self._server: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self) -> bool:
+        """开始监听，失败（例如另一个实例刚刚抢先启动）时返回 False"""
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            # 之前的实例异常退出会留下无人监听的套接字文件；不是自己的套接字时不删除
+            remove_stale_socket(self.path)
+            server.bind(self.path)
+            os.chmod(self.path, 0o600)
+            server.listen(8)
+        except OSError as e:
+            print(f"单实例监听失败: {e}")
+            server.close()
+            return False
+        
+        self._server = server
+        self._thread = threading.Thread(target=self._serve, args=(server,), name="InstanceServer", daemon=True)
+        self._thread.start()
+        return True
+    
+    def _serve(self, server: socket.socket):
+        """接收连接"""
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return  # 已关闭
+            with conn:
+                try:
+                    conn.settimeout(CONNECT_TIMEOUT)
+                    line = conn.makefile("rb").readline()
+                    if not line:
+                        continue  # 检查残留套接字时的探测连接
+                    request = json.loads(line)
+                    for message in request.get("messages", []):
+                        self.messages.put(message)
+                    conn.sendall(b'{"ok": true}\n')
+                except (OSError, ValueError) as e:
+                    print(f"处理转发消息失败: {e}")
+    
+    def poll(self) -> List[Dict[str, Any]]:
+        """取出所有待处理的消息（非阻塞）"""
+        messages = []
+        while True:
+            try:
+                messages.append(self.messages.get_nowait())
+            except queue.Empty:
+                return messages
+    
+    def close(self):
+        """停止监听并删除套接字文件"""
+        if self._server is None:
+            return
+        try:
+            # 先 shutdown 以唤醒阻塞在 accept() 上的后台线程
+            self._server.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._server.close()
+        self._server = None
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+def acquire(messages: List[Dict[str, Any]]) -> Optional[InstanceServer]:
+    """启动时调用
+    
+    Returns:
+        None: 已转发给正在运行的实例，当前进程应退出
+        InstanceServer: 当前进程是第一个实例（消息已放入队列）
+    
+    平台不支持 Unix 套接字或套接字目录不可用时返回未监听的 InstanceServer，程序照常启动。
+    """
+    path = ""
+    if is_supported():
+        try:
+            path = socket_path()
+        except OSError as e:
+            print(f"单实例不可用: {e}")
+    server = InstanceServer(path)
+    if path:
+        if forward(messages, server.path):
+            return None
+        if not server.start() and forward(messages, server.path):
+            # 两个实例同时启动，另一个抢先完成了监听
+            return None
+    
+    # 第一个实例只需处理添加等操作，窗口本来就会显示
+    for message in messages:
+        if message["action"] != "raise":
+            server.messages.put(message)
+    return server
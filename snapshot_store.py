@@ -0,0 +1,266 @@
+"""
+快照备份 - Todo App v0.3.1
+基于内容寻址块存储的任务与设置快照，相同内容只保存一次
+"""
+import hashlib
+import json
+import os
+import tempfile
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from config import app_config, replacement_file_mode
+
+class SnapshotStore:
+    """内容寻址快照存储
+    
+    目录结构:
+        objects/ab/abcdef...      zlib 压缩的数据块，以内容的 SHA-256 命名
+        manifests/<快照ID>.json   每个快照的清单：文件名 -> 有序的数据块列表
+    
+    文件按行切块，切点由行内容的哈希决定（内容定义切块），
+    因此在大任务列表中间插入或修改少量任务只会产生少数新块，
+    未变化的部分直接引用已有的块。
+    """
+    
+    MIN_CHUNK_SIZE = 2 * 1024
+    MAX_CHUNK_SIZE = 64 * 1024
+    BOUNDARY_MASK = 0xFF  # 平均约每 256 行切一次
+    
+    def __init__(self, root: Optional[Path] = None, files: Optional[Dict[str, Path]] = None):
+        self.root = Path(root) if root else Path(app_config.config_dir) / "backups" / "snapshots"
+        self.objects_dir = self.root / "objects"
+        self.manifests_dir = self.root / "manifests"
+        # 快照包含的文件: 名称 -> 路径
+        self.files = files if files is not None else {
+            "tasks.json": app_config.tasks_file,
+            "config.json": app_config.config_file,
+        }
+    
+    @classmethod
+    def chunk_data(cls, data: bytes) -> Iterator[bytes]:
+        """按内容定义的行边界切分数据"""
+        chunk: List[bytes] = []
+        size = 0
+        for line in data.splitlines(keepends=True):
+            # 超长的单行（如压缩过的 JSON）按固定大小切分
+            while len(line) > cls.MAX_CHUNK_SIZE:
+                if chunk:
+                    yield b"".join(chunk)
+                    chunk, size = [], 0
+                yield line[:cls.MAX_CHUNK_SIZE]
+                line = line[cls.MAX_CHUNK_SIZE:]
+            
+            chunk.append(line)
+            size += len(line)
+            if size >= cls.MAX_CHUNK_SIZE or (
+                size >= cls.MIN_CHUNK_SIZE and zlib.crc32(line) & cls.BOUNDARY_MASK == 0
+            ):
+                yield b"".join(chunk)
+                chunk, size = [], 0
+        
+        if chunk:
+            yield b"".join(chunk)
+    
+    def _object_path(self, digest: str) -> Path:
+        """数据块路径"""
+        return self.objects_dir / digest[:2] / digest
+    
+    def _write_chunk(self, chunk: bytes) -> Tuple[str, int]:
+        """写入数据块，返回 (摘要, 新写入的字节数)"""
+        digest = hashlib.sha256(chunk).hexdigest()
+        path = self._object_path(digest)
+        if path.exists():
+            return digest, 0
+        
+        path.parent.mkdir(parents=True, exist_ok=True)
+        compressed = zlib.compress(chunk)
+        self._atomic_write(path, compressed)
+        return digest, len(compressed)
+    
+    def _read_chunk(self, digest: str) -> bytes:
+        """读取并校验数据块"""
+        with open(self._object_path(digest), 'rb') as f:
+            chunk = zlib.decompress(f.read())
+        if hashlib.sha256(chunk).hexdigest() != digest:
+            raise ValueError(f"数据块校验失败: {digest}")
+        return chunk
+    
+    @staticmethod
+    def _atomic_write(path: Path, data: bytes):
+        """先写临时文件再替换（沿用原文件权限，恢复的文件不会变成 0600）"""
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp_")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.chmod(temp_path, replacement_file_mode(path))
+            os.replace(temp_path, path)
+        except Exception:
+            os.unlink(temp_path)
+            raise
+    
+    def _latest_manifest(self) -> Optional[Dict[str, Any]]:
+        """最近一个快照的清单"""
+        if not self.manifests_dir.exists():
+            return None
+        # 快照ID按时间命名，文件名最大的即最新
+        manifest_files = list(self.manifests_dir.glob("*.json"))
+        if not manifest_files:
+            return None
+        return self._load_manifest(max(manifest_files).stem)
+    
+    def _load_manifest(self, snapshot_id: str) -> Dict[str, Any]:
+        """读取快照清单"""
+        with open(self.manifests_dir / f"{snapshot_id}.json", 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def create_snapshot(self, description: str = "") -> Tuple[bool, str]:
+        """创建快照
+        
+        Returns:
+            tuple: (success, message)
+        """
+        try:
+            self.manifests_dir.mkdir(parents=True, exist_ok=True)
+            self.objects_dir.mkdir(parents=True, exist_ok=True)
+            
+            previous = self._latest_manifest()
+            previous_files = previous["files"] if previous else {}
+            
+            now = datetime.now()
+            snapshot_id = now.strftime("%Y%m%d_%H%M%S_%f")
+            manifest = {
+                "id": snapshot_id,
+                "timestamp": now.isoformat(),
+                "description": description or "自动快照",
+                "app_version": app_config.version,
+                "files": {},
+                "new_bytes": 0
+            }
+            
+            for name, path in self.files.items():
+                path = Path(path)
+                if not path.exists():
+                    continue
+                
+                data = path.read_bytes()
+                file_hash = hashlib.sha256(data).hexdigest()
+                
+                # 文件未变化时直接复用上一个快照的块列表
+                previous_entry = previous_files.get(name)
+                if previous_entry and previous_entry["sha256"] == file_hash:
+                    chunks = previous_entry["chunks"]
+                else:
+                    chunks = []
+                    for chunk in self.chunk_data(data):
+                        digest, written = self._write_chunk(chunk)
+                        chunks.append(digest)
+                        manifest["new_bytes"] += written
+                
+                manifest["files"][name] = {
+                    "size": len(data),
+                    "sha256": file_hash,
+                    "chunks": chunks
+                }
+            
+            self._atomic_write(
+                self.manifests_dir / f"{snapshot_id}.json",
+                json.dumps(manifest, ensure_ascii=False).encode("utf-8")
+            )
+            return True, f"快照已创建: {snapshot_id}（新增 {manifest['new_bytes']} 字节）"
+        
+        except Exception as e:
+            return False, f"创建快照失败: {str(e)}"
+    
+    def list_snapshots(self) -> List[Dict[str, Any]]:
+        """列出所有快照（最新的在前）"""
+        snapshots = []
+        if not self.manifests_dir.exists():
+            return snapshots
+        
+        for manifest_file in self.manifests_dir.glob("*.json"):
+            try:
+                with open(manifest_file, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+                snapshots.append({
+                    "id": manifest["id"],
+                    "timestamp": manifest["timestamp"],
+                    "description": manifest.get("description", ""),
+                    "files": {name: entry["size"] for name, entry in manifest["files"].items()},
+                    "new_bytes": manifest.get("new_bytes", 0)
+                })
+            except Exception:
+                continue
+        
+        snapshots.sort(key=lambda x: x["id"], reverse=True)
+        return snapshots
+    
+    def restore_snapshot(self, snapshot_id: str, target_dir: Optional[Path] = None) -> Tuple[bool, str]:
+        """从快照重建文件
+        
+        Args:
+            snapshot_id: 快照ID
+            target_dir: 输出目录，为空时覆盖原文件
+        
+        Returns:
+            tuple: (success, message)
+        """
+        try:
+            manifest = self._load_manifest(snapshot_id)
+            
+            # 先在内存中重建并校验所有文件，全部成功后再写出
+            restored = {}
+            for name, entry in manifest["files"].items():
+                data = b"".join(self._read_chunk(digest) for digest in entry["chunks"])
+                if hashlib.sha256(data).hexdigest() != entry["sha256"]:
+                    return False, f"文件 {name} 校验失败"
+                restored[name] = data
+            
+            for name, data in restored.items():
+                if target_dir:
+                    path = Path(target_dir) / name
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                else:
+                    path = Path(self.files.get(name, Path(app_config.config_dir) / name))
+                self._atomic_write(path, data)
+            
+            return True, f"已从快照 {snapshot_id} 恢复 {len(restored)} 个文件"
+        
+        except FileNotFoundError:
+            return False, f"快照不存在或数据块缺失: {snapshot_id}"
+        except Exception as e:
+            return False, f"恢复快照失败: {str(e)}"
+    
+    def delete_snapshot(self, snapshot_id: str) -> Tuple[bool, str]:
+        """删除快照清单（数据块由 collect_garbage 回收）"""
+        try:
+            (self.manifests_dir / f"{snapshot_id}.json").unlink()
+            return True, "快照已删除"
+        except Exception as e:
+            return False, f"删除快照失败: {str(e)}"
+    
+    def prune(self, keep: int) -> int:
+        """只保留最新的 keep 个快照，返回回收的数据块数量"""
+        for snapshot in self.list_snapshots()[keep:]:
+            self.delete_snapshot(snapshot["id"])
+        return self.collect_garbage()
+    
+    def collect_garbage(self) -> int:
+        """删除不再被任何快照引用的数据块"""
+        referenced = set()
+        for snapshot in self.list_snapshots():
+            manifest = self._load_manifest(snapshot["id"])
+            for entry in manifest["files"].values():
+                referenced.update(entry["chunks"])
+        
+        removed = 0
+        if self.objects_dir.exists():
+            for object_file in self.objects_dir.glob("*/*"):
+                if object_file.name not in referenced:
+                    object_file.unlink()
+                    removed += 1
+        return removed
+
+# 全局快照存储实例
+snapshot_store = SnapshotStore()
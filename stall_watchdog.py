@@ -0,0 +1,130 @@
+"""
+卡顿检测 - Todo App v0.3.1
+后台线程监视 Tk 主循环的心跳，主线程被阻塞超过阈值时记录当时的调用栈
+"""
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from config import app_config
+
+class StallWatchdog:
+    """主循环卡顿检测器
+    
+    主线程通过 after() 定时调用 heartbeat() 更新心跳时间；
+    监视线程发现心跳超时（间隔 + 阈值）时立即抓取主线程调用栈，
+    等下一次心跳到来、卡顿结束后再记录实际持续时间。
+    """
+    
+    def __init__(self, root=None, threshold: float = 0.1, interval: float = 0.05,
+                 log_path: Optional[Path] = None, history: int = 50):
+        self.root = root
+        self.threshold = threshold
+        self.interval = interval
+        self.log_path = Path(log_path) if log_path else Path(app_config.config_dir) / "stalls.log"
+        # 最近的卡顿记录（供性能面板显示）
+        self.stalls = deque(maxlen=history)
+        self.stall_count = 0
+        
+        self._main_thread_id = threading.get_ident()
+        self._beat_time = time.perf_counter()
+        self._beat_seq = 0
+        self._after_id = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def heartbeat(self):
+        """主线程心跳（必须在主线程中调用）"""
+        self._beat_time = time.perf_counter()
+        self._beat_seq += 1
+    
+    def _tick(self):
+        """after() 回调：心跳并安排下一次"""
+        self.heartbeat()
+        self._after_id = self.root.after(int(self.interval * 1000), self._tick)
+    
+    def start(self):
+        """启动检测（在主线程中调用）"""
+        if self._thread is not None:
+            return
+        self._main_thread_id = threading.get_ident()
+        self.heartbeat()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._watch, name="StallWatchdog", daemon=True)
+        self._thread.start()
+        if self.root is not None:
+            self._tick()
+    
+    def stop(self):
+        """停止检测"""
+        self._stop_event.set()
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+    
+    def _capture_stack(self) -> List[str]:
+        """抓取主线程当前调用栈"""
+        frame = sys._current_frames().get(self._main_thread_id)
+        if frame is None:
+            return []
+        return traceback.format_stack(frame)
+    
+    def _watch(self):
+        """监视线程主循环"""
+        pending = None  # (心跳序号, 调用栈, 心跳时间)
+        poll = min(self.interval, self.threshold) / 2
+        
+        while not self._stop_event.wait(poll):
+            beat_seq, beat_time = self._beat_seq, self._beat_time
+            
+            if pending is not None and beat_seq != pending[0]:
+                # 卡顿已结束，心跳间隔减去正常间隔即阻塞时间
+                self._record(beat_time - pending[2] - self.interval, pending[1])
+                pending = None
+            
+            if pending is None and time.perf_counter() - beat_time > self.interval + self.threshold:
+                pending = (beat_seq, self._capture_stack(), beat_time)
+    
+    def _record(self, duration: float, stack: List[str]):
+        """记录一次卡顿"""
+        record = {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "duration_ms": duration * 1000,
+            "stack": stack
+        }
+        self.stalls.append(record)
+        self.stall_count += 1
+        
+        print(f"⚠️ 界面卡顿 {record['duration_ms']:.0f} ms，位置: {stack[-1].strip() if stack else '未知'}")
+        try:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(f"[{record['time']}] 主循环阻塞 {record['duration_ms']:.0f} ms\n")
+                f.writelines(stack)
+                f.write("\n")
+        except Exception as e:
+            print(f"写入卡顿日志失败: {e}")
+    
+    def recent_stalls(self) -> List[Dict[str, Any]]:
+        """最近的卡顿记录（最新的在前）"""
+        return list(reversed(self.stalls))
+
+def threshold_from_env() -> Optional[float]:
+    """读取启动时的检测设置（TODO_APP_WATCHDOG=1 启用，TODO_APP_STALL_MS 指定阈值，默认 100 ms）"""
+    if os.environ.get("TODO_APP_WATCHDOG") != "1":
+        return None
+    try:
+        return float(os.environ.get("TODO_APP_STALL_MS", "100")) / 1000
+    except ValueError:
+        return 0.1
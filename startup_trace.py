@@ -0,0 +1,93 @@
+"""
+启动追踪 - Todo App v0.3.1
+记录冷启动各阶段（导入、配置加载、任务加载、窗口构建、首次绘制）的耗时
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+# 尽早记录起点：程序入口最先导入本模块
+_ORIGIN = time.perf_counter()
+
+class StartupTracer:
+    """启动阶段追踪器
+    
+    用法:
+        with startup_tracer.phase("imports"):
+            from main_app import main
+        startup_tracer.mark("first_paint")
+    
+    阶段记录开始时间和耗时，标记只记录时间点（均相对于起点，单位秒）。
+    """
+    
+    def __init__(self, origin: Optional[float] = None):
+        self.origin = origin if origin is not None else time.perf_counter()
+        self.phases: List[Dict[str, Any]] = []
+        self.marks: Dict[str, float] = {}
+        self.finished = False
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def phase(self, name: str):
+        """记录一个阶段（可在后台线程中使用）"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                self.phases.append({
+                    "name": name,
+                    "start": start - self.origin,
+                    "duration": end - start
+                })
+    
+    def mark(self, name: str):
+        """记录一个时间点（只记录第一次）"""
+        with self._lock:
+            self.marks.setdefault(name, time.perf_counter() - self.origin)
+    
+    def has_marks(self, *names: str) -> bool:
+        """是否已记录全部指定的时间点"""
+        return all(name in self.marks for name in names)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典（时间单位: 毫秒）"""
+        with self._lock:
+            return {
+                "phases": [
+                    {"name": p["name"], "start_ms": p["start"] * 1000, "duration_ms": p["duration"] * 1000}
+                    for p in sorted(self.phases, key=lambda p: p["start"])
+                ],
+                "marks_ms": {name: value * 1000 for name, value in sorted(self.marks.items(), key=lambda x: x[1])}
+            }
+    
+    def report(self) -> str:
+        """生成可读的报告"""
+        data = self.to_dict()
+        lines = ["启动耗时:"]
+        for p in data["phases"]:
+            lines.append(f"  {p['name']:<16} {p['duration_ms']:8.1f} ms  (开始于 {p['start_ms']:.1f} ms)")
+        for name, value in data["marks_ms"].items():
+            lines.append(f"  @{name:<15} {value:8.1f} ms")
+        return "\n".join(lines)
+    
+    def finish(self, path=None):
+        """启动完成：输出报告（只执行一次）"""
+        if self.finished:
+            return
+        self.finished = True
+        print(self.report())
+        if path is not None:
+            try:
+                with open(path, 'w', encoding='utf-8') as f:
+                    json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+            except Exception as e:
+                print(f"导出启动耗时失败: {e}")
+
+# 全局启动追踪器（设置环境变量 TODO_APP_STARTUP_TRACE=1 时在启动完成后输出报告）
+startup_tracer = StartupTracer(origin=_ORIGIN)
+trace_enabled = os.environ.get("TODO_APP_STARTUP_TRACE") == "1"
@@ -0,0 +1,99 @@
+"""
+任务日志 - Todo App v0.3.1
+追加写入的 NDJSON 日志（tasks.journal），快速记录新任务而不读取整个 tasks.json，
+由运行中的界面或下次启动时合并进任务数据库
+"""
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+class TaskJournal:
+    """追加写入的任务日志
+    
+    写入: 每条记录一行 JSON，以追加方式写入，耗时与任务总数无关。
+    合并: 先把日志原子地改名为 .merging 再读取，合并期间的新记录写入新的日志文件；
+          任务文件保存成功后调用 commit() 删除 .merging。
+          若合并中途退出，下次 take() 会先读取遗留的 .merging（重复的任务 ID 由调用方跳过）。
+    
+    支持 fcntl 的平台上用文件锁保证改名瞬间正在写入的记录不会丢失。
+    """
+    
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.merging_path = self.path.with_name(self.path.name + ".merging")
+    
+    @staticmethod
+    def _lock(f):
+        """对文件加排他锁（无 fcntl 时忽略）"""
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    
+    def append(self, record: Dict[str, Any]):
+        """追加一条记录"""
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        while True:
+            with open(self.path, 'a+b') as f:
+                self._lock(f)
+                # 加锁期间日志可能已被改名合并，此时重新打开新的日志文件
+                try:
+                    current = os.stat(self.path)
+                except FileNotFoundError:
+                    continue
+                if fcntl is not None and not os.path.samestat(current, os.fstat(f.fileno())):
+                    continue
+                # 写入者异常退出留下的半行没有换行符，先补上，避免新记录接在同一行而一起被丢弃
+                if current.st_size > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        f.write(b"\n")
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+                return
+    
+    def has_pending(self) -> bool:
+        """是否有待合并的记录（只检查文件，不读取内容）"""
+        for path in (self.merging_path, self.path):
+            try:
+                if path.stat().st_size > 0:
+                    return True
+            except OSError:
+                pass
+        return False
+    
+    def take(self) -> List[Dict[str, Any]]:
+        """取出所有待合并的记录"""
+        if not self.merging_path.exists():
+            try:
+                os.replace(self.path, self.merging_path)
+            except FileNotFoundError:
+                return []
+            except OSError as e:
+                # Windows 上日志正被写入时无法改名，下次再合并
+                print(f"合并任务日志失败: {e}")
+                return []
+        
+        records = []
+        with open(self.merging_path, 'r', encoding='utf-8') as f:
+            # 等待改名前已打开日志的写入者完成
+            self._lock(f)
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    # 写入者异常退出留下的半行记录
+                    continue
+        return records
+    
+    def commit(self):
+        """合并结果已保存，删除已取出的记录"""
+        try:
+            os.unlink(self.merging_path)
+        except FileNotFoundError:
+            pass
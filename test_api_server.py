@@ -0,0 +1,298 @@
+"""
+本地 API 服务器测试 - Todo App v0.3.1
+用 http.client 作为本地客户端测试增删改查、分页、ETag 条件请求、批量操作和 keep-alive
+"""
+import unittest
+import http.client
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+import tkinter
+from pathlib import Path
+from urllib.parse import urlencode
+from database import TaskDatabase
+from models import Task
+from api_server import ApiServer, parse_address
+from async_bridge import AsyncBridge
+
+class TestParseAddress(unittest.TestCase):
+    """监听地址解析测试类"""
+    
+    def test_parse(self):
+        """测试 TCP、Unix 套接字和非本机地址"""
+        self.assertEqual(parse_address("127.0.0.1:8765"), ("tcp", ("127.0.0.1", 8765)))
+        self.assertEqual(parse_address("[::1]:9000"), ("tcp", ("::1", 9000)))
+        self.assertEqual(parse_address("unix:/tmp/todo.sock"), ("unix", "/tmp/todo.sock"))
+        for address in ("0.0.0.0:8765", "127.0.0.1", "127.0.0.1:abc", "unix:"):
+            with self.assertRaises(ValueError):
+                parse_address(address)
+
+class TestApiServer(unittest.TestCase):
+    """API 服务器测试类"""
+    
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.tasks_file = Path(self.temp_dir.name) / "tasks.json"
+        self.db = TaskDatabase(autoload=False, tasks_file=self.tasks_file)
+        self.server = ApiServer(self.db, "127.0.0.1:0")
+        success, message = self.server.start()
+        self.assertTrue(success, message)
+        self.port = int(self.server.url.rsplit(":", 1)[1])
+        self.conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=5)
+    
+    def tearDown(self):
+        """测试后清理"""
+        self.conn.close()
+        self.server.stop()
+        self.temp_dir.cleanup()
+    
+    def request(self, method: str, path: str, body=None, headers=None):
+        """发送请求，返回 (状态码, JSON 响应体, 响应头)"""
+        payload = json.dumps(body) if body is not None else None
+        headers = dict(headers or {})
+        if payload is not None:
+            headers.setdefault("Content-Type", "application/json")
+        self.conn.request(method, path, body=payload, headers=headers)
+        response = self.conn.getresponse()
+        data = response.read()
+        return response.status, json.loads(data) if data else None, response
+    
+    def test_crud(self):
+        """测试添加、读取、修改和删除任务"""
+        status, task, response = self.request("POST", "/tasks", {"title": " 写周报 ", "priority": "高", "tags": ["工作"]})
+        self.assertEqual(status, 201)
+        self.assertEqual(task["title"], "写周报")
+        self.assertEqual(response.getheader("Location"), f"/tasks/{task['id']}")
+        
+        status, fetched, _ = self.request("GET", f"/tasks/{task['id']}")
+        self.assertEqual((status, fetched), (200, task))
+        
+        status, updated, _ = self.request("PATCH", f"/tasks/{task['id']}", {"completed": True})
+        self.assertEqual(status, 200)
+        self.assertTrue(updated["completed"])
+        
+        # 修改已写入文件
+        reloaded = TaskDatabase(tasks_file=self.tasks_file)
+        self.assertTrue(reloaded.get_task_by_id(task["id"]).completed)
+        
+        status, body, _ = self.request("DELETE", f"/tasks/{task['id']}")
+        self.assertEqual((status, body), (204, None))
+        self.assertEqual(self.request("GET", f"/tasks/{task['id']}")[0], 404)
+        self.assertEqual(self.request("DELETE", f"/tasks/{task['id']}")[0], 404)
+    
+    def test_validation_and_routing(self):
+        """测试无效请求"""
+        self.assertEqual(self.request("POST", "/tasks", {"priority": "高"})[0], 400)
+        self.assertEqual(self.request("POST", "/tasks", {"title": "x", "id": "固定"})[0], 400)
+        self.assertEqual(self.request("POST", "/tasks", {"title": "x", "due_date": "明天"})[0], 400)
+        self.assertEqual(self.request("GET", "/tasks?limit=0")[0], 400)
+        self.assertEqual(self.request("GET", "/tasks?sort=unknown")[0], 400)
+        self.assertEqual(self.request("GET", "/nothing")[0], 404)
+        status, _, response = self.request("PUT", "/tasks")
+        self.assertEqual(status, 405)
+        self.assertEqual(response.getheader("Allow"), "GET, POST")
+    
+    def test_list_filter_and_pagination(self):
+        """测试筛选、排序和分页"""
+        tasks = [Task(id="", title=f"任务{i:02d}", priority="高" if i % 2 else "低", completed=i < 5) for i in range(25)]
+        self.db.add_tasks(tasks)
+        
+        status, page, _ = self.request("GET", "/tasks?completed=false&sort=title&limit=10")
+        self.assertEqual(status, 200)
+        self.assertEqual((page["total"], page["next_offset"]), (20, 10))
+        self.assertEqual([task["title"] for task in page["tasks"]], [f"任务{i:02d}" for i in range(5, 15)])
+        
+        status, last_page, _ = self.request("GET", "/tasks?completed=false&sort=title&limit=10&offset=10")
+        self.assertEqual(len(last_page["tasks"]), 10)
+        self.assertIsNone(last_page["next_offset"])
+        
+        status, page, _ = self.request("GET", "/tasks?" + urlencode({"priority": "高", "q": "任务1"}))
+        self.assertEqual(page["total"], 5)
+        
+        status, stats, _ = self.request("GET", "/stats")
+        self.assertEqual((stats["total"], stats["completed"]), (25, 5))
+    
+    def test_etag_conditional_requests(self):
+        """测试 If-None-Match 返回 304、If-Match 版本不一致返回 412"""
+        status, task, response = self.request("POST", "/tasks", {"title": "买牛奶"})
+        etag = response.getheader("ETag")
+        
+        status, body, response = self.request("GET", "/tasks", headers={"If-None-Match": etag})
+        self.assertEqual((status, body), (304, None))
+        self.assertEqual(response.getheader("ETag"), etag)
+        
+        # 其他客户端（或界面）修改后旧的 ETag 失效
+        self.db.update_task(task["id"], title="买酸奶")
+        status, _, response = self.request("GET", "/tasks", headers={"If-None-Match": etag})
+        self.assertEqual(status, 200)
+        current = response.getheader("ETag")
+        self.assertNotEqual(current, etag)
+        
+        status, _, response = self.request("PATCH", f"/tasks/{task['id']}", {"completed": True}, {"If-Match": etag})
+        self.assertEqual(status, 412)
+        self.assertEqual(response.getheader("ETag"), current)
+        self.assertFalse(self.db.get_task_by_id(task["id"]).completed)
+        
+        status, _, response = self.request("PATCH", f"/tasks/{task['id']}", {"completed": True}, {"If-Match": current})
+        self.assertEqual(status, 200)
+        self.assertNotEqual(response.getheader("ETag"), current)
+    
+    def test_batch_writes_once(self):
+        """测试批量操作逐个返回结果且只写入一次文件"""
+        existing = Task(id="", title="旧任务")
+        self.db.add_task(existing)
+        saves = []
+        original_save = self.db.save_tasks
+        self.db.save_tasks = lambda: saves.append(1) or original_save()
+        
+        status, outcome, _ = self.request("POST", "/batch", {"operations": [
+            {"op": "add", "task": {"title": "新任务一"}},
+            {"op": "add", "task": {"title": "新任务二", "priority": "低"}},
+            {"op": "update", "id": existing.id, "fields": {"completed": True}},
+            {"op": "delete", "id": "不存在"},
+        ]})
+        self.assertEqual(status, 200)
+        self.assertEqual([result["ok"] for result in outcome["results"]], [True, True, True, False])
+        self.assertEqual(len(saves), 1)
+        self.assertEqual(outcome["version"], self.db.version)
+        
+        reloaded = TaskDatabase(tasks_file=self.tasks_file)
+        self.assertEqual(len(reloaded.get_all_tasks()), 3)
+        
+        # 任何一个操作格式错误时整批拒绝
+        status, _, _ = self.request("POST", "/batch", {"operations": [
+            {"op": "add", "task": {"title": "有效"}}, {"op": "rename"}
+        ]})
+        self.assertEqual(status, 400)
+        self.assertEqual(len(self.db.get_all_tasks()), 3)
+    
+    def test_keep_alive(self):
+        """测试同一连接上的多个请求和 Connection: close"""
+        with socket.create_connection(("127.0.0.1", self.port), timeout=5) as sock:
+            stream = sock.makefile("rb")
+            for _ in range(3):
+                sock.sendall(b"GET /stats HTTP/1.1\r\nHost: localhost:%d\r\n\r\n" % self.port)
+                self.assertTrue(stream.readline().startswith(b"HTTP/1.1 200"))
+                headers = {}
+                for line in iter(stream.readline, b"\r\n"):
+                    name, _, value = line.decode().partition(":")
+                    headers[name.lower()] = value.strip()
+                self.assertEqual(headers["connection"], "keep-alive")
+                stream.read(int(headers["content-length"]))
+            
+            sock.sendall(b"GET / HTTP/1.1\r\nHost: localhost:%d\r\nConnection: close\r\n\r\n" % self.port)
+            response = stream.read()
+            self.assertIn(b"Connection: close", response)
+            self.assertTrue(response.endswith(b"}"))
+    
+    def test_rejects_cross_site_requests(self):
+        """测试拒绝网页发起的跨站简单请求、外部 Origin 和 DNS 重绑定的 Host"""
+        # 跨站 <form> 或 fetch(no-cors) 只能发送 text/plain 等简单内容类型
+        status, _, _ = self.request("POST", "/tasks", {"title": "跨站"}, {"Content-Type": "text/plain"})
+        self.assertEqual(status, 415)
+        status, _, _ = self.request("POST", "/batch", {"operations": [{"op": "add", "task": {"title": "跨站"}}]},
+                                    {"Content-Type": "text/plain", "Origin": "https://evil.example"})
+        self.assertEqual(status, 403)
+        
+        # DNS 重绑定：攻击者的域名解析到 127.0.0.1，浏览器发送的 Host 是攻击者的域名
+        status, _, _ = self.request("GET", "/tasks", headers={"Host": f"evil.example:{self.port}"})
+        self.assertEqual(status, 403)
+        status, _, _ = self.request("DELETE", "/tasks/x", headers={
+            "Host": f"evil.example:{self.port}", "Origin": f"http://evil.example:{self.port}"
+        })
+        self.assertEqual(status, 403)
+        status, _, _ = self.request("GET", "/tasks", headers={"Host": "127.0.0.1:1"})
+        self.assertEqual(status, 403)
+        self.assertEqual(self.db.get_all_tasks(), [])
+        
+        # 同源请求和本机工具正常访问
+        status, _, _ = self.request("POST", "/tasks", {"title": "本机"}, {
+            "Content-Type": "application/json; charset=utf-8", "Origin": f"http://localhost:{self.port}"
+        })
+        self.assertEqual(status, 201)
+        status, body, _ = self.request("GET", "/tasks", headers={"Host": f"localhost:{self.port}"})
+        self.assertEqual((status, body["total"]), (200, 1))
+    
+    def test_start_nowait(self):
+        """测试界面线程启动时不等待，结果在 Tk 线程回调"""
+        bridge = AsyncBridge()
+        # 不需要显示器的 Tcl 解释器即可运行 after 事件
+        root = tkinter.Tcl()
+        bridge.attach(root)
+        results = []
+        server = ApiServer(self.db, "127.0.0.1:0")
+        try:
+            server.start_nowait(bridge, lambda success, message: results.append((success, threading.current_thread())))
+            deadline = time.monotonic() + 5
+            while not results and time.monotonic() < deadline:
+                root.update()
+                time.sleep(0.01)
+            self.assertEqual(results, [(True, threading.main_thread())])
+            self.assertTrue(server.is_running)
+            
+            # 端口被占用时回调失败结果
+            results.clear()
+            ApiServer(self.db, f"127.0.0.1:{self.port}").start_nowait(bridge, lambda success, message: results.append(success))
+            deadline = time.monotonic() + 5
+            while not results and time.monotonic() < deadline:
+                root.update()
+                time.sleep(0.01)
+            self.assertEqual(results, [False])
+        finally:
+            server.stop()
+            bridge.shutdown()
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "当前平台不支持 Unix 域套接字")
+class TestApiServerUnixSocket(unittest.TestCase):
+    """Unix 套接字监听测试类"""
+    
+    def test_unix_socket(self):
+        """测试通过 Unix 套接字访问，停止后删除套接字文件"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db = TaskDatabase(autoload=False, tasks_file=Path(temp_dir) / "tasks.json")
+            path = os.path.join(temp_dir, "api.sock")
+            server = ApiServer(db, f"unix:{path}")
+            self.assertTrue(server.start()[0])
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                    sock.settimeout(5)
+                    sock.connect(path)
+                    sock.sendall(b"GET /tasks HTTP/1.1\r\nConnection: close\r\n\r\n")
+                    response = b"".join(iter(lambda: sock.recv(4096), b""))
+                self.assertTrue(response.startswith(b"HTTP/1.1 200"))
+                self.assertIn(b'"total": 0', response)
+            finally:
+                server.stop()
+            self.assertFalse(os.path.exists(path))
+    
+    def test_existing_path_is_kept(self):
+        """测试只删除无人监听的套接字文件，不删除普通文件和其他服务的套接字"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db = TaskDatabase(autoload=False, tasks_file=Path(temp_dir) / "tasks.json")
+            path = os.path.join(temp_dir, "api.sock")
+            
+            with open(path, 'w') as f:
+                f.write("不是套接字")
+            self.assertFalse(ApiServer(db, f"unix:{path}").start()[0])
+            self.assertTrue(os.path.isfile(path))
+            os.unlink(path)
+            
+            # 异常退出留下的套接字文件
+            stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            stale.bind(path)
+            stale.close()
+            server = ApiServer(db, f"unix:{path}")
+            self.assertTrue(server.start()[0])
+            try:
+                self.assertFalse(ApiServer(db, f"unix:{path}").start()[0])
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                    sock.connect(path)
+            finally:
+                server.stop()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+"""
+异步桥接测试 - Todo App v0.3.1
+测试协程提交、Tk 线程回调、定时任务和关闭时的取消
+"""
+import unittest
+import asyncio
+import threading
+import time
+import tkinter
+from async_bridge import AsyncBridge
+
+class TestAsyncBridge(unittest.TestCase):
+    """异步桥接测试类"""
+    
+    def setUp(self):
+        """测试前准备"""
+        self.bridge = AsyncBridge()
+    
+    def tearDown(self):
+        """测试后清理"""
+        self.bridge.shutdown()
+    
+    def test_submit_and_tk_callback(self):
+        """测试协程结果和在 Tk 线程执行的完成回调"""
+        # 不需要显示器的 Tcl 解释器即可运行 after 事件
+        root = tkinter.Tcl()
+        self.bridge.attach(root)
+        done = []
+        
+        async def add(a, b):
+            await asyncio.sleep(0.01)
+            return a + b
+        
+        future = self.bridge.submit(add(1, 2), on_done=lambda f: done.append((f.result(), threading.current_thread())))
+        self.assertEqual(future.result(2), 3)
+        
+        deadline = time.monotonic() + 2
+        while not done and time.monotonic() < deadline:
+            root.update()
+            time.sleep(0.01)
+        self.assertEqual(done, [(3, threading.main_thread())])
+    
+    def test_every_survives_errors_and_cancel(self):
+        """测试定时任务单次失败后继续执行，取消后停止"""
+        calls = []
+        
+        async def tick():
+            calls.append(time.monotonic())
+            if len(calls) == 2:
+                raise ValueError("模拟失败")
+        
+        future = self.bridge.every(0.01, tick)
+        deadline = time.monotonic() + 2
+        while len(calls) < 4 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertGreaterEqual(len(calls), 4)
+        
+        future.cancel()
+        time.sleep(0.05)
+        count = len(calls)
+        time.sleep(0.05)
+        self.assertEqual(len(calls), count)
+    
+    def test_shutdown_cancels_and_waits_for_blocking_calls(self):
+        """测试关闭时取消等待中的协程，并等待正在执行的阻塞调用完成"""
+        events = []
+        
+        async def waiter():
+            try:
+                await asyncio.sleep(60)
+            finally:
+                events.append("cancelled")
+        
+        def blocking_save():
+            time.sleep(0.1)
+            events.append("saved")
+        
+        self.bridge.submit(waiter())
+        self.bridge.submit(self.bridge.run_blocking(blocking_save))
+        time.sleep(0.02)
+        
+        self.bridge.shutdown()
+        self.assertFalse(self.bridge.is_running)
+        self.assertEqual(sorted(events), ["cancelled", "saved"])
+        
+        # 关闭后可以重新启动
+        self.assertEqual(self.bridge.submit(asyncio.sleep(0, result="ok")).result(2), "ok")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+精简打包测试 - Todo App v0.3.1
+测试根据追踪剪裁打包数据文件的规则
+"""
+import unittest
+import tempfile
+from pathlib import Path
+from bundle_slim import BundlePruner, toc_size, report
+
+class TestBundlePruner(unittest.TestCase):
+    """打包剪裁测试类"""
+    
+    def setUp(self):
+        """测试前准备"""
+        self.trace = {
+            "tcl_files": ["http1.0/http.tcl"],
+            "tk_files": ["msgbox.tcl"],
+            "encodings": ["cp936"],
+            "locales": ["zh_CN", "zh"],
+            "ctk_themes": ["/site-packages/customtkinter/assets/themes/blue.json"],
+            "modules": ["tkinter", "tkinter.ttk"]
+        }
+        self.pruner = BundlePruner(self.trace)
+    
+    def test_tcl_rules(self):
+        """测试 Tcl 库的剪裁规则"""
+        keep = self.pruner.keep
+        self.assertTrue(keep("_tcl_data/tcl8.6/init.tcl"))
+        self.assertTrue(keep("_tcl_data/tcl8.6/encoding/cp936.enc"))
+        self.assertTrue(keep("_tcl_data/tcl8.6/encoding/ascii.enc"))
+        self.assertFalse(keep("_tcl_data/tcl8.6/encoding/koi8-r.enc"))
+        self.assertFalse(keep("_tcl_data/tcl8.6/tzdata/Asia/Shanghai"))
+        self.assertFalse(keep("_tcl_data/tcl8.6/msgs/de.msg"))
+        self.assertTrue(keep("_tcl_data/tcl8.6/http1.0/http.tcl"))
+        self.assertFalse(keep("_tcl_data/tcl8.6/opt0.4/optparse.tcl"))
+        self.assertTrue(keep("_tcl_data/tcl8.6/tcl8/8.5/msgcat-1.6.1.tm"))
+        self.assertFalse(keep("_tcl_data/tcl8.6/tcl8/8.5/tcltest-2.5.3.tm"))
+    
+    def test_tk_ctk_and_tkinter_rules(self):
+        """测试 Tk、customtkinter 和 tkinter 源文件的剪裁规则"""
+        keep = self.pruner.keep
+        self.assertTrue(keep("_tk_data/tk.tcl"))
+        self.assertTrue(keep("_tk_data/ttk/ttk.tcl"))
+        self.assertFalse(keep("_tk_data/demos/widget"))
+        self.assertFalse(keep("_tk_data/images/logo.eps"))
+        self.assertTrue(keep("_tk_data/msgs/zh_cn.msg"))
+        self.assertTrue(keep("_tk_data/msgs/en.msg"))
+        self.assertFalse(keep("_tk_data/msgs/fr.msg"))
+        self.assertTrue(keep("customtkinter/assets/themes/blue.json"))
+        self.assertFalse(keep("customtkinter/assets/themes/green.json"))
+        self.assertTrue(keep("customtkinter/assets/fonts/Roboto/Roboto-Regular.ttf"))
+        self.assertTrue(keep("tkinter/__init__.py"))
+        self.assertTrue(keep("tkinter/ttk.py"))
+        self.assertFalse(keep("tkinter/tix.py"))
+        self.assertTrue(keep("res/icon.ico"))
+    
+    def test_chinese_support_kept_without_trace(self):
+        """测试在非中文系统上追踪时仍保留中文编码和消息"""
+        pruner = BundlePruner({"encodings": ["cp1252"], "locales": ["en_US", "en"]})
+        for encoding in ("cp936", "gb2312", "euc-cn"):
+            self.assertTrue(pruner.keep(f"_tcl_data/tcl8.6/encoding/{encoding}.enc"))
+        self.assertTrue(pruner.keep("_tk_data/msgs/zh_cn.msg"))
+        self.assertTrue(pruner.keep("_tcl_data/tcl8.6/msgs/zh_cn.msg"))
+        self.assertFalse(pruner.keep("_tcl_data/tcl8.6/msgs/de.msg"))
+        self.assertFalse(pruner.keep("_tcl_data/tcl8.6/encoding/koi8-r.enc"))
+    
+    def test_custom_library_dests(self):
+        """测试使用构建清单中的库目录"""
+        pruner = BundlePruner(self.trace, {"TK_LIBRARY": "_tk_data/tk8.6"})
+        self.assertFalse(pruner.keep("_tk_data/tk8.6/demos/widget"))
+        self.assertTrue(pruner.keep("_tk_data/demos/widget"))
+    
+    def test_prune_and_report(self):
+        """测试拆分 TOC 和生成报告"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            toc = []
+            for dest in ["_tk_data/tk.tcl", "_tk_data/demos/widget", "_tcl_data/tcl8.6/msgs/de.msg"]:
+                src = Path(temp_dir) / dest.replace("/", "_")
+                src.write_bytes(b"x" * 1000)
+                toc.append((dest, str(src), "DATA"))
+            
+            kept, removed = self.pruner.prune(toc)
+            self.assertEqual([entry[0] for entry in kept], ["_tk_data/tk.tcl"])
+            self.assertEqual(len(removed), 2)
+            self.assertEqual(toc_size(toc), 3000)
+            self.assertIn("3 -> 1", report(toc, kept))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+"""
+命令行模式测试 - Todo App v0.3.1
+测试各子命令、标准输入批量操作，以及不导入 Tk
+"""
+import unittest
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from contextlib import redirect_stderr
+from pathlib import Path
+from database import TaskDatabase
+from snapshot_store import SnapshotStore
+from cli import COMMANDS, build_parser, main
+
+class TestCli(unittest.TestCase):
+    """命令行测试类"""
+    
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.tasks_file = Path(self.temp_dir.name) / "tasks.json"
+        self.db = TaskDatabase(autoload=False, tasks_file=self.tasks_file)
+        self.store = SnapshotStore(Path(self.temp_dir.name) / "snapshots", files={"tasks.json": self.tasks_file})
+    
+    def tearDown(self):
+        """测试后清理"""
+        self.temp_dir.cleanup()
+    
+    def run_cli(self, *argv, stdin: str = ""):
+        """执行命令，返回 (退出码, 标准输出)"""
+        stdout = io.StringIO()
+        code = main(list(argv), db=self.db, stdin=io.StringIO(stdin), stdout=stdout, stderr=io.StringIO(),
+                    store=self.store)
+        return code, stdout.getvalue()
+    
+    def test_add_from_stdin_and_list(self):
+        """测试从标准输入批量添加并列出"""
+        code, output = self.run_cli("add", "-p", "高", "-t", "家务", stdin="买牛奶\n\n交电费\n")
+        self.assertEqual(code, 0)
+        self.assertEqual(output.count("已添加"), 2)
+        
+        # 批量添加只写入一次，重新加载后数据一致
+        reloaded = TaskDatabase(tasks_file=self.tasks_file)
+        self.assertEqual([task.title for task in reloaded.get_all_tasks()], ["买牛奶", "交电费"])
+        self.assertTrue(all(task.priority == "高" and task.tags == ["家务"] for task in reloaded.get_all_tasks()))
+        # 原子保存不改变任务文件的权限
+        reference = Path(self.temp_dir.name) / "reference.json"
+        reference.write_text("[]")
+        self.assertEqual(self.tasks_file.stat().st_mode, reference.stat().st_mode)
+        
+        code, output = self.run_cli("list", "--json")
+        self.assertEqual(len(json.loads(output)), 2)
+        self.assertEqual(self.run_cli("add", stdin="")[0], 1)
+    
+    def test_done_by_prefix_and_pipe(self):
+        """测试按 ID 前缀和管道标记完成"""
+        self.run_cli("add", "任务一", "任务二", "任务三")
+        tasks = self.db.get_all_tasks()
+        
+        code, _ = self.run_cli("done", tasks[0].id[:8])
+        self.assertEqual(code, 0)
+        self.assertTrue(self.db.get_task_by_id(tasks[0].id).completed)
+        
+        _, pending = self.run_cli("list", "--pending")
+        code, output = self.run_cli("done", stdin=pending)
+        self.assertEqual(code, 0)
+        self.assertIn("已更新 2 个任务", output)
+        self.assertEqual(self.db.get_statistics()["completed"], 3)
+        
+        self.assertEqual(self.run_cli("done", "--undo", tasks[1].id)[0], 0)
+        self.assertFalse(self.db.get_task_by_id(tasks[1].id).completed)
+        self.assertEqual(self.run_cli("done", "不存在")[0], 1)
+    
+    def test_search_stats_export_import(self):
+        """测试搜索、统计、导出和导入"""
+        self.run_cli("add", "写周报", "-d", "本周进展")
+        self.run_cli("add", "买菜")
+        
+        _, output = self.run_cli("search", "进展")
+        self.assertIn("写周报", output)
+        self.assertNotIn("买菜", output)
+        
+        _, output = self.run_cli("stats", "--json")
+        self.assertEqual(json.loads(output)["total"], 2)
+        
+        _, exported = self.run_cli("export")
+        self.assertEqual(len(json.loads(exported)["tasks"]), 2)
+        
+        # 导入到另一个数据库，重复导入时跳过已存在的任务
+        self.db = TaskDatabase(autoload=False, tasks_file=Path(self.temp_dir.name) / "other.json")
+        self.assertIn("已导入 2 个任务", self.run_cli("import", stdin=exported)[1])
+        self.assertIn("已导入 0 个任务", self.run_cli("import", stdin=exported)[1])
+        self.assertEqual(len(self.db.get_all_tasks()), 2)
+    
+    def test_export_to_stdout_keeps_line_endings(self):
+        """测试导出到标准输出时不再转换 CSV/iCalendar 的 \r\n（模拟 Windows 的换行转换）"""
+        self.run_cli("add", "任务")
+        buffer = io.BytesIO()
+        stdout = io.TextIOWrapper(buffer, encoding="utf-8", newline="\r\n")
+        self.assertEqual(main(["export", "-f", "ical"], db=self.db, stdout=stdout, stderr=io.StringIO()), 0)
+        stdout.flush()
+        self.assertIn(b"BEGIN:VTODO\r\n", buffer.getvalue())
+        self.assertNotIn(b"\r\r\n", buffer.getvalue())
+    
+    def test_invalid_input(self):
+        """测试无效的截止日期和导入内容给出错误而不是异常"""
+        self.run_cli("add", "有截止日期", "--due", "2025-01-31")
+        self.assertEqual(self.db.get_all_tasks()[0].due_date, "2025-01-31T23:59:59")
+        with self.assertRaises(SystemExit), redirect_stderr(io.StringIO()):
+            self.run_cli("add", "x", "--due", "notadate")
+        
+        for data in ('[{"id": "a"}]', '{"tasks": 3}', '[1]'):
+            stderr = io.StringIO()
+            code = main(["import"], db=self.db, stdin=io.StringIO(data), stdout=io.StringIO(), stderr=stderr)
+            self.assertEqual(code, 1)
+            self.assertIn("❌ 导入文件格式错误", stderr.getvalue())
+        self.assertEqual(len(self.db.get_all_tasks()), 1)
+    
+    def test_snapshots_list_and_restore(self):
+        """测试列出快照并从快照恢复任务，覆盖前自动创建快照"""
+        self.run_cli("add", "任务一", "任务二")
+        original = self.tasks_file.read_bytes()
+        self.assertTrue(self.store.create_snapshot("两个任务")[0])
+        self.run_cli("add", "任务三")
+        
+        code, output = self.run_cli("snapshots")
+        self.assertEqual(code, 0)
+        self.assertIn("两个任务", output)
+        snapshot_id = json.loads(self.run_cli("snapshots", "--json")[1])[0]["id"]
+        
+        # 恢复到单独目录不影响当前数据
+        restore_dir = Path(self.temp_dir.name) / "restore"
+        self.assertEqual(self.run_cli("snapshots", "restore", snapshot_id[:15], "--to", str(restore_dir))[0], 0)
+        self.assertEqual((restore_dir / "tasks.json").read_bytes(), original)
+        self.assertEqual(len(self.store.list_snapshots()), 1)
+        
+        code, output = self.run_cli("snapshots", "restore", snapshot_id)
+        self.assertEqual(code, 0)
+        self.assertIn("已从快照", output)
+        reloaded = TaskDatabase(tasks_file=self.tasks_file)
+        self.assertEqual([task.title for task in reloaded.get_all_tasks()], ["任务一", "任务二"])
+        
+        # 覆盖前的数据保存在新快照中
+        snapshots = self.store.list_snapshots()
+        self.assertEqual(snapshots[0]["description"], "恢复前自动快照")
+        self.assertEqual(self.run_cli("snapshots", "restore", snapshots[0]["id"])[0], 0)
+        self.assertEqual(len(TaskDatabase(tasks_file=self.tasks_file).get_all_tasks()), 3)
+        
+        self.assertEqual(self.run_cli("snapshots", "restore")[0], 1)
+        self.assertEqual(self.run_cli("snapshots", "restore", "nosuchid")[0], 1)
+    
+    def test_commands_match_parser(self):
+        """测试 app.py 用来判断命令行模式的子命令列表与参数定义一致"""
+        subparsers = next(action for action in build_parser()._actions
+                          if isinstance(action, argparse._SubParsersAction))
+        self.assertEqual(tuple(subparsers.choices), COMMANDS)
+    
+    def test_does_not_import_tk(self):
+        """测试命令行模式不导入 Tk"""
+        script = (
+            "import sys, io, cli; cli.main(['stats'], stdout=io.StringIO(), stderr=io.StringIO()); "
+            "print(any(name.split('.')[0] in ('tkinter', 'customtkinter', 'main_app') for name in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=str(Path(__file__).parent),
+            env=dict(os.environ, TODO_APP_HOME=self.temp_dir.name),
+            capture_output=True,
+            text=True
+        )
+        self.assertEqual(result.stdout.strip(), "False", result.stderr)
+
+if __name__ == '__main__':
+    unittest.main()
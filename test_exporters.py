@@ -0,0 +1,129 @@
+"""
+任务导出测试 - Todo App v0.3.1
+测试各导出格式的内容、进度回调和取消
+"""
+import unittest
+import csv
+import io
+import json
+import os
+import stat
+import tempfile
+import threading
+from pathlib import Path
+from models import Task
+from exporters import ExportCancelled, export_to_file, format_from_path, write_tasks
+
+class TestExporters(unittest.TestCase):
+    """导出测试类"""
+    
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.tasks = [
+            Task(id="t1", title="写周报", description="第一行\n第二行, 带逗号", priority="高",
+                 completed=True, created_at="2025-01-02T09:30:00", due_date="2025-01-31", tags=["工作", "每周"]),
+            Task(id="t2", title="买牛奶", priority="低", created_at="2025-01-03T18:00:00"),
+        ]
+    
+    def tearDown(self):
+        """测试后清理"""
+        self.temp_dir.cleanup()
+    
+    def export(self, fmt: str, tasks=None) -> str:
+        """导出到字符串"""
+        out = io.StringIO(newline="")
+        written = write_tasks(self.tasks if tasks is None else tasks, out, fmt)
+        self.assertEqual(written, len(self.tasks if tasks is None else tasks))
+        return out.getvalue()
+    
+    def test_json_compatible_with_import(self):
+        """测试 JSON 与原导出结构一致（空列表也是合法 JSON）"""
+        data = json.loads(self.export("json"))
+        self.assertEqual(set(data), {"app_version", "export_time", "tasks"})
+        self.assertEqual([Task.from_dict(item) for item in data["tasks"]], self.tasks)
+        self.assertEqual(json.loads(self.export("json", []))["tasks"], [])
+    
+    def test_ndjson_and_csv(self):
+        """测试 NDJSON 每行一个任务，CSV 可被标准库读回"""
+        lines = self.export("ndjson").splitlines()
+        self.assertEqual([json.loads(line)["id"] for line in lines], ["t1", "t2"])
+        
+        rows = list(csv.DictReader(io.StringIO(self.export("csv"), newline="")))
+        self.assertEqual(rows[0]["description"], "第一行\n第二行, 带逗号")
+        self.assertEqual((rows[0]["completed"], rows[0]["tags"]), ("true", "工作;每周"))
+        self.assertEqual((rows[1]["due_date"], rows[1]["tags"]), ("", ""))
+    
+    def test_markdown_checklist(self):
+        """测试 Markdown 清单项和描述引用块"""
+        text = self.export("markdown")
+        self.assertIn("- [x] 写周报 （优先级: 高，截止: 2025-01-31） #工作 #每周\n  > 第一行\n  > 第二行, 带逗号\n", text)
+        self.assertIn("- [ ] 买牛奶 （优先级: 低）\n", text)
+    
+    def test_ical_vtodo(self):
+        """测试 iCalendar 的转义、折行和字段映射"""
+        self.tasks[1].title = "很长的标题" * 10
+        text = self.export("ical")
+        self.assertTrue(text.startswith("BEGIN:VCALENDAR\r\nVERSION:2.0\r\n"))
+        self.assertTrue(text.endswith("END:VCALENDAR\r\n"))
+        
+        lines = text.split("\r\n")[:-1]
+        self.assertTrue(all(len(line.encode("utf-8")) <= 75 for line in lines))
+        # 展开折行后检查内容
+        unfolded = text.replace("\r\n ", "").split("\r\n")
+        self.assertIn("DESCRIPTION:第一行\\n第二行\\, 带逗号", unfolded)
+        self.assertIn("SUMMARY:" + "很长的标题" * 10, unfolded)
+        self.assertIn("DUE;VALUE=DATE:20250131", unfolded)
+        self.assertIn("CREATED:20250102T093000", unfolded)
+        self.assertIn("CATEGORIES:工作,每周", unfolded)
+        self.assertEqual([line for line in unfolded if line.startswith("PRIORITY")], ["PRIORITY:1", "PRIORITY:9"])
+        self.assertEqual([line for line in unfolded if line.startswith("STATUS")], ["STATUS:COMPLETED", "STATUS:NEEDS-ACTION"])
+    
+    def test_format_from_path(self):
+        """测试按扩展名判断格式"""
+        self.assertEqual(format_from_path("a.ICS"), "ical")
+        self.assertEqual(format_from_path("a.jsonl"), "ndjson")
+        self.assertEqual(format_from_path("a.md"), "markdown")
+        self.assertEqual(format_from_path("a.txt"), "json")
+        with self.assertRaises(ValueError):
+            write_tasks(self.tasks, io.StringIO(), "xml")
+    
+    def test_progress_and_cancel(self):
+        """测试进度回调，取消时保留原文件且不留下临时文件"""
+        tasks = [Task(id="", title=f"任务{i}") for i in range(1000)]
+        path = Path(self.temp_dir.name) / "tasks.csv"
+        
+        reports = []
+        self.assertEqual(export_to_file(tasks, str(path), progress=lambda done, total: reports.append((done, total))), 1000)
+        self.assertEqual(reports[-1], (1000, 1000))
+        original = path.read_bytes()
+        
+        cancel_event = threading.Event()
+        
+        def progress(done, total):
+            if done >= 100:
+                cancel_event.set()
+        
+        with self.assertRaises(ExportCancelled):
+            write_tasks(tasks, io.StringIO(), "ndjson", progress, cancel_event, progress_interval=0)
+        with self.assertRaises(ExportCancelled):
+            export_to_file(tasks, str(path), "ndjson", cancel_event=cancel_event)
+        self.assertEqual(path.read_bytes(), original)
+        self.assertEqual(os.listdir(self.temp_dir.name), ["tasks.csv"])
+    
+    def test_file_mode(self):
+        """测试导出文件按 umask 设置权限，覆盖时沿用原文件权限"""
+        reference = Path(self.temp_dir.name) / "reference.txt"
+        reference.write_text("")
+        for fmt in ("json", "ndjson", "csv", "markdown", "ical"):
+            path = Path(self.temp_dir.name) / f"tasks.{fmt}"
+            export_to_file(self.tasks, str(path), fmt)
+            self.assertEqual(path.stat().st_mode, reference.stat().st_mode, fmt)
+        
+        path = Path(self.temp_dir.name) / "tasks.csv"
+        os.chmod(path, 0o640)
+        export_to_file(self.tasks, str(path))
+        self.assertEqual(stat.S_IMODE(path.stat().st_mode), 0o640)
+
+if __name__ == '__main__':
+    unittest.main()
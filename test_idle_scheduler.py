@@ -0,0 +1,103 @@
+"""
+空闲任务调度测试 - Todo App v0.3.1
+测试优先级、时间片预算、取消和用户输入时的推迟
+"""
+import unittest
+import time
+import tkinter
+from idle_scheduler import IdleScheduler
+
+class TestIdleScheduler(unittest.TestCase):
+    """空闲调度器测试类"""
+    
+    def setUp(self):
+        """测试前准备"""
+        self.scheduler = IdleScheduler(budget=0.005)
+        self.log = []
+    
+    def steps(self, name: str, count: int, duration: float = 0.0):
+        """生成器任务：每步记录名称"""
+        for _ in range(count):
+            if duration:
+                time.sleep(duration)
+            self.log.append(name)
+            yield
+    
+    def test_priority_order(self):
+        """测试高优先级先执行，同优先级按添加顺序"""
+        self.scheduler.schedule(lambda: self.log.append("low"), IdleScheduler.PRIORITY_LOW)
+        self.scheduler.schedule(lambda: self.log.append("normal-1"))
+        self.scheduler.schedule(lambda: self.log.append("high"), IdleScheduler.PRIORITY_HIGH)
+        self.scheduler.schedule(lambda: self.log.append("normal-2"))
+        
+        while self.scheduler.pending:
+            self.scheduler.run_slice()
+        self.assertEqual(self.log, ["high", "normal-1", "normal-2", "low"])
+    
+    def test_slice_budget(self):
+        """测试每个时间片不超过预算，长任务分多片完成"""
+        job = self.scheduler.schedule(self.steps("index", 20, duration=0.002))
+        
+        started = time.perf_counter()
+        self.scheduler.run_slice()
+        self.assertLess(time.perf_counter() - started, 0.015)
+        self.assertLess(len(self.log), 20)
+        self.assertFalse(job.done)
+        
+        # 单个任务可以指定自己的预算
+        self.scheduler.schedule(self.steps("quick", 5, duration=0.002), IdleScheduler.PRIORITY_HIGH, budget=0.001)
+        self.scheduler.run_slice()
+        self.assertEqual(self.log.count("quick"), 1)
+        
+        # 排在同一时间片后面的任务同样遵守自己的预算
+        scheduler = IdleScheduler(budget=0.05)
+        scheduler.schedule(lambda: self.log.append("first"))
+        scheduler.schedule(self.steps("later", 5, duration=0.002), IdleScheduler.PRIORITY_LOW, budget=0.001)
+        scheduler.run_slice()
+        self.assertEqual((self.log.count("first"), self.log.count("later")), (1, 1))
+        
+        while self.scheduler.pending:
+            self.scheduler.run_slice()
+        self.assertTrue(job.done)
+        self.assertEqual(self.log.count("index"), 20)
+    
+    def test_cancel_and_errors(self):
+        """测试取消后不再执行，任务出错不影响其他任务"""
+        job = self.scheduler.schedule(self.steps("cancelled", 100, duration=0.001))
+        self.scheduler.run_slice()
+        done_steps = len(self.log)
+        job.cancel()
+        
+        def broken():
+            raise ValueError("模拟失败")
+        
+        self.scheduler.schedule(broken)
+        self.scheduler.schedule(lambda: self.log.append("after"))
+        while self.scheduler.pending:
+            self.scheduler.run_slice()
+        self.assertEqual(self.log[done_steps:], ["after"])
+        
+        self.scheduler.schedule(lambda: self.log.append("never"))
+        self.scheduler.cancel_all()
+        self.assertEqual(self.scheduler.pending, 0)
+    
+    def test_runs_on_idle_and_defers_after_input(self):
+        """测试通过 Tk 空闲回调执行，用户输入后推迟"""
+        # 不需要显示器的 Tcl 解释器即可运行 after 事件
+        root = tkinter.Tcl()
+        self.scheduler.attach(root)
+        self.scheduler.note_input()
+        self.scheduler.schedule(self.steps("maintenance", 3))
+        
+        root.update()
+        self.assertEqual(self.log, [])
+        self.assertEqual(self.scheduler.deferred, 1)
+        
+        deadline = time.monotonic() + 2
+        while self.scheduler.pending and time.monotonic() < deadline:
+            root.update()
+            time.sleep(0.01)
+        self.assertEqual(self.log, ["maintenance"] * 3)
+
+if __name__ == '__main__':
+    unittest.main()
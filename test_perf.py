@@ -0,0 +1,98 @@
+"""
+性能计时测试 - Todo App v0.3.1
+测试计时注册表的统计和导出
+"""
+import unittest
+import importlib.util
+import tempfile
+import json
+from pathlib import Path
+from perf import PerfRegistry
+
+class TestPerfRegistry(unittest.TestCase):
+    """计时注册表测试类"""
+    
+    def test_disabled_records_nothing(self):
+        """测试未启用时不记录"""
+        registry = PerfRegistry(enabled=False)
+        
+        @registry.timed()
+        def work(x):
+            return x * 2
+        
+        self.assertEqual(work(21), 42)
+        with registry.measure("block"):
+            pass
+        self.assertEqual(registry.stats(), {})
+    
+    def test_timed_and_measure(self):
+        """测试装饰器和上下文管理器计时"""
+        registry = PerfRegistry(enabled=True)
+        
+        @registry.timed("work")
+        def work():
+            return "done"
+        
+        for _ in range(10):
+            self.assertEqual(work(), "done")
+        with registry.measure("block"):
+            pass
+        
+        stats = registry.stats()
+        self.assertEqual(stats["work"]["count"], 10)
+        self.assertEqual(stats["block"]["count"], 1)
+        self.assertLessEqual(stats["work"]["p50_ms"], stats["work"]["p99_ms"])
+    
+    def test_percentiles_and_dump(self):
+        """测试分位数计算和 JSON 导出"""
+        registry = PerfRegistry(enabled=True)
+        for ms in range(1, 101):
+            registry.record("op", ms / 1000)
+        
+        stats = registry.stats("op")
+        self.assertAlmostEqual(stats["p50_ms"], 50)
+        self.assertAlmostEqual(stats["p95_ms"], 95)
+        self.assertAlmostEqual(stats["p99_ms"], 99)
+        self.assertAlmostEqual(stats["max_ms"], 100)
+        
+        path = Path(tempfile.mkdtemp()) / "perf.json"
+        self.assertTrue(registry.dump_json(path))
+        with open(path, 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f)["timings"]["op"]["count"], 100)
+
+class FakeWidget:
+    """只有 winfo_children 的控件替身"""
+    
+    def __init__(self, children=()):
+        self.children = list(children)
+        self.rows_rendered = 0
+        self.last_refresh_duration = 0.0
+    
+    def winfo_children(self):
+        return self.children
+
+@unittest.skipUnless(importlib.util.find_spec("customtkinter"), "未安装 customtkinter")
+class TestWidgetCountCache(unittest.TestCase):
+    """控件数量缓存测试类"""
+    
+    def test_recounts_after_refresh_or_interval(self):
+        """测试只在列表刷新后或超过间隔时重新统计"""
+        from perf_hud import WidgetCountCache
+        
+        app = FakeWidget([FakeWidget([FakeWidget()])])
+        cache = WidgetCountCache()
+        self.assertEqual(cache.get(app), 3)
+        
+        app.children.append(FakeWidget())
+        self.assertEqual(cache.get(app), 3)
+        
+        app.rows_rendered = 1
+        app.last_refresh_duration = 0.01
+        self.assertEqual(cache.get(app), 4)
+        
+        app.children.append(FakeWidget())
+        cache.INTERVAL = 0
+        self.assertEqual(cache.get(app), 5)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+性能分析测试 - Todo App v0.3.1
+测试 cProfile 和栈采样的结果输出
+"""
+import unittest
+import tempfile
+import pstats
+import time
+from pathlib import Path
+from profiler import Profiler
+
+def busy_work(seconds: float):
+    """占用 CPU 一段时间"""
+    end = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < end:
+        total += sum(range(100))
+    return total
+
+class TestProfiler(unittest.TestCase):
+    """性能分析器测试类"""
+    
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.profiler = Profiler(Path(self.temp_dir.name))
+    
+    def tearDown(self):
+        """测试后清理"""
+        if self.profiler.is_running:
+            self.profiler.stop()
+        self.temp_dir.cleanup()
+    
+    def test_sample_mode_writes_collapsed_stacks(self):
+        """测试采样模式输出折叠栈"""
+        success, message = self.profiler.start("sample", interval=0.001)
+        self.assertTrue(success, message)
+        busy_work(0.2)
+        success, message = self.profiler.stop()
+        self.assertTrue(success, message)
+        self.assertFalse(self.profiler.is_running)
+        
+        files = list(Path(self.temp_dir.name).iterdir())
+        self.assertEqual([path.name.endswith(".collapsed.txt") for path in files], [True])
+        
+        lines = files[0].read_text(encoding="utf-8").splitlines()
+        self.assertTrue(lines)
+        stack, count = lines[0].rsplit(" ", 1)
+        self.assertGreater(int(count), 0)
+        self.assertTrue(any("busy_work" in line for line in lines))
+    
+    def test_cprofile_mode_writes_pstats(self):
+        """测试 cProfile 模式输出 pstats"""
+        success, message = self.profiler.start("cprofile", interval=0.001)
+        if not success:
+            self.skipTest(message)
+        busy_work(0.05)
+        success, message = self.profiler.stop()
+        self.assertTrue(success, message)
+        
+        pstats_files = list(Path(self.temp_dir.name).glob("*.pstats"))
+        self.assertEqual(len(pstats_files), 1)
+        stats = pstats.Stats(str(pstats_files[0]))
+        self.assertTrue(any(func[2] == "busy_work" for func in stats.stats))
+        self.assertEqual(len(list(Path(self.temp_dir.name).glob("*.collapsed.txt"))), 1)
+    
+    def test_invalid_usage(self):
+        """测试重复启动、未启动停止和未知模式"""
+        self.assertFalse(self.profiler.stop()[0])
+        self.assertFalse(self.profiler.start("unknown")[0])
+        self.assertTrue(self.profiler.start("sample")[0])
+        self.assertFalse(self.profiler.start("sample")[0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,8 +3,11 @@
 测试设置功能的完整性和正确性
 """
 import unittest
+import importlib.util
 import tempfile
 import json
+import os
+import stat
 from pathlib import Path
 from config import Config
 from settings_manager import SettingsManager
@@ -133,6 +136,12 @@ class TestSettingsModule(unittest.TestCase):
         
         is_valid, error = self.settings_manager.validate_setting("font_size", 100)
         self.assertFalse(is_valid, "过大的字体大小应该验证失败")
+        
+        # 测试快照间隔和保留数量验证
+        for key in ("snapshot_interval_minutes", "snapshot_keep"):
+            self.assertTrue(self.settings_manager.validate_setting(key, 30)[0], f"{key} 有效值验证失败")
+            for value in (0, -5, 1.5, True, "60"):
+                self.assertFalse(self.settings_manager.validate_setting(key, value)[0], f"{key}={value!r} 应该验证失败")
     
     def test_priority_colors_validation(self):
         """测试优先级颜色验证"""
@@ -165,6 +174,155 @@ class TestSettingsModule(unittest.TestCase):
         
         is_valid, error = self.settings_manager.validate_setting("priority_colors", invalid_format_colors)
         self.assertFalse(is_valid, "无效颜色格式应该验证失败")
+    
+    def test_config_listeners(self):
+        """测试配置变更通知"""
+        events = []
+        listener = lambda key, old, new: events.append((key, old, new))
+        old_size = self.test_config.get("font_size")
+        
+        self.test_config.add_listener(listener)
+        self.test_config.set("font_size", 17)
+        self.test_config.set("font_size", 17)  # 值未变化，不应通知
+        self.test_config.remove_listener(listener)
+        self.test_config.set("font_size", 12)
+        
+        self.assertEqual(events, [("font_size", old_size, 17)], "监听器通知不正确")
+    
+    def test_config_batch(self):
+        """测试批量修改配置只写入一次，异常时回滚"""
+        writes = []
+        original_save = self.test_config.save_config
+        def counting_save():
+            writes.append(1)
+            original_save()
+        self.test_config.save_config = counting_save
+        
+        with self.test_config.batch():
+            self.test_config.set("font_size", 15)
+            self.test_config.set("theme", "light")
+            with self.test_config.batch():
+                self.test_config.set("auto_save", False)
+        
+        self.assertEqual(len(writes), 1, "批量修改应该只写入一次")
+        with open(self.test_config.config_file, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        self.assertEqual(saved["theme"], "light")
+        self.assertEqual(saved["font_size"], 15)
+        self.assertFalse(saved["auto_save"])
+        
+        # 异常时回滚且不写文件
+        with self.assertRaises(RuntimeError):
+            with self.test_config.batch():
+                self.test_config.set("theme", "dark")
+                raise RuntimeError("中断")
+        self.assertEqual(self.test_config.get("theme"), "light", "异常后应回滚配置")
+        self.assertEqual(len(writes), 1, "回滚时不应写入文件")
+    
+    def test_save_keeps_file_mode(self):
+        """测试保存配置不改变文件权限（新文件按 umask）"""
+        reference = Path(self.temp_dir) / "reference.json"
+        reference.write_text("{}")
+        self.test_config.save_config()
+        self.assertEqual(self.test_config.config_file.stat().st_mode, reference.stat().st_mode)
+        
+        os.chmod(self.test_config.config_file, 0o640)
+        self.test_config.set("font_size", 16)
+        self.assertEqual(stat.S_IMODE(self.test_config.config_file.stat().st_mode), 0o640)
+    
+    def test_config_replace(self):
+        """测试替换全部配置只通知变化的配置项"""
+        self.test_config.replace(self.test_config.default_config)
+        self.test_config.set("extra", 1)
+        events = []
+        self.test_config.add_listener(lambda key, old, new: events.append(key))
+        
+        colors = dict(self.test_config.get("priority_colors"), 高="#123456")
+        self.test_config.replace(dict(self.test_config.default_config, priority_colors=colors))
+        self.assertEqual(events, ["priority_colors"])
+        self.assertNotIn("extra", self.test_config.config)
+        with open(self.test_config.config_file, 'r', encoding='utf-8') as f:
+            self.assertNotIn("extra", json.load(f))
+        # 替换的是副本，之后修改配置不会影响默认值
+        self.test_config.get("priority_colors")["低"] = "#000000"
+        self.assertEqual(self.test_config.default_config["priority_colors"]["低"], "#44ff44")
+    
+    @unittest.skipUnless(importlib.util.find_spec("customtkinter"), "未安装 customtkinter")
+    def test_priority_color_signal(self):
+        """测试某个优先级颜色变化只通知该优先级的订阅者"""
+        from config import app_config
+        from ui_components import ColorSignal
+        
+        class Subscriber:
+            def __init__(self):
+                self.colors = []
+            
+            def on_priority_color_changed(self, color):
+                self.colors.append(color)
+        
+        self.test_config.replace(self.test_config.default_config)
+        signal = ColorSignal()
+        app_config.remove_listener(signal._on_config_changed)
+        self.test_config.add_listener(signal._on_config_changed)
+        signal.emit_priority_colors(self.test_config.get("priority_colors"))
+        high, low, everything = Subscriber(), Subscriber(), Subscriber()
+        signal.subscribe("高", high)
+        signal.subscribe("低", low)
+        signal.subscribe(ColorSignal.ALL, everything)
+        
+        colors = dict(self.test_config.get("priority_colors"), 高="#123456")
+        self.test_config.replace(dict(self.test_config.default_config, priority_colors=colors))
+        self.assertEqual((high.colors, low.colors, everything.colors), (["#123456"], [], [None]))
+        
+        # 重置为默认值同样通知
+        self.test_config.replace(self.test_config.default_config)
+        self.assertEqual(high.colors, ["#123456", "#ff4444"])
+        self.assertEqual(low.colors, [])
+    
+    def test_backup_manifest(self):
+        """测试备份清单的维护"""
+        backup = SettingsBackup(Path(self.temp_dir) / "backups")
+        backup.max_backups = 2
+        
+        for i in range(3):
+            success, message = backup.create_backup(f"备份 {i}")
+            self.assertTrue(success, message)
+        
+        # 只保留最新的两个，且清单与文件一致
+        backups = backup.list_backups()
+        self.assertEqual([b["description"] for b in backups], ["备份 2", "备份 1"])
+        files = sorted(p.name for p in backup.backup_dir.glob("settings_backup_*.json"))
+        self.assertEqual(files, sorted(b["filename"] for b in backups))
+        
+        # 删除备份同步更新清单
+        success, message = backup.delete_backup(backups[0]["path"])
+        self.assertTrue(success, message)
+        self.assertEqual([b["description"] for b in backup.list_backups()], ["备份 1"])
+        
+        # 清单丢失时从备份文件重建
+        backup.manifest_file.unlink()
+        self.assertEqual([b["description"] for b in backup.list_backups()], ["备份 1"])
+    
+    def test_backup_cleanup_keeps_undeletable_entries(self):
+        """测试删除失败的旧备份留在清单中，下次清理时重试"""
+        backup = SettingsBackup(Path(self.temp_dir) / "backups")
+        backup.max_backups = 1
+        
+        backup.create_backup("备份 0")
+        oldest = Path(backup.list_backups()[0]["path"])
+        # 替换为非空目录，unlink 必然失败（root 也一样）
+        oldest.unlink()
+        oldest.mkdir()
+        (oldest / "keep").write_text("")
+        
+        backup.create_backup("备份 1")
+        self.assertEqual([b["description"] for b in backup.list_backups()], ["备份 1", "备份 0"])
+        
+        # 可以删除后下次清理时移出清单
+        (oldest / "keep").unlink()
+        oldest.rmdir()
+        backup.create_backup("备份 2")
+        self.assertEqual([b["description"] for b in backup.list_backups()], ["备份 2"])
 
 def run_settings_tests():
     """运行设置模块测试"""
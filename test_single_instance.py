@@ -0,0 +1,140 @@
+"""
+单实例测试 - Todo App v0.3.1
+测试参数解析、消息转发和残留套接字的处理
+"""
+import unittest
+import io
+import os
+import socket
+import stat
+import tempfile
+import time
+from contextlib import redirect_stdout
+from local_socket import private_dir
+from single_instance import InstanceServer, forward, is_supported, parse_launch_args, socket_path
+
+class TestParseLaunchArgs(unittest.TestCase):
+    """命令行参数解析测试类"""
+    
+    def test_add_and_raise(self):
+        """测试 --add 参数和默认的激活消息"""
+        self.assertEqual(parse_launch_args([]), [{"action": "raise"}])
+        self.assertEqual(
+            parse_launch_args(["--add", "买牛奶", "--add", "写周报", "--unknown"]),
+            [{"action": "add", "title": "买牛奶"}, {"action": "add", "title": "写周报"}, {"action": "raise"}]
+        )
+
+@unittest.skipUnless(is_supported(), "当前平台不支持 Unix 域套接字")
+class TestInstanceServer(unittest.TestCase):
+    """单实例监听测试类"""
+    
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "todo.sock")
+        self.server = InstanceServer(self.path)
+    
+    def tearDown(self):
+        """测试后清理"""
+        self.server.close()
+        self.temp_dir.cleanup()
+    
+    def wait_for_messages(self, count: int):
+        """等待后台线程收到消息"""
+        messages = []
+        deadline = time.time() + 2
+        while len(messages) < count and time.time() < deadline:
+            messages.extend(self.server.poll())
+            time.sleep(0.01)
+        return messages
+    
+    def test_forward_to_running_instance(self):
+        """测试转发消息到正在运行的实例"""
+        self.assertFalse(forward([{"action": "raise"}], self.path))
+        self.assertTrue(self.server.start())
+        
+        messages = parse_launch_args(["--add", "新任务"])
+        self.assertTrue(forward(messages, self.path))
+        self.assertEqual(self.wait_for_messages(2), messages)
+        
+        # 已有实例在监听时，第二个监听端不能启动
+        self.assertFalse(InstanceServer(self.path).start())
+        
+        self.server.close()
+        self.assertFalse(os.path.exists(self.path))
+        self.assertFalse(forward(messages, self.path))
+    
+    def test_stale_socket_is_replaced(self):
+        """测试异常退出留下的套接字文件被清理"""
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(self.path)
+        stale.close()
+        self.assertTrue(os.path.exists(self.path))
+        
+        self.assertTrue(self.server.start())
+        self.assertTrue(forward([{"action": "raise"}], self.path))
+        self.assertEqual(self.wait_for_messages(1), [{"action": "raise"}])
+    
+    def test_refuses_foreign_files(self):
+        """测试不连接、不删除非套接字文件和其他用户的套接字"""
+        with open(self.path, "w") as f:
+            f.write("不是套接字")
+        self.assertFalse(forward([{"action": "raise"}], self.path))
+        with redirect_stdout(io.StringIO()):
+            self.assertFalse(self.server.start())
+        with open(self.path) as f:
+            self.assertEqual(f.read(), "不是套接字")
+        
+        if os.getuid() != 0:
+            return  # 只有 root 能把文件改成其他用户所有
+        os.unlink(self.path)
+        other = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        other.bind(self.path)
+        other.listen(1)
+        try:
+            os.chown(self.path, 65534, -1)
+            self.assertFalse(forward([{"action": "raise"}], self.path))
+            with redirect_stdout(io.StringIO()):
+                self.assertFalse(InstanceServer(self.path).start())
+            self.assertTrue(os.path.exists(self.path))
+        finally:
+            other.close()
+
+@unittest.skipUnless(is_supported(), "当前平台不支持 Unix 域套接字")
+class TestSocketPath(unittest.TestCase):
+    """套接字位置测试类"""
+    
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    
+    def tearDown(self):
+        """测试后清理"""
+        if self.runtime_dir is None:
+            os.environ.pop("XDG_RUNTIME_DIR", None)
+        else:
+            os.environ["XDG_RUNTIME_DIR"] = self.runtime_dir
+        self.temp_dir.cleanup()
+    
+    def test_uses_runtime_dir(self):
+        """测试优先放在 $XDG_RUNTIME_DIR 中"""
+        os.environ["XDG_RUNTIME_DIR"] = self.temp_dir.name
+        path = socket_path()
+        self.assertEqual(os.path.dirname(path), self.temp_dir.name)
+        self.assertEqual(path, socket_path())
+    
+    def test_private_dir(self):
+        """测试私有目录只有当前用户可访问，已有目录的权限会被收紧"""
+        directory = os.path.join(self.temp_dir.name, "run")
+        os.mkdir(directory, 0o755)
+        self.assertEqual(private_dir(directory), directory)
+        self.assertEqual(stat.S_IMODE(os.stat(directory).st_mode), 0o700)
+        
+        regular = os.path.join(self.temp_dir.name, "file")
+        open(regular, "w").close()
+        with self.assertRaises(OSError):
+            private_dir(regular)
+
+if __name__ == '__main__':
+    unittest.main()
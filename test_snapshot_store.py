@@ -0,0 +1,111 @@
+"""
+快照存储测试 - Todo App v0.3.1
+测试内容寻址快照的去重、恢复和回收
+"""
+import unittest
+import os
+import stat
+import tempfile
+import json
+from pathlib import Path
+from snapshot_store import SnapshotStore
+
+class TestSnapshotStore(unittest.TestCase):
+    """快照存储测试类"""
+    
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.tasks_file = self.temp_dir / "tasks.json"
+        self.config_file = self.temp_dir / "config.json"
+        
+        self.tasks = [
+            {"id": f"task-{i}", "title": f"任务 {i}", "description": f"描述 {i} " * 5, "priority": "中"}
+            for i in range(2000)
+        ]
+        self.write_tasks()
+        self.config_file.write_text(json.dumps({"theme": "dark"}), encoding="utf-8")
+        
+        self.store = SnapshotStore(
+            self.temp_dir / "snapshots",
+            files={"tasks.json": self.tasks_file, "config.json": self.config_file}
+        )
+    
+    def write_tasks(self):
+        """写入任务文件（与 TaskDatabase 相同的格式）"""
+        with open(self.tasks_file, 'w', encoding='utf-8') as f:
+            json.dump(self.tasks, f, ensure_ascii=False, indent=2)
+    
+    def test_chunking_roundtrip(self):
+        """测试切块后可以完整拼回"""
+        data = self.tasks_file.read_bytes()
+        chunks = list(SnapshotStore.chunk_data(data))
+        self.assertGreater(len(chunks), 1, "大文件应被切成多个块")
+        self.assertEqual(b"".join(chunks), data)
+        
+        long_line = b"x" * (SnapshotStore.MAX_CHUNK_SIZE * 2 + 10)
+        self.assertEqual(b"".join(SnapshotStore.chunk_data(long_line)), long_line)
+    
+    def test_deduplicated_snapshots(self):
+        """测试小改动只产生少量新数据"""
+        success, message = self.store.create_snapshot("首次")
+        self.assertTrue(success, message)
+        first = self.store.list_snapshots()[0]
+        
+        # 未变化：不写入任何新块
+        success, message = self.store.create_snapshot("未变化")
+        self.assertTrue(success, message)
+        self.assertEqual(self.store.list_snapshots()[0]["new_bytes"], 0)
+        
+        # 在中间插入一个任务：新增数据远小于首次快照
+        self.tasks.insert(1000, {"id": "new", "title": "新任务", "description": "", "priority": "高"})
+        self.write_tasks()
+        success, message = self.store.create_snapshot("插入")
+        self.assertTrue(success, message)
+        latest = self.store.list_snapshots()[0]
+        self.assertLess(latest["new_bytes"], first["new_bytes"] / 5)
+    
+    def test_restore_snapshot(self):
+        """测试从任意快照恢复"""
+        original = self.tasks_file.read_bytes()
+        self.store.create_snapshot("原始")
+        snapshot_id = self.store.list_snapshots()[0]["id"]
+        
+        self.tasks = self.tasks[:10]
+        self.write_tasks()
+        self.store.create_snapshot("修改后")
+        
+        # 恢复到单独目录
+        restore_dir = self.temp_dir / "restore"
+        success, message = self.store.restore_snapshot(snapshot_id, restore_dir)
+        self.assertTrue(success, message)
+        self.assertEqual((restore_dir / "tasks.json").read_bytes(), original)
+        
+        reference = self.temp_dir / "reference.json"
+        reference.write_text("")
+        self.assertEqual((restore_dir / "tasks.json").stat().st_mode, reference.stat().st_mode)
+        
+        # 覆盖原文件，保留原文件权限
+        os.chmod(self.tasks_file, 0o640)
+        success, message = self.store.restore_snapshot(snapshot_id)
+        self.assertTrue(success, message)
+        self.assertEqual(self.tasks_file.read_bytes(), original)
+        self.assertEqual(stat.S_IMODE(self.tasks_file.stat().st_mode), 0o640)
+    
+    def test_prune_collects_garbage(self):
+        """测试清理旧快照后回收无引用的数据块"""
+        self.store.create_snapshot("旧")
+        self.tasks = [{"id": "only", "title": "唯一任务"}]
+        self.write_tasks()
+        self.store.create_snapshot("新")
+        
+        removed = self.store.prune(keep=1)
+        self.assertGreater(removed, 0, "应回收旧快照独有的数据块")
+        self.assertEqual(len(self.store.list_snapshots()), 1)
+        
+        snapshot_id = self.store.list_snapshots()[0]["id"]
+        success, message = self.store.restore_snapshot(snapshot_id, self.temp_dir / "restore")
+        self.assertTrue(success, message)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+"""
+卡顿检测测试 - Todo App v0.3.1
+不依赖 Tk，直接在测试线程中模拟心跳
+"""
+import unittest
+import tempfile
+import time
+from pathlib import Path
+from stall_watchdog import StallWatchdog
+
+def blocking_callback(seconds: float):
+    """模拟阻塞主循环的回调"""
+    time.sleep(seconds)
+
+class TestStallWatchdog(unittest.TestCase):
+    """卡顿检测器测试类"""
+    
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_path = Path(self.temp_dir.name) / "stalls.log"
+        self.watchdog = StallWatchdog(threshold=0.1, interval=0.02, log_path=self.log_path)
+    
+    def tearDown(self):
+        """测试后清理"""
+        self.watchdog.stop()
+        self.temp_dir.cleanup()
+    
+    def beat_for(self, seconds: float):
+        """按间隔持续心跳，模拟空闲的主循环"""
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            self.watchdog.heartbeat()
+            time.sleep(self.watchdog.interval)
+    
+    def test_stall_is_recorded_with_stack(self):
+        """测试卡顿被记录并包含阻塞位置"""
+        self.watchdog.start()
+        self.beat_for(0.1)
+        blocking_callback(0.3)
+        self.beat_for(0.1)
+        
+        self.assertEqual(self.watchdog.stall_count, 1)
+        stall = self.watchdog.recent_stalls()[0]
+        self.assertGreaterEqual(stall["duration_ms"], 200)
+        self.assertTrue(any("blocking_callback" in line for line in stall["stack"]))
+        
+        log_text = self.log_path.read_text(encoding="utf-8")
+        self.assertIn("主循环阻塞", log_text)
+        self.assertIn("blocking_callback", log_text)
+    
+    def test_no_stall_when_responsive(self):
+        """测试主循环正常时不报告"""
+        self.watchdog.start()
+        self.beat_for(0.3)
+        self.assertEqual(self.watchdog.stall_count, 0)
+        self.assertFalse(self.log_path.exists())
+
+if __name__ == '__main__':
+    unittest.main()
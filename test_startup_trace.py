@@ -0,0 +1,48 @@
+"""
+启动追踪测试 - Todo App v0.3.1
+测试阶段和时间点的记录与导出
+"""
+import unittest
+import tempfile
+import json
+import time
+from pathlib import Path
+from startup_trace import StartupTracer
+
+class TestStartupTracer(unittest.TestCase):
+    """启动追踪器测试类"""
+    
+    def test_phases_and_marks(self):
+        """测试阶段耗时和时间点记录"""
+        tracer = StartupTracer()
+        with tracer.phase("imports"):
+            time.sleep(0.02)
+        tracer.mark("first_paint")
+        tracer.mark("first_paint")
+        
+        data = tracer.to_dict()
+        self.assertEqual([p["name"] for p in data["phases"]], ["imports"])
+        self.assertGreaterEqual(data["phases"][0]["duration_ms"], 20)
+        self.assertGreaterEqual(data["marks_ms"]["first_paint"], data["phases"][0]["duration_ms"])
+        self.assertTrue(tracer.has_marks("first_paint"))
+        self.assertFalse(tracer.has_marks("first_paint", "tasks_rendered"))
+        self.assertIn("imports", tracer.report())
+    
+    def test_finish_writes_once(self):
+        """测试完成时只导出一次"""
+        tracer = StartupTracer()
+        with tracer.phase("config_load"):
+            pass
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "startup_trace.json"
+            tracer.finish(path)
+            with open(path, 'r', encoding='utf-8') as f:
+                self.assertEqual(json.load(f)["phases"][0]["name"], "config_load")
+            
+            path.unlink()
+            tracer.finish(path)
+            self.assertFalse(path.exists())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+任务日志测试 - Todo App v0.3.1
+测试快速添加、合并、去重和异常中断后的恢复
+"""
+import unittest
+import io
+import tempfile
+from pathlib import Path
+from models import Task
+from database import TaskDatabase
+from task_journal import TaskJournal
+from cli import main as cli_main
+
+class TestTaskJournal(unittest.TestCase):
+    """任务日志测试类"""
+    
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.tasks_file = Path(self.temp_dir.name) / "tasks.json"
+        
+        db = TaskDatabase(autoload=False, tasks_file=self.tasks_file)
+        db.add_tasks([Task(id="", title=f"已有任务{i}") for i in range(3)])
+    
+    def tearDown(self):
+        """测试后清理"""
+        self.temp_dir.cleanup()
+    
+    def test_append_take_commit(self):
+        """测试追加、取出和提交"""
+        journal = TaskJournal(Path(self.temp_dir.name) / "test.journal")
+        self.assertFalse(journal.has_pending())
+        self.assertEqual(journal.take(), [])
+        
+        journal.append({"op": "add", "task": {"title": "一"}})
+        journal.append({"op": "add", "task": {"title": "二"}})
+        self.assertTrue(journal.has_pending())
+        
+        records = journal.take()
+        self.assertEqual([r["task"]["title"] for r in records], ["一", "二"])
+        
+        # 取出后写入的记录进入新的日志，未提交前再次取出仍返回旧记录
+        journal.append({"op": "add", "task": {"title": "三"}})
+        self.assertEqual(len(journal.take()), 2)
+        journal.commit()
+        self.assertEqual([r["task"]["title"] for r in journal.take()], ["三"])
+    
+    def test_truncated_line_is_skipped(self):
+        """测试写入者异常退出留下的半行记录被跳过"""
+        journal = TaskJournal(Path(self.temp_dir.name) / "test.journal")
+        journal.append({"op": "add", "task": {"title": "完整"}})
+        with open(journal.path, 'a', encoding='utf-8') as f:
+            f.write('{"op": "add", "task": {"tit')
+        self.assertEqual([r["task"]["title"] for r in journal.take()], ["完整"])
+        journal.commit()
+        
+        # 半行之后追加的记录不会接在同一行
+        with open(journal.path, 'a', encoding='utf-8') as f:
+            f.write('{"op": "add", "task": {"tit')
+        journal.append({"op": "add", "task": {"title": "之后"}})
+        self.assertEqual([r["task"]["title"] for r in journal.take()], ["之后"])
+    
+    def test_invalid_records_do_not_block_merge(self):
+        """测试无效记录被跳过，其余记录正常合并并提交"""
+        db = TaskDatabase(tasks_file=self.tasks_file)
+        with open(db.journal.path, 'a', encoding='utf-8') as f:
+            f.write('[1, 2]\n{"op": "add", "task": 3}\n{"op": "add", "task": {"id": "x"}}\n')
+        db.journal.append({"op": "add", "task": {"title": "有效"}})
+        
+        self.assertEqual(db.merge_journal(), 1)
+        self.assertIn("有效", [t.title for t in db.get_all_tasks()])
+        self.assertFalse(db.journal.has_pending())
+    
+    def test_quick_add_merged_on_load(self):
+        """测试快速添加不加载任务，下次加载时合并"""
+        capture_db = TaskDatabase(autoload=False, tasks_file=self.tasks_file)
+        task = Task(id="", title="快速任务")
+        self.assertTrue(capture_db.quick_add(task))
+        self.assertTrue(capture_db.quick_add(task))  # 重复的记录只合并一次
+        self.assertFalse(capture_db.is_loaded)
+        
+        db = TaskDatabase(tasks_file=self.tasks_file)
+        titles = [t.title for t in db.get_all_tasks()]
+        self.assertEqual(titles.count("快速任务"), 1)
+        self.assertEqual(len(titles), 4)
+        self.assertFalse(db.journal.has_pending())
+        
+        # 合并结果已写入任务文件
+        self.assertEqual(len(TaskDatabase(tasks_file=self.tasks_file).get_all_tasks()), 4)
+    
+    def test_merge_into_running_database(self):
+        """测试运行中的数据库合并新记录"""
+        db = TaskDatabase(tasks_file=self.tasks_file)
+        TaskDatabase(autoload=False, tasks_file=self.tasks_file).quick_add(Task(id="", title="运行中添加"))
+        
+        self.assertTrue(db.journal.has_pending())
+        self.assertEqual(db.merge_journal(), 1)
+        self.assertEqual(db.merge_journal(), 0)
+        self.assertIn("运行中添加", [t.title for t in db.get_all_tasks()])
+    
+    def test_interrupted_merge_is_replayed_once(self):
+        """测试合并后未提交（异常退出）时重放不会产生重复任务"""
+        capture_db = TaskDatabase(autoload=False, tasks_file=self.tasks_file)
+        capture_db.quick_add(Task(id="", title="中断任务"))
+        
+        db = TaskDatabase(tasks_file=self.tasks_file)
+        db.journal.append({"op": "add", "task": db.get_all_tasks()[-1].to_dict()})
+        db.journal.take()  # 模拟取出后在提交前退出
+        
+        reloaded = TaskDatabase(tasks_file=self.tasks_file)
+        self.assertEqual([t.title for t in reloaded.get_all_tasks()].count("中断任务"), 1)
+        self.assertFalse(reloaded.journal.merging_path.exists())
+    
+    def test_cli_quick_add(self):
+        """测试命令行快速添加不读取任务文件"""
+        db = TaskDatabase(autoload=False, tasks_file=self.tasks_file)
+        stdout = io.StringIO()
+        code = cli_main(["add", "-q", "甲", "乙"], db=db, stdout=stdout, stderr=io.StringIO())
+        self.assertEqual(code, 0)
+        self.assertFalse(db.is_loaded)
+        self.assertEqual(len(TaskDatabase(tasks_file=self.tasks_file).get_all_tasks()), 5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,21 +3,110 @@ UI 组件 - Todo App v0.3.1
 自定义界面组件
 """
 import customtkinter as ctk
+import tkinter as tk
+import weakref
 from tkinter import messagebox
 from datetime import datetime, date
-from typing import Callable, Optional
+from typing import Any, Callable, Dict, List, Optional
 from models import Task
 from config import app_config
+from font_manager import get_font
+
+class ColorSignal:
+    """颜色/主题变化信号
+    
+    任务行按优先级订阅。优先级颜色改变时只通知该优先级的订阅者，
+    主题改变时通知所有订阅者；订阅 ALL 的对象在任意颜色变化时都会收到通知。
+    订阅者需实现 on_priority_color_changed(color) 和 on_theme_changed()。
+    """
+    
+    ALL = "*"
+    
+    def __init__(self):
+        self._subscribers: Dict[str, weakref.WeakSet] = {}
+        self._colors = dict(app_config.get("priority_colors", {}))
+        app_config.add_listener(self._on_config_changed)
+    
+    def subscribe(self, topic: str, subscriber):
+        """订阅某个优先级（或 ALL）的颜色变化"""
+        self._subscribers.setdefault(topic, weakref.WeakSet()).add(subscriber)
+    
+    def unsubscribe(self, topic: str, subscriber):
+        """取消订阅"""
+        if topic in self._subscribers:
+            self._subscribers[topic].discard(subscriber)
+    
+    def _on_config_changed(self, key: str, old_value: Any, new_value: Any):
+        """配置变更监听"""
+        if key == "priority_colors":
+            self.emit_priority_colors(new_value)
+        elif key == "theme":
+            self.emit_theme()
+    
+    def emit_priority_colors(self, colors: Dict[str, str]) -> int:
+        """发送优先级颜色变化，返回被通知的订阅者数量"""
+        changed = [priority for priority, color in colors.items() if self._colors.get(priority) != color]
+        self._colors = dict(colors)
+        if not changed:
+            return 0
+        
+        notified = 0
+        for priority in changed:
+            for subscriber in list(self._subscribers.get(priority, ())):
+                subscriber.on_priority_color_changed(colors[priority])
+                notified += 1
+        for subscriber in list(self._subscribers.get(self.ALL, ())):
+            subscriber.on_priority_color_changed(None)
+            notified += 1
+        return notified
+    
+    def emit_theme(self):
+        """发送主题变化"""
+        for subscribers in list(self._subscribers.values()):
+            for subscriber in list(subscribers):
+                subscriber.on_theme_changed()
+
+# 全局颜色信号
+color_signal = ColorSignal()
+
+def format_description(description: str, limit: int = 50) -> str:
+    """截取任务描述摘要"""
+    return description[:limit] + ("..." if len(description) > limit else "")
+
+def format_due_info(task: Task) -> str:
+    """生成截止日期和状态信息文本"""
+    info_text = []
+    if task.due_date:
+        due_date = task.due_date.split('T')[0]
+        days_left = task.days_until_due()
+        if days_left is not None:
+            if days_left < 0:
+                info_text.append(f"已过期 {abs(days_left)} 天")
+            elif days_left == 0:
+                info_text.append("今天到期")
+            elif days_left <= 3:
+                info_text.append(f"{days_left} 天后到期")
+            else:
+                info_text.append(f"截止: {due_date}")
+    return " | ".join(info_text)
 
 class TaskEditDialog(ctk.CTkToplevel):
-    """任务编辑对话框"""
+    """任务编辑对话框
     
-    def __init__(self, parent, task: Optional[Task] = None, callback: Optional[Callable] = None):
+    对话框创建一次后可反复使用：open() 重新填充表单并显示，
+    确认或取消时只隐藏窗口而不销毁。
+    """
+    
+    def __init__(self, parent, task: Optional[Task] = None, callback: Optional[Callable] = None,
+                 show: bool = True):
         super().__init__(parent)
         
         self.task = task
         self.callback = callback
         self.result = None
+        # 编辑模式下改动的字段（确认后由调用方在数据库锁内应用）
+        self.changes: Dict[str, Any] = {}
+        self.original: Dict[str, Any] = {}
         
         # 设置窗口属性
         self.title("编辑任务" if task else "新建任务")
@@ -26,7 +115,7 @@ class TaskEditDialog(ctk.CTkToplevel):
         
         # 设置为模态窗口
         self.transient(parent)
-        self.grab_set()
+        self.protocol("WM_DELETE_WINDOW", self.cancel)
         
         # 居中显示
         self.center_window()
@@ -34,9 +123,47 @@ class TaskEditDialog(ctk.CTkToplevel):
         # 创建界面
         self.create_widgets()
         
-        # 如果是编辑模式，填充现有数据
-        if task:
-            self.load_task_data()
+        if show:
+            self.open(task, callback)
+        else:
+            # 预创建：保持隐藏，等待 open()
+            self.withdraw()
+    
+    def open(self, task: Optional[Task] = None, callback: Optional[Callable] = None):
+        """用指定任务重新填充表单并显示对话框"""
+        self.task = task
+        self.callback = callback
+        self.result = None
+        self.changes = {}
+        
+        self.title("编辑任务" if task else "新建任务")
+        self.clear_form()
+        self.load_task_data()
+        self.original = self.form_values() if task else {}
+        
+        self.deiconify()
+        self.lift()
+        try:
+            self.grab_set()
+        except Exception:
+            # 窗口尚未映射时稍后再设置模态
+            self.after(100, self.grab_set)
+        self.title_entry.focus()
+    
+    def hide(self):
+        """隐藏对话框以便复用"""
+        try:
+            self.grab_release()
+        except Exception:
+            pass
+        self.withdraw()
+    
+    def clear_form(self):
+        """清空表单"""
+        self.title_entry.delete(0, "end")
+        self.description_text.delete("1.0", "end")
+        self.priority_var.set("中")
+        self.due_date_entry.delete(0, "end")
     
     def center_window(self):
         """窗口居中显示"""
@@ -52,20 +179,20 @@ class TaskEditDialog(ctk.CTkToplevel):
         main_frame.pack(fill="both", expand=True, padx=20, pady=20)
         
         # 标题输入
-        ctk.CTkLabel(main_frame, text="任务标题:", font=("", 14)).pack(anchor="w", pady=(10, 5))
-        self.title_entry = ctk.CTkEntry(main_frame, height=35, font=("", 12))
+        ctk.CTkLabel(main_frame, text="任务标题:", font=get_font("body")).pack(anchor="w", pady=(10, 5))
+        self.title_entry = ctk.CTkEntry(main_frame, height=35, font=get_font("control"))
         self.title_entry.pack(fill="x", pady=(0, 15))
         
         # 描述输入
-        ctk.CTkLabel(main_frame, text="任务描述:", font=("", 14)).pack(anchor="w", pady=(0, 5))
-        self.description_text = ctk.CTkTextbox(main_frame, height=100, font=("", 12))
+        ctk.CTkLabel(main_frame, text="任务描述:", font=get_font("body")).pack(anchor="w", pady=(0, 5))
+        self.description_text = ctk.CTkTextbox(main_frame, height=100, font=get_font("control"))
         self.description_text.pack(fill="x", pady=(0, 15))
         
         # 优先级选择
         priority_frame = ctk.CTkFrame(main_frame)
         priority_frame.pack(fill="x", pady=(0, 15))
         
-        ctk.CTkLabel(priority_frame, text="优先级:", font=("", 14)).pack(side="left", padx=(10, 20))
+        ctk.CTkLabel(priority_frame, text="优先级:", font=get_font("body")).pack(side="left", padx=(10, 20))
         
         self.priority_var = ctk.StringVar(value="中")
         priority_options = ["高", "中", "低"]
@@ -73,7 +200,7 @@ class TaskEditDialog(ctk.CTkToplevel):
             priority_frame, 
             values=priority_options,
             variable=self.priority_var,
-            font=("", 12)
+            font=get_font("control")
         )
         self.priority_menu.pack(side="left", padx=(0, 10))
         
@@ -81,9 +208,9 @@ class TaskEditDialog(ctk.CTkToplevel):
         date_frame = ctk.CTkFrame(main_frame)
         date_frame.pack(fill="x", pady=(0, 15))
         
-        ctk.CTkLabel(date_frame, text="截止日期:", font=("", 14)).pack(side="left", padx=(10, 20))
+        ctk.CTkLabel(date_frame, text="截止日期:", font=get_font("body")).pack(side="left", padx=(10, 20))
         
-        self.due_date_entry = ctk.CTkEntry(date_frame, placeholder_text="YYYY-MM-DD (可选)", font=("", 12))
+        self.due_date_entry = ctk.CTkEntry(date_frame, placeholder_text="YYYY-MM-DD (可选)", font=get_font("control"))
         self.due_date_entry.pack(side="left", fill="x", expand=True, padx=(0, 10))
         
         # 按钮框架
@@ -97,7 +224,7 @@ class TaskEditDialog(ctk.CTkToplevel):
             command=self.cancel,
             fg_color="gray",
             hover_color="darkgray",
-            font=("", 12)
+            font=get_font("control")
         )
         cancel_btn.pack(side="right", padx=(10, 10))
         
@@ -106,12 +233,9 @@ class TaskEditDialog(ctk.CTkToplevel):
             button_frame,
             text="确认",
             command=self.confirm,
-            font=("", 12)
+            font=get_font("control")
         )
         confirm_btn.pack(side="right")
-        
-        # 焦点设置
-        self.title_entry.focus()
     
     def load_task_data(self):
         """加载任务数据到表单"""
@@ -141,50 +265,41 @@ class TaskEditDialog(ctk.CTkToplevel):
         
         return True
     
+    def form_values(self) -> Dict[str, Any]:
+        """读取表单中的字段值"""
+        due_date = self.due_date_entry.get().strip()
+        return {
+            "title": self.title_entry.get().strip(),
+            "description": self.description_text.get("1.0", "end-1c").strip(),
+            "priority": self.priority_var.get(),
+            # 截止日期保存为当天结束时间
+            "due_date": f"{due_date}T23:59:59" if due_date else None,
+        }
+    
     def confirm(self):
         """确认操作"""
         if not self.validate_input():
             return
         
-        title = self.title_entry.get().strip()
-        description = self.description_text.get("1.0", "end-1c").strip()
-        priority = self.priority_var.get()
-        due_date = self.due_date_entry.get().strip()
-        
-        # 处理截止日期
-        if due_date:
-            due_date = f"{due_date}T23:59:59"
-        else:
-            due_date = None
-        
+        values = self.form_values()
         if self.task:
-            # 编辑模式
-            self.task.update(
-                title=title,
-                description=description,
-                priority=priority,
-                due_date=due_date
-            )
+            # 编辑模式：不直接修改共享的任务对象（API 服务器可能正在修改同一任务），
+            # 只记录与打开时不同的字段，由回调通过 task_db.update_task 在锁内应用
+            self.changes = {key: value for key, value in values.items() if value != self.original.get(key)}
             self.result = self.task
         else:
             # 新建模式
-            self.result = Task(
-                id="",  # 将在 Task.__post_init__ 中生成
-                title=title,
-                description=description,
-                priority=priority,
-                due_date=due_date
-            )
+            self.result = Task(id="", **values)  # id 将在 Task.__post_init__ 中生成
+        
+        self.hide()
         
         if self.callback:
             self.callback(self.result)
-        
-        self.destroy()
     
     def cancel(self):
         """取消操作"""
         self.result = None
-        self.destroy()
+        self.hide()
 
 class TaskItem(ctk.CTkFrame):
     """任务列表项组件"""
@@ -199,6 +314,23 @@ class TaskItem(ctk.CTkFrame):
         
         self.create_widgets()
         self.update_appearance()
+        
+        # 只订阅自身优先级的颜色变化
+        self._color_topic = task.priority
+        color_signal.subscribe(self._color_topic, self)
+    
+    def destroy(self):
+        """销毁时取消订阅"""
+        color_signal.unsubscribe(self._color_topic, self)
+        super().destroy()
+    
+    def on_priority_color_changed(self, color: str):
+        """优先级颜色变化：只更新指示器"""
+        self.priority_indicator.configure(fg_color=color)
+    
+    def on_theme_changed(self):
+        """主题变化：重新应用标签颜色"""
+        self.update_appearance()
     
     def create_widgets(self):
         """创建组件"""
@@ -240,7 +372,7 @@ class TaskItem(ctk.CTkFrame):
         self.title_label = ctk.CTkLabel(
             middle_frame,
             text=self.task.title,
-            font=("", 14, "bold"),
+            font=get_font("subtitle"),
             anchor="w"
         )
         self.title_label.pack(fill="x", pady=(10, 2))
@@ -249,33 +381,20 @@ class TaskItem(ctk.CTkFrame):
         if self.task.description:
             self.desc_label = ctk.CTkLabel(
                 middle_frame,
-                text=self.task.description[:50] + ("..." if len(self.task.description) > 50 else ""),
-                font=("", 11),
+                text=format_description(self.task.description),
+                font=get_font("caption"),
                 anchor="w",
                 text_color="gray"
             )
             self.desc_label.pack(fill="x", pady=(0, 2))
         
         # 截止日期和状态信息
-        info_text = []
-        if self.task.due_date:
-            due_date = self.task.due_date.split('T')[0]
-            days_left = self.task.days_until_due()
-            if days_left is not None:
-                if days_left < 0:
-                    info_text.append(f"已过期 {abs(days_left)} 天")
-                elif days_left == 0:
-                    info_text.append("今天到期")
-                elif days_left <= 3:
-                    info_text.append(f"{days_left} 天后到期")
-                else:
-                    info_text.append(f"截止: {due_date}")
-        
+        info_text = format_due_info(self.task)
         if info_text:
             self.info_label = ctk.CTkLabel(
                 middle_frame,
-                text=" | ".join(info_text),
-                font=("", 10),
+                text=info_text,
+                font=get_font("small"),
                 anchor="w",
                 text_color="orange" if self.task.is_overdue() else "gray"
             )
@@ -293,7 +412,7 @@ class TaskItem(ctk.CTkFrame):
             width=40,
             height=25,
             command=lambda: self.on_edit(self.task),
-            font=("", 10)
+            font=get_font("small")
         )
         edit_btn.pack(pady=(15, 5))
         
@@ -306,13 +425,12 @@ class TaskItem(ctk.CTkFrame):
             command=lambda: self.on_delete(self.task),
             fg_color="red",
             hover_color="darkred",
-            font=("", 10)
+            font=get_font("small")
         )
         delete_btn.pack()
     
     def toggle_completed(self):
-        """切换完成状态"""
-        self.task.toggle_completed()
+        """切换完成状态（由回调通过数据库修改，失败时复选框恢复原状态）"""
         self.on_toggle(self.task)
         self.update_appearance()
     
@@ -331,6 +449,256 @@ class TaskItem(ctk.CTkFrame):
         priority_color = app_config.get_priority_color(self.task.priority)
         self.priority_indicator.configure(fg_color=priority_color)
 
+class CanvasTaskList(ctk.CTkFrame):
+    """轻量任务列表（单个 Canvas 绘制所有行）
+    
+    与 TaskItem 不同，这里不为每个任务创建控件，而是把复选框、优先级圆点、
+    标题、描述、截止信息以及编辑/删除按钮直接绘制到同一个 tk.Canvas 上，
+    并且只绘制可见区域内的行。点击通过坐标命中检测分发到回调。
+    """
+    
+    ROW_HEIGHT = 80
+    ROW_GAP = 4
+    
+    # 颜色（浅色, 深色）
+    ROW_COLOR = ("gray86", "gray17")
+    TEXT_COLOR = ("black", "white")
+    MUTED_COLOR = ("gray40", "gray60")
+    CHECK_COLOR = ("#3B8ED0", "#1F6AA5")
+    BUTTON_COLOR = ("#3B8ED0", "#1F6AA5")
+    DELETE_COLOR = ("red", "red")
+    
+    def __init__(self, parent, on_toggle: Callable, on_edit: Callable, on_delete: Callable):
+        super().__init__(parent)
+        
+        self.on_toggle = on_toggle
+        self.on_edit = on_edit
+        self.on_delete = on_delete
+        self.tasks: List[Task] = []
+        self._redraw_pending = False
+        
+        self.create_widgets()
+        color_signal.subscribe(ColorSignal.ALL, self)
+    
+    def destroy(self):
+        """销毁时取消订阅"""
+        color_signal.unsubscribe(ColorSignal.ALL, self)
+        self.title_font.remove_size_configure_callback(self.schedule_redraw)
+        super().destroy()
+    
+    def on_priority_color_changed(self, color: Optional[str]):
+        """任意优先级颜色变化：重绘可见行"""
+        self.schedule_redraw()
+    
+    def on_theme_changed(self):
+        """主题变化：重绘可见行"""
+        self.schedule_redraw()
+    
+    def create_widgets(self):
+        """创建画布和滚动条"""
+        self.canvas = tk.Canvas(
+            self,
+            highlightthickness=0,
+            borderwidth=0,
+            bg=self._apply_appearance_mode(self._fg_color)
+        )
+        self.canvas.configure(yscrollincrement=self.ROW_HEIGHT // 4)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y", padx=(0, 2), pady=2)
+        self.canvas.pack(side="left", fill="both", expand=True, padx=2, pady=2)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        
+        # 所有行共用注册表中的字体；字号变化后需要重新计算截断
+        self.title_font = get_font("subtitle")
+        self.desc_font = get_font("caption")
+        self.info_font = get_font("small")
+        self.check_font = get_font("strong")
+        self.title_font.add_size_configure_callback(self.schedule_redraw)
+        
+        self.canvas.bind("<Configure>", lambda e: self.schedule_redraw())
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<MouseWheel>", self._on_mousewheel)
+        self.canvas.bind("<Button-4>", lambda e: self._scroll_units(-1))
+        self.canvas.bind("<Button-5>", lambda e: self._scroll_units(1))
+    
+    def set_tasks(self, tasks: List[Task]):
+        """设置要显示的任务（不创建任何新控件）"""
+        self.tasks = list(tasks)
+        total_height = len(self.tasks) * self.ROW_HEIGHT
+        self.canvas.configure(scrollregion=(0, 0, 0, total_height))
+        self.schedule_redraw()
+    
+    def schedule_redraw(self):
+        """合并多次重绘请求"""
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.after_idle(self.redraw)
+    
+    def redraw(self):
+        """重绘可见区域内的行"""
+        self._redraw_pending = False
+        self.canvas.delete("row")
+        
+        if not self.tasks:
+            return
+        
+        top = self.canvas.canvasy(0)
+        height = self.canvas.winfo_height()
+        first = max(0, int(top // self.ROW_HEIGHT))
+        last = min(len(self.tasks), int((top + height) // self.ROW_HEIGHT) + 1)
+        
+        width = self.canvas.winfo_width()
+        for index in range(first, last):
+            self._draw_row(index, self.tasks[index], width)
+    
+    def _draw_row(self, index: int, task: Task, width: int):
+        """绘制单行"""
+        color = self._apply_appearance_mode
+        y0 = index * self.ROW_HEIGHT
+        y1 = y0 + self.ROW_HEIGHT - self.ROW_GAP
+        
+        # 行背景
+        self.canvas.create_rectangle(
+            2, y0, width - 2, y1,
+            fill=color(self.ROW_COLOR), outline="", tags="row"
+        )
+        
+        # 复选框
+        check_color = color(self.CHECK_COLOR)
+        self.canvas.create_rectangle(
+            20, y0 + 15, 40, y0 + 35,
+            outline=check_color, width=2,
+            fill=check_color if task.completed else "", tags="row"
+        )
+        if task.completed:
+            self.canvas.create_text(
+                30, y0 + 25, text="✓", fill="white",
+                font=self.check_font, tags="row"
+            )
+        
+        # 优先级圆点
+        self.canvas.create_oval(
+            20, y0 + 42, 40, y0 + 62,
+            fill=app_config.get_priority_color(task.priority), outline="", tags="row"
+        )
+        
+        # 任务信息
+        text_x = 70
+        text_width = max(50, width - text_x - 110)
+        title_color = "gray" if task.completed else color(self.TEXT_COLOR)
+        self.canvas.create_text(
+            text_x, y0 + 20, text=self._fit_text(task.title, self.title_font, text_width),
+            anchor="w", fill=title_color, font=self.title_font, tags="row"
+        )
+        
+        if task.description:
+            description = self._fit_text(format_description(task.description), self.desc_font, text_width)
+            self.canvas.create_text(
+                text_x, y0 + 42, text=description, anchor="w",
+                fill=color(self.MUTED_COLOR), font=self.desc_font, tags="row"
+            )
+        
+        info_text = format_due_info(task)
+        if info_text:
+            self.canvas.create_text(
+                text_x, y0 + 60, text=info_text, anchor="w",
+                fill="orange" if task.is_overdue() else color(self.MUTED_COLOR),
+                font=self.info_font, tags="row"
+            )
+        
+        # 编辑/删除按钮区域
+        for (bx0, by0, bx1, by1), text, fill in (
+            (self._edit_zone(width), "编辑", color(self.BUTTON_COLOR)),
+            (self._delete_zone(width), "删除", color(self.DELETE_COLOR)),
+        ):
+            self.canvas.create_rectangle(
+                bx0, y0 + by0, bx1, y0 + by1,
+                fill=fill, outline="", tags="row"
+            )
+            self.canvas.create_text(
+                (bx0 + bx1) / 2, y0 + (by0 + by1) / 2, text=text,
+                fill="white", font=self.info_font, tags="row"
+            )
+    
+    @staticmethod
+    def _fit_text(text: str, font, max_width: int) -> str:
+        """截断文本使其不超过指定像素宽度"""
+        if font.measure(text) <= max_width:
+            return text
+        # 二分查找能容纳的最长前缀
+        low, high = 0, len(text)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if font.measure(text[:middle] + "...") <= max_width:
+                low = middle
+            else:
+                high = middle - 1
+        return text[:low] + "..."
+    
+    def _edit_zone(self, width: int):
+        """编辑按钮区域（相对行顶部）"""
+        return (width - 80, 15, width - 30, 40)
+    
+    def _delete_zone(self, width: int):
+        """删除按钮区域（相对行顶部）"""
+        return (width - 80, 45, width - 30, 70)
+    
+    def hit_test(self, x: float, y: float):
+        """根据画布坐标返回 (任务, 动作)，未命中时返回 (None, None)"""
+        index = int(y // self.ROW_HEIGHT)
+        if index < 0 or index >= len(self.tasks):
+            return None, None
+        
+        task = self.tasks[index]
+        local_y = y - index * self.ROW_HEIGHT
+        width = self.canvas.winfo_width()
+        
+        def inside(zone):
+            x0, y0, x1, y1 = zone
+            return x0 <= x <= x1 and y0 <= local_y <= y1
+        
+        if inside((15, 10, 45, 40)):
+            return task, "toggle"
+        if inside(self._edit_zone(width)):
+            return task, "edit"
+        if inside(self._delete_zone(width)):
+            return task, "delete"
+        return task, None
+    
+    def _on_click(self, event):
+        """点击事件分发"""
+        task, action = self.hit_test(self.canvas.canvasx(event.x), self.canvas.canvasy(event.y))
+        if action == "toggle":
+            self.on_toggle(task)
+            self.schedule_redraw()
+        elif action == "edit":
+            self.on_edit(task)
+        elif action == "delete":
+            self.on_delete(task)
+    
+    def _on_scrollbar(self, *args):
+        """滚动条拖动"""
+        self.canvas.yview(*args)
+        self.schedule_redraw()
+    
+    def _scroll_units(self, units: int):
+        """按行滚动"""
+        self.canvas.yview_scroll(units, "units")
+        self.schedule_redraw()
+    
+    def _on_mousewheel(self, event):
+        """鼠标滚轮（Windows/macOS）"""
+        delta = event.delta if abs(event.delta) < 120 else event.delta // 120
+        self._scroll_units(-delta)
+    
+    def _set_appearance_mode(self, mode_string):
+        """主题切换时重新绘制"""
+        super()._set_appearance_mode(mode_string)
+        if not hasattr(self, "canvas"):
+            return
+        self.canvas.configure(bg=self._apply_appearance_mode(self._fg_color))
+        self.schedule_redraw()
+
 class StatisticsFrame(ctk.CTkFrame):
     """统计信息框架"""
     
@@ -341,7 +709,7 @@ class StatisticsFrame(ctk.CTkFrame):
     def create_widgets(self):
         """创建统计组件"""
         # 标题
-        title_label = ctk.CTkLabel(self, text="任务统计", font=("", 16, "bold"))
+        title_label = ctk.CTkLabel(self, text="任务统计", font=get_font("heading"))
         title_label.pack(pady=(10, 15))
         
         # 统计信息容器
@@ -349,19 +717,19 @@ class StatisticsFrame(ctk.CTkFrame):
         self.stats_frame.pack(fill="x", padx=10, pady=(0, 10))
         
         # 初始化统计标签
-        self.total_label = ctk.CTkLabel(self.stats_frame, text="总任务: 0", font=("", 12))
+        self.total_label = ctk.CTkLabel(self.stats_frame, text="总任务: 0", font=get_font("control"))
         self.total_label.pack(pady=2)
         
-        self.completed_label = ctk.CTkLabel(self.stats_frame, text="已完成: 0", font=("", 12))
+        self.completed_label = ctk.CTkLabel(self.stats_frame, text="已完成: 0", font=get_font("control"))
         self.completed_label.pack(pady=2)
         
-        self.pending_label = ctk.CTkLabel(self.stats_frame, text="待完成: 0", font=("", 12))
+        self.pending_label = ctk.CTkLabel(self.stats_frame, text="待完成: 0", font=get_font("control"))
         self.pending_label.pack(pady=2)
         
-        self.overdue_label = ctk.CTkLabel(self.stats_frame, text="已过期: 0", font=("", 12))
+        self.overdue_label = ctk.CTkLabel(self.stats_frame, text="已过期: 0", font=get_font("control"))
         self.overdue_label.pack(pady=2)
         
-        self.completion_rate_label = ctk.CTkLabel(self.stats_frame, text="完成率: 0%", font=("", 12))
+        self.completion_rate_label = ctk.CTkLabel(self.stats_frame, text="完成率: 0%", font=get_font("control"))
         self.completion_rate_label.pack(pady=2)
     
     def update_statistics(self, stats: dict):
@@ -370,4 +738,60 @@ class StatisticsFrame(ctk.CTkFrame):
         self.completed_label.configure(text=f"已完成: {stats['completed']}")
         self.pending_label.configure(text=f"待完成: {stats['pending']}")
         self.overdue_label.configure(text=f"已过期: {stats['overdue']}")
-        self.completion_rate_label.configure(text=f"完成率: {stats['completion_rate']:.1f}%")
\ No newline at end of file
+        self.completion_rate_label.configure(text=f"完成率: {stats['completion_rate']:.1f}%")
+
+class ExportProgressDialog(ctk.CTkToplevel):
+    """导出进度对话框（导出在后台线程进行，这里只显示进度和提供取消）"""
+    
+    def __init__(self, parent, filename: str, total: int, on_cancel: Callable[[], None]):
+        super().__init__(parent)
+        
+        self.on_cancel = on_cancel
+        self.total = total
+        
+        self.title("导出任务")
+        self.geometry("420x150")
+        self.resizable(False, False)
+        self.transient(parent)
+        self.protocol("WM_DELETE_WINDOW", self.cancel)
+        
+        main_frame = ctk.CTkFrame(self)
+        main_frame.pack(fill="both", expand=True, padx=15, pady=15)
+        
+        ctk.CTkLabel(
+            main_frame, text=f"正在导出到: {filename}", font=get_font("body"), wraplength=370, anchor="w"
+        ).pack(fill="x", pady=(5, 10))
+        
+        self.progress_bar = ctk.CTkProgressBar(main_frame)
+        self.progress_bar.pack(fill="x", pady=(0, 5))
+        self.progress_bar.set(0)
+        
+        self.count_label = ctk.CTkLabel(main_frame, text=f"0 / {total}", font=get_font("small"))
+        self.count_label.pack(anchor="w")
+        
+        self.cancel_button = ctk.CTkButton(
+            main_frame,
+            text="取消",
+            command=self.cancel,
+            fg_color="gray",
+            hover_color="darkgray",
+            font=get_font("control")
+        )
+        self.cancel_button.pack(side="right", pady=(5, 0))
+    
+    def set_progress(self, done: int, total: int):
+        """更新进度（在主线程调用）"""
+        if not self.winfo_exists():
+            return
+        self.progress_bar.set(done / total if total else 1)
+        self.count_label.configure(text=f"{done} / {total}")
+    
+    def cancel(self):
+        """请求取消，后台线程在下一条任务前停止"""
+        self.cancel_button.configure(state="disabled", text="正在取消...")
+        self.on_cancel()
+    
+    def close(self):
+        """导出结束后关闭"""
+        if self.winfo_exists():
+            self.destroy()